@@ -9,11 +9,12 @@ This package contains the core business logic including:
 - Trace collection
 """
 
-from src.core.types import Document, Chunk, ChunkRecord, Metadata, Vector, SparseVector
+from src.core.types import Document, Chunk, ChunkBatch, ChunkRecord, Metadata, Vector, SparseVector
 
 __all__ = [
     "Document",
     "Chunk", 
+    "ChunkBatch",
     "ChunkRecord",
     "Metadata",
     "Vector",
@@ -2,11 +2,25 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-import yaml
+
+@lru_cache(maxsize=None)
+def _yaml_load() -> Callable[[Any], Any]:
+    """Import PyYAML on first use and return its YAML parse function.
+    
+    Most modules import this one only for the Settings type, so the PyYAML
+    import (about a third of this module's import time) is deferred until
+    a settings file is actually loaded. Uses the libyaml-backed loader when
+    PyYAML was built with it (several times faster).
+    """
+    import yaml
+    
+    return partial(yaml.load, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
 
 class SettingsError(ValueError):
@@ -35,6 +49,11 @@ def _require_str(data: Dict[str, Any], key: str, path: str) -> str:
     return value
 
 
+def _require_provider(data: Dict[str, Any], path: str) -> str:
+    # Lowercased and interned once here, matching the factory registry keys
+    return sys.intern(_require_str(data, "provider", path).lower())
+
+
 def _require_int(data: Dict[str, Any], key: str, path: str) -> int:
     value = _require_value(data, key, path)
     if not isinstance(value, int):
@@ -69,6 +88,7 @@ class LLMSettings:
     model: str
     temperature: float
     max_tokens: int
+    cache_enabled: bool = False
 
 
 @dataclass(frozen=True)
@@ -160,18 +180,23 @@ class Settings:
 
         settings = cls(
             llm=LLMSettings(
-                provider=_require_str(llm, "provider", "llm"),
+                provider=_require_provider(llm, "llm"),
                 model=_require_str(llm, "model", "llm"),
                 temperature=_require_number(llm, "temperature", "llm"),
                 max_tokens=_require_int(llm, "max_tokens", "llm"),
+                cache_enabled=(
+                    _require_bool(llm, "cache_enabled", "llm")
+                    if "cache_enabled" in llm
+                    else False
+                ),
             ),
             embedding=EmbeddingSettings(
-                provider=_require_str(embedding, "provider", "embedding"),
+                provider=_require_provider(embedding, "embedding"),
                 model=_require_str(embedding, "model", "embedding"),
                 dimensions=_require_int(embedding, "dimensions", "embedding"),
             ),
             vector_store=VectorStoreSettings(
-                provider=_require_str(vector_store, "provider", "vector_store"),
+                provider=_require_provider(vector_store, "vector_store"),
                 persist_directory=_require_str(vector_store, "persist_directory", "vector_store"),
                 collection_name=_require_str(vector_store, "collection_name", "vector_store"),
             ),
@@ -183,13 +208,13 @@ class Settings:
             ),
             rerank=RerankSettings(
                 enabled=_require_bool(rerank, "enabled", "rerank"),
-                provider=_require_str(rerank, "provider", "rerank"),
+                provider=_require_provider(rerank, "rerank"),
                 model=_require_str(rerank, "model", "rerank"),
                 top_k=_require_int(rerank, "top_k", "rerank"),
             ),
             evaluation=EvaluationSettings(
                 enabled=_require_bool(evaluation, "enabled", "evaluation"),
-                provider=_require_str(evaluation, "provider", "evaluation"),
+                provider=_require_provider(evaluation, "evaluation"),
                 metrics=[str(item) for item in _require_list(evaluation, "metrics", "evaluation")],
             ),
             observability=ObservabilitySettings(
@@ -231,7 +256,7 @@ def load_settings(path: str | Path) -> Settings:
         raise SettingsError(f"Settings file not found: {settings_path}")
 
     with settings_path.open("r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle)
+        data = _yaml_load()(handle)
 
     settings = Settings.from_dict(data or {})
     validate_settings(settings)
@@ -12,11 +12,327 @@ Design Principles:
 - Type-safe: Full type hints for static analysis
 """
 
-from dataclasses import dataclass, field, asdict
-from typing import Dict, Any, List, Optional
+import base64
+import json
+import sys
+from array import array
+from bisect import bisect_left
+from collections import ChainMap
+from functools import lru_cache, partial
+from dataclasses import dataclass, field, fields
+from typing import (
+    Any, Callable, ClassVar, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type, TypedDict,
+    TypeVar, Union,
+)
 
 
-@dataclass
+def _intern_keys(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of ``metadata`` with its string keys interned.
+    
+    Keys written as literals in source code are already interned by the
+    compiler, but keys decoded from JSON or a vector store are fresh string
+    objects. Interning them lets millions of deserialized metadata dicts
+    share one key object per name and makes lookups hit the identity fast
+    path in dict probing.
+    """
+    intern = sys.intern
+    return {
+        (intern(key) if type(key) is str else key): value
+        for key, value in metadata.items()
+    }
+
+
+def to_dense_array(vector: Sequence[float], dtype: str = "float32") -> Any:
+    """Convert a dense vector into a contiguous NumPy array.
+    
+    A 1024-dim ``List[float]`` holds 1024 boxed Python floats (~32KB);
+    the same vector as ``float32`` is 4KB and can be fed to BLAS routines
+    directly. Use ``dtype="float16"`` for embeddings that tolerate reduced
+    precision to halve memory and bandwidth again.
+    
+    Args:
+        vector: Dense vector (list, tuple, array, or ndarray).
+        dtype: Target NumPy dtype name.
+    
+    Returns:
+        C-contiguous ``numpy.ndarray`` (no copy if already matching).
+    
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "numpy is required for array-backed dense vectors. "
+            "Install it with: pip install numpy"
+        ) from e
+    return np.ascontiguousarray(vector, dtype=dtype)
+
+
+class QuantizedVector(NamedTuple):
+    """Dense vector stored as int8 values with one scale factor.
+    
+    The original vector is approximately ``values * scale``; see
+    quantize_dense_vector.
+    """
+    values: Any  # int8 numpy.ndarray
+    scale: float
+
+
+def quantize_dense_vector(vector: Sequence[float]) -> QuantizedVector:
+    """Quantize a dense vector to int8 with a symmetric per-vector scale.
+    
+    Uses ``scale = max(|v|) / 127`` and ``values = round(v / scale)``, so
+    each dimension takes one byte (a quarter of float32, a thirtieth of a
+    list of Python floats) and is reconstructed to within ``scale / 2``.
+    Suited to storing and scanning embeddings where this error is below
+    the ranking noise; keep float vectors where exact scores matter.
+    
+    Args:
+        vector: Dense vector (list, tuple, array, or ndarray).
+    
+    Returns:
+        QuantizedVector with an int8 ``numpy.ndarray`` and its scale.
+    
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+    values = to_dense_array(vector, "float32")
+    peak = float(abs(values).max()) if values.size else 0.0
+    scale = peak / 127 if peak else 1.0
+    return QuantizedVector((values / scale).round().astype("int8"), scale)
+
+
+def dequantize_dense_vector(vector: Union[Sequence[float], QuantizedVector]) -> Any:
+    """Return a dense vector as a float32 NumPy array, dequantizing if needed.
+    
+    Raises:
+        ImportError: If numpy is not installed.
+    """
+    if isinstance(vector, QuantizedVector):
+        return vector.values.astype("float32") * vector.scale
+    return to_dense_array(vector, "float32")
+
+
+def _json_default(obj: Any) -> Any:
+    """JSON fallback for array-like values (``array.array``, ``numpy.ndarray``)."""
+    tolist = getattr(obj, "tolist", None)
+    if tolist is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return tolist()
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Encode with the stdlib json module (fallback when orjson and msgspec are missing)."""
+    if not isinstance(obj, dict):
+        obj = obj.to_dict(copy_metadata=False)
+    return json.dumps(
+        obj, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _json_encoder() -> Callable[[Any], bytes]:
+    """Resolve the JSON encoder once per process.
+    
+    Uses orjson when installed: it serializes slotted dataclasses and NumPy
+    arrays natively, in a single pass with no intermediate dict. msgspec is
+    the next choice; it also encodes dataclasses directly, with arrays
+    going through _json_default. The resolved encoder is cached so hot
+    serialization paths do not repeat the import lookup and option setup
+    on every call.
+    """
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return partial(
+            orjson.dumps, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+    try:
+        import msgspec
+    except ImportError:
+        return _stdlib_dumps
+    return msgspec.json.Encoder(enc_hook=_json_default).encode
+
+
+def _dumps_json(obj: Any) -> bytes:
+    """Serialize a core type (or its dict form) to compact UTF-8 JSON."""
+    return _json_encoder()(obj)
+
+
+@lru_cache(maxsize=None)
+def _json_decoder() -> Callable[[Union[bytes, str]], Any]:
+    """Resolve the JSON decoder once per process (orjson, msgspec, stdlib)."""
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        return orjson.loads
+    try:
+        import msgspec
+    except ImportError:
+        return json.loads
+    return msgspec.json.Decoder().decode
+
+
+def _loads_json(data: Union[bytes, str]) -> Any:
+    """Parse JSON produced by _dumps_json."""
+    return _json_decoder()(data)
+
+
+def pack_sparse_vector(
+    weights: Dict[str, float],
+    vocabulary: Dict[str, int],
+) -> Tuple[array, array]:
+    """Pack a token->weight sparse vector into parallel index/value arrays.
+    
+    The packed form stores int32 token ids and float32 weights in two flat
+    buffers (CSR row layout) instead of a dict of str keys and boxed floats,
+    cutting per-chunk memory several-fold. Both arrays support the buffer
+    protocol, so ``numpy.frombuffer`` can view them without copying.
+    
+    Args:
+        weights: Sparse vector as ``{token: weight}``.
+        vocabulary: Collection-level ``{token: id}`` mapping. Unseen tokens
+            are assigned the next free id (the mapping is updated in place).
+    
+    Returns:
+        ``(indices, values)`` as ``array('i')`` / ``array('f')``, sorted by index.
+    """
+    ids = []
+    for token, weight in weights.items():
+        token_id = vocabulary.get(token)
+        if token_id is None:
+            token_id = vocabulary[token] = len(vocabulary)
+        ids.append((token_id, weight))
+    ids.sort()
+    return array("i", [i for i, _ in ids]), array("f", [w for _, w in ids])
+
+
+class ImageOffsetIndex:
+    """Sorted index over ``metadata["images"]`` for text-range lookups.
+    
+    Splitting a document needs, for every chunk, the images whose
+    placeholder falls inside that chunk's ``[start, end)`` character range.
+    Scanning the list of image dicts per chunk is O(images) each time; this
+    keeps the ``text_offset`` values in a flat int64 array sorted once, so
+    each lookup is two binary searches plus a slice.
+    
+    Example:
+        >>> index = ImageOffsetIndex(doc.metadata.get("images", []))
+        >>> chunk_images = index.in_range(chunk.start_offset, chunk.end_offset)
+    """
+    
+    __slots__ = ("_offsets", "_images")
+    
+    def __init__(self, images: Sequence[Dict[str, Any]]):
+        """Build the index.
+        
+        Args:
+            images: Image references (see Document Images Field Specification).
+                Entries without a ``text_offset`` are not indexed.
+        """
+        indexed = sorted(
+            (image for image in images if image.get("text_offset") is not None),
+            key=lambda image: image["text_offset"],
+        )
+        self._offsets = array("q", [image["text_offset"] for image in indexed])
+        self._images = indexed
+    
+    def __len__(self) -> int:
+        return len(self._images)
+    
+    def in_range(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """Return images whose placeholder starts within ``[start, end)``.
+        
+        Args:
+            start: Range start (character offset, inclusive).
+            end: Range end (character offset, exclusive).
+        
+        Returns:
+            Matching image references in offset order.
+        """
+        offsets = self._offsets
+        return self._images[bisect_left(offsets, start):bisect_left(offsets, end)]
+
+
+# Required metadata key, interned once for the per-construction check
+_SOURCE_PATH = sys.intern("source_path")
+
+
+# Document-level metadata shared by all chunks of a document, keyed by
+# Document.id. Chunks whose source_ref is registered here only need to carry
+# their chunk-specific fields; see Chunk.full_metadata.
+_DOC_META: Dict[str, Dict[str, Any]] = {}
+
+
+def register_document_metadata(doc_id: str, metadata: Dict[str, Any]) -> None:
+    """Register a document's metadata as the shared parent of its chunks.
+    
+    Chunks referencing ``doc_id`` via ``source_ref`` can then omit
+    document-level fields (``source_path``, ``doc_type``, ``title``, ...)
+    instead of holding one copy per chunk.
+    
+    Args:
+        doc_id: Parent Document.id.
+        metadata: Document-level metadata; must contain ``source_path``.
+    
+    Raises:
+        ValueError: If ``metadata`` has no ``source_path``.
+    """
+    if _SOURCE_PATH not in metadata:
+        raise ValueError("Document metadata must contain 'source_path'")
+    _DOC_META[doc_id] = metadata
+
+
+def unregister_document_metadata(doc_id: str) -> None:
+    """Drop a document's shared metadata (no-op if not registered)."""
+    _DOC_META.pop(doc_id, None)
+
+
+# The record types built by _unsafe_new / _from_dict_unchecked
+_RecordT = TypeVar("_RecordT", "Document", "Chunk", "ChunkRecord")
+
+
+def _unsafe_new(cls: Type[_RecordT], values: Dict[str, Any]) -> _RecordT:
+    """Build an instance of ``cls`` from field values without running __init__.
+    
+    For trusted internal callers only: kwargs parsing and ``__post_init__``
+    validation are skipped, so ``values`` must already satisfy the type's
+    invariants (validation happens once at the ingestion boundary). Missing
+    fields default to None; metadata defaults to an empty dict.
+    
+    The types are frozen, so fields are assigned with ``object.__setattr__``.
+    """
+    obj = object.__new__(cls)
+    set_field = object.__setattr__
+    get = values.get
+    for name in cls._FIELDS:
+        set_field(obj, name, get(name))
+    if obj.metadata is None:
+        set_field(obj, "metadata", {})
+    return obj
+
+
+def _from_dict_unchecked(cls: Type[_RecordT], data: Dict[str, Any]) -> _RecordT:
+    """Build an instance of ``cls`` from a dict without running __init__.
+    
+    Used by ``from_dict`` for bulk deserialization: the data is expected to
+    come from a previous ``to_dict()`` call and has already been validated,
+    so it goes through _unsafe_new. Metadata keys are interned.
+    """
+    obj = _unsafe_new(cls, data)
+    metadata = obj.metadata
+    if metadata:
+        object.__setattr__(obj, "metadata", _intern_keys(metadata))
+    return obj
+
+
+@dataclass(frozen=True, slots=True)
 class Document:
     """Represents a raw document loaded from source.
     
@@ -59,26 +375,76 @@ class Document:
         ... )
     """
     
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
+    
     id: str
     text: str
     metadata: Dict[str, Any] = field(default_factory=dict)
     
     def __post_init__(self):
         """Validate required metadata fields."""
-        if "source_path" not in self.metadata:
+        if self.metadata.get(_SOURCE_PATH) is None:
             raise ValueError("Document metadata must contain 'source_path'")
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return asdict(self)
+    def __hash__(self) -> int:
+        """Hash by id, so instances can be used in sets and as dict keys.
+        
+        Equal instances always share an id, so this is consistent with the
+        field-wise ``__eq__``. ``str`` caches its own hash, so repeated
+        hashing costs a field load rather than rehashing the id.
+        """
+        return hash(self.id)
+    
+    def to_dict(self, copy_metadata: bool = True) -> Dict[str, Any]:
+        """Convert to dictionary for serialization.
+        
+        Builds the dict directly instead of using ``dataclasses.asdict``,
+        which deep-copies every nested value. Metadata is shallow-copied so
+        callers can mutate the result without affecting this instance.
+        
+        A dict literal is used rather than copying a class-level template
+        and assigning each key: for these 3-6 key shapes the two measure
+        within noise of each other (BUILD_MAP vs dict.copy + STORE_SUBSCR),
+        and the literal cannot drift out of sync with the fields.
+        
+        Args:
+            copy_metadata: If False, the result references this instance's
+                metadata dict instead of a copy. For sinks that serialize and
+                discard the dict immediately (JSON encoders, vector store
+                upserts), this avoids one dict allocation per call; the
+                caller must not mutate the returned metadata.
+        """
+        return {
+            "id": self.id,
+            "text": self.text,
+            "metadata": dict(self.metadata) if copy_metadata else self.metadata,
+        }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to compact UTF-8 JSON, equivalent to ``to_dict()``.
+        
+        Faster than ``json.dumps(self.to_dict())`` when orjson is installed.
+        """
+        return _dumps_json(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Document":
-        """Create Document from dictionary."""
-        return cls(**data)
+        """Create Document from dictionary.
+        
+        Skips __post_init__ validation; see _from_dict_unchecked.
+        """
+        return _from_dict_unchecked(cls, data)
+    
+    @classmethod
+    def from_json_bytes(cls, data: Union[bytes, str]) -> "Document":
+        """Create Document from to_json_bytes() output.
+        
+        Faster than ``from_dict(json.loads(data))`` when orjson is installed.
+        """
+        return cls.from_dict(_loads_json(data))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Chunk:
     """Represents a text chunk after splitting a Document.
     
@@ -97,6 +463,7 @@ class Chunk:
             - source_ref: Reference to parent document ID (optional)
             - images: Subset of Document.images that fall within this chunk (optional)
             - Any document-level metadata propagated from Document
+              (may be omitted if the parent is registered, see full_metadata)
         start_offset: Starting character position in original document (optional)
         end_offset: Ending character position in original document (optional)
         source_ref: Reference to parent Document.id (optional)
@@ -118,6 +485,8 @@ class Chunk:
         ... )
     """
     
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
+    
     id: str
     text: str
     metadata: Dict[str, Any] = field(default_factory=dict)
@@ -126,21 +495,77 @@ class Chunk:
     source_ref: Optional[str] = None
     
     def __post_init__(self):
-        """Validate required metadata fields."""
-        if "source_path" not in self.metadata:
+        """Validate required metadata fields.
+        
+        source_path may be omitted when source_ref points to a parent
+        registered with register_document_metadata.
+        """
+        if self.metadata.get(_SOURCE_PATH) is None and self.source_ref not in _DOC_META:
             raise ValueError("Chunk metadata must contain 'source_path'")
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return asdict(self)
+    @property
+    def full_metadata(self) -> ChainMap:
+        """Chunk metadata layered over the registered parent's metadata.
+        
+        Chunk-level keys take precedence. If no parent is registered for
+        source_ref, this is a view of the chunk metadata alone.
+        """
+        return ChainMap(self.metadata, _DOC_META.get(self.source_ref, {}))
+    
+    def __hash__(self) -> int:
+        """Hash by id; see Document.__hash__."""
+        return hash(self.id)
+    
+    def to_dict(self, copy_metadata: bool = True) -> Dict[str, Any]:
+        """Convert to dictionary for serialization.
+        
+        See Document.to_dict for copy semantics and copy_metadata. If the
+        chunk relies on a registered parent for source_path, the parent's
+        metadata is flattened in so the output is self-contained.
+        
+        Raises:
+            ValueError: If source_path is missing and the parent is no
+                longer registered.
+        """
+        metadata = self.metadata
+        if _SOURCE_PATH not in metadata:
+            metadata = _record_metadata(self)
+        elif copy_metadata:
+            metadata = dict(metadata)
+        return {
+            "id": self.id,
+            "text": self.text,
+            "metadata": metadata,
+            "start_offset": self.start_offset,
+            "end_offset": self.end_offset,
+            "source_ref": self.source_ref,
+        }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to compact UTF-8 JSON, equivalent to ``to_dict()``.
+        
+        Faster than ``json.dumps(self.to_dict())`` when orjson is installed.
+        """
+        if _SOURCE_PATH not in self.metadata:
+            # Parent metadata has to be flattened in; see to_dict
+            return _dumps_json(self.to_dict(copy_metadata=False))
+        return _dumps_json(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Chunk":
-        """Create Chunk from dictionary."""
-        return cls(**data)
+        """Create Chunk from dictionary.
+        
+        Skips __post_init__ validation; see _from_dict_unchecked.
+        """
+        return _from_dict_unchecked(cls, data)
+    
+    @classmethod
+    def from_json_bytes(cls, data: Union[bytes, str]) -> "Chunk":
+        """Create Chunk from to_json_bytes() output; see Document.from_json_bytes."""
+        return cls.from_dict(_loads_json(data))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ChunkRecord:
     """Represents a fully processed chunk ready for storage and retrieval.
     
@@ -158,8 +583,12 @@ class ChunkRecord:
             - images: Image references from Chunk (see Document.images specification)
             - Any enrichment from Transform pipeline (title, summary, tags)
             - image_captions: Dict[image_id, caption_text] if multimodal enrichment applied
-        dense_vector: Dense embedding vector (e.g., from OpenAI, BGE)
-        sparse_vector: Sparse vector for BM25/keyword matching (optional)
+        dense_vector: Dense embedding vector (e.g., from OpenAI, BGE). May be a
+            list of floats, a NumPy array (see to_dense_array) or an int8
+            QuantizedVector (see quantize_dense_vector)
+        sparse_vector: Sparse vector for BM25/keyword matching (optional). Either
+            a ``{token: weight}`` dict or a packed ``(indices, values)`` pair
+            from pack_sparse_vector
     
     Note: Image captions generated by ImageCaptioner are stored in metadata.image_captions
           as a dictionary mapping image_id to generated caption text.
@@ -179,49 +608,401 @@ class ChunkRecord:
         ... )
     """
     
+    _FIELDS: ClassVar[Tuple[str, ...]] = ()
+    
     id: str
     text: str
     metadata: Dict[str, Any] = field(default_factory=dict)
-    dense_vector: Optional[List[float]] = None
-    sparse_vector: Optional[Dict[str, float]] = None
+    dense_vector: Optional[Sequence[float]] = None
+    sparse_vector: Optional[Union[Dict[str, float], "PackedSparseVector"]] = None
     
     def __post_init__(self):
         """Validate required metadata fields."""
-        if "source_path" not in self.metadata:
+        if self.metadata.get(_SOURCE_PATH) is None:
             raise ValueError("ChunkRecord metadata must contain 'source_path'")
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return asdict(self)
+    def __eq__(self, other: object) -> bool:
+        """Field-wise equality that compares vectors array-aware.
+        
+        The generated dataclass ``__eq__`` would compare NumPy vectors with
+        ``==``, which is element-wise and has no truth value; see
+        _vectors_equal.
+        """
+        if not isinstance(other, ChunkRecord):
+            return NotImplemented
+        return (
+            self.id == other.id
+            and self.text == other.text
+            and self.metadata == other.metadata
+            and _vectors_equal(self.dense_vector, other.dense_vector)
+            and _vectors_equal(self.sparse_vector, other.sparse_vector)
+        )
+    
+    def __hash__(self) -> int:
+        """Hash by id; see Document.__hash__."""
+        return hash(self.id)
+    
+    def to_dict(self, copy_metadata: bool = True) -> Dict[str, Any]:
+        """Convert to dictionary for serialization.
+        
+        Vectors are returned as-is (not copied); they can hold thousands of
+        floats and are treated as read-only once attached to a record.
+        A packed sparse vector is emitted as ``{"indices": [...], "values": [...]}``
+        and a quantized dense vector as ``{"int8": <base64>, "scale": ...}``.
+        See Document.to_dict for metadata copy semantics and copy_metadata.
+        """
+        dense_vector = self.dense_vector
+        if isinstance(dense_vector, QuantizedVector):
+            dense_vector = {
+                "int8": base64.b64encode(dense_vector.values.tobytes()).decode("ascii"),
+                "scale": dense_vector.scale,
+            }
+        sparse_vector = self.sparse_vector
+        if isinstance(sparse_vector, tuple):
+            indices, values = sparse_vector
+            sparse_vector = {"indices": list(indices), "values": list(values)}
+        return {
+            "id": self.id,
+            "text": self.text,
+            "metadata": dict(self.metadata) if copy_metadata else self.metadata,
+            "dense_vector": dense_vector,
+            "sparse_vector": sparse_vector,
+        }
+    
+    def to_json_bytes(self) -> bytes:
+        """Serialize to compact UTF-8 JSON, equivalent to ``to_dict()``.
+        
+        Faster than ``json.dumps(self.to_dict())`` when orjson is installed;
+        NumPy dense vectors are encoded natively.
+        """
+        if isinstance(self.sparse_vector, tuple) or isinstance(self.dense_vector, QuantizedVector):
+            # Packed/quantized vectors need their dict layouts; see to_dict
+            return _dumps_json(self.to_dict(copy_metadata=False))
+        return _dumps_json(self)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ChunkRecord":
-        """Create ChunkRecord from dictionary."""
-        return cls(**data)
+        """Create ChunkRecord from dictionary.
+        
+        Skips __post_init__ validation; see _from_dict_unchecked. A sparse
+        vector serialized in packed form is restored as an array pair, and
+        a quantized dense vector as a QuantizedVector.
+        """
+        record = _from_dict_unchecked(cls, data)
+        dense_vector = record.dense_vector
+        if isinstance(dense_vector, dict) and dense_vector.keys() == {"int8", "scale"}:
+            raw = base64.b64decode(dense_vector["int8"])
+            object.__setattr__(record, "dense_vector", QuantizedVector(
+                to_dense_array(memoryview(raw).cast("b"), "int8"),
+                dense_vector["scale"],
+            ))
+        sparse_vector = record.sparse_vector
+        if (
+            isinstance(sparse_vector, dict)
+            and sparse_vector.keys() == {"indices", "values"}
+            and isinstance(sparse_vector["indices"], list)
+        ):
+            object.__setattr__(record, "sparse_vector", (
+                array("i", sparse_vector["indices"]),
+                array("f", sparse_vector["values"]),
+            ))
+        return record
     
     @classmethod
-    def from_chunk(cls, chunk: Chunk, dense_vector: Optional[List[float]] = None,
-                   sparse_vector: Optional[Dict[str, float]] = None) -> "ChunkRecord":
+    def from_json_bytes(cls, data: Union[bytes, str]) -> "ChunkRecord":
+        """Create ChunkRecord from to_json_bytes() output; see Document.from_json_bytes."""
+        return cls.from_dict(_loads_json(data))
+    
+    @classmethod
+    def from_chunk(cls, chunk: Chunk, dense_vector: Optional[Sequence[float]] = None,
+                   sparse_vector: Optional[Union[Dict[str, float], "PackedSparseVector"]] = None,
+                   dtype: Optional[str] = None) -> "ChunkRecord":
         """Create ChunkRecord from a Chunk with vectors.
         
         Args:
             chunk: Source Chunk object
-            dense_vector: Dense embedding vector
+            dense_vector: Dense embedding vector (list or NumPy array)
             sparse_vector: Sparse vector representation
+            dtype: Optional NumPy dtype (e.g. 'float32', 'float16'); when set,
+                dense_vector is stored as an array of that dtype. 'int8'
+                stores a QuantizedVector (see quantize_dense_vector)
             
         Returns:
             ChunkRecord with all fields populated from chunk
         """
+        if dtype == "int8" and dense_vector is not None:
+            dense_vector = quantize_dense_vector(dense_vector)
+        elif dtype is not None and dense_vector is not None:
+            dense_vector = to_dense_array(dense_vector, dtype)
+        metadata = _record_metadata(chunk)
+        if metadata.get(_SOURCE_PATH) is None:
+            raise ValueError("ChunkRecord metadata must contain 'source_path'")
+        # Validated above, so fields are assigned directly (see from_chunks)
+        record = object.__new__(cls)
+        set_field = object.__setattr__
+        set_field(record, "id", chunk.id)
+        set_field(record, "text", chunk.text)
+        set_field(record, "metadata", metadata)
+        set_field(record, "dense_vector", dense_vector)
+        set_field(record, "sparse_vector", sparse_vector)
+        return record
+
+    
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Sequence[Chunk],
+        dense_vectors: Sequence[Sequence[float]],
+        sparse_vectors: Optional[Sequence[Any]] = None,
+        *,
+        own_metadata: bool = False,
+    ) -> List["ChunkRecord"]:
+        """Create ChunkRecords for a batch of Chunks in one pass.
+        
+        Batch counterpart of from_chunk for embedding output. Chunks are
+        already validated, so records are assembled directly without going
+        through __init__/__post_init__.
+        
+        Args:
+            chunks: Source Chunk objects
+            dense_vectors: One dense vector per chunk. A 2D NumPy array is
+                accepted; each record then holds a row view (no copy). A
+                non C-contiguous matrix (e.g. Fortran-ordered output) is
+                made C-contiguous once up front so every row view is a
+                dense slice
+            sparse_vectors: Optional sparse vector per chunk
+            own_metadata: If True, the caller transfers ownership of each
+                chunk's metadata dict (e.g. chunks are discarded afterwards),
+                so it is reused instead of copied. Chunks relying on shared
+                parent metadata are always flattened into a new dict
+        
+        Returns:
+            List of ChunkRecords in the same order as chunks
+        
+        Raises:
+            ValueError: If the vector counts do not match the chunk count
+        """
+        count = len(chunks)
+        if len(dense_vectors) != count:
+            raise ValueError(
+                f"Expected {count} dense vectors, got {len(dense_vectors)}"
+            )
+        flags = getattr(dense_vectors, "flags", None)
+        if flags is not None and getattr(dense_vectors, "ndim", 0) == 2 \
+                and not flags.c_contiguous:
+            dense_vectors = to_dense_array(dense_vectors, dense_vectors.dtype)
+        if sparse_vectors is None:
+            sparse_vectors = (None,) * count
+        elif len(sparse_vectors) != count:
+            raise ValueError(
+                f"Expected {count} sparse vectors, got {len(sparse_vectors)}"
+            )
+        
+        new = object.__new__
+        set_field = object.__setattr__
+        records = []
+        append = records.append
+        for chunk, dense, sparse in zip(chunks, dense_vectors, sparse_vectors):
+            record = new(cls)
+            set_field(record, "id", chunk.id)
+            set_field(record, "text", chunk.text)
+            metadata = chunk.metadata
+            if not (own_metadata and _SOURCE_PATH in metadata):
+                metadata = _record_metadata(chunk)
+            set_field(record, "metadata", metadata)
+            set_field(record, "dense_vector", dense)
+            set_field(record, "sparse_vector", sparse)
+            append(record)
+        return records
+
+
+@dataclass(slots=True)
+class ChunkBatch:
+    """Column-oriented (struct-of-arrays) batch of chunks.
+    
+    Holds one list per Chunk field instead of one object per chunk, plus
+    the batch's embeddings as a single (N, D) matrix. Stages that work on
+    whole columns (embedding, vector store upserts) can pass ``texts`` or
+    ``dense`` along by reference instead of gathering them chunk by chunk.
+    
+    Row i of every column belongs to the same chunk. Metadata dicts are
+    shared with the chunks the batch was built from, not copied.
+    
+    Attributes:
+        ids: Chunk ids.
+        texts: Chunk texts.
+        metadatas: Chunk metadata dicts.
+        start_offsets: Chunk start offsets (None where unknown).
+        end_offsets: Chunk end offsets (None where unknown).
+        source_refs: Parent document ids (None where unset).
+        dense: Optional 2D NumPy array with one embedding row per chunk.
+        sparse: Optional sparse vector per chunk (dict or packed form).
+    
+    Example:
+        >>> batch = ChunkBatch.from_chunks(chunks, dense_vectors=embeddings)
+        >>> store.upsert(batch.to_records())
+    """
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    start_offsets: List[Optional[int]]
+    end_offsets: List[Optional[int]]
+    source_refs: List[Optional[str]]
+    dense: Optional[Any] = None
+    sparse: Optional[List[Any]] = None
+    
+    def __post_init__(self):
+        """Validate that all columns have one entry per chunk."""
+        count = len(self.ids)
+        columns = (self.texts, self.metadatas, self.start_offsets,
+                   self.end_offsets, self.source_refs)
+        if any(len(column) != count for column in columns):
+            raise ValueError("ChunkBatch columns must all have the same length")
+        if self.dense is not None and len(self.dense) != count:
+            raise ValueError(f"Expected {count} dense vectors, got {len(self.dense)}")
+        if self.sparse is not None and len(self.sparse) != count:
+            raise ValueError(f"Expected {count} sparse vectors, got {len(self.sparse)}")
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Sequence[Chunk],
+        dense_vectors: Optional[Sequence[Sequence[float]]] = None,
+        sparse_vectors: Optional[Sequence[Any]] = None,
+        dtype: str = "float32",
+    ) -> "ChunkBatch":
+        """Build a batch from Chunks and optional per-chunk vectors.
+        
+        Args:
+            chunks: Source Chunk objects
+            dense_vectors: Optional dense vector per chunk; stacked into one
+                C-contiguous matrix of the given dtype (no copy if it already
+                is one)
+            sparse_vectors: Optional sparse vector per chunk
+            dtype: NumPy dtype of the dense matrix
+        
+        Raises:
+            ValueError: If the vector counts do not match the chunk count
+        """
+        dense = None
+        if dense_vectors is not None:
+            dense = to_dense_array(dense_vectors, dtype)
         return cls(
-            id=chunk.id,
-            text=chunk.text,
-            metadata=chunk.metadata.copy(),
-            dense_vector=dense_vector,
-            sparse_vector=sparse_vector
+            ids=[chunk.id for chunk in chunks],
+            texts=[chunk.text for chunk in chunks],
+            metadatas=[chunk.metadata for chunk in chunks],
+            start_offsets=[chunk.start_offset for chunk in chunks],
+            end_offsets=[chunk.end_offset for chunk in chunks],
+            source_refs=[chunk.source_ref for chunk in chunks],
+            dense=dense,
+            sparse=list(sparse_vectors) if sparse_vectors is not None else None,
         )
+    
+    def to_chunks(self) -> List[Chunk]:
+        """Rebuild the Chunk objects (without re-running validation)."""
+        new = object.__new__
+        set_field = object.__setattr__
+        chunks = []
+        append = chunks.append
+        for row in zip(self.ids, self.texts, self.metadatas, self.start_offsets,
+                       self.end_offsets, self.source_refs):
+            chunk = new(Chunk)
+            for name, value in zip(Chunk._FIELDS, row):
+                set_field(chunk, name, value)
+            append(chunk)
+        return chunks
+    
+    def to_records(self, own_metadata: bool = False) -> List["ChunkRecord"]:
+        """Create ChunkRecords from the batch; see ChunkRecord.from_chunks.
+        
+        Each record's dense_vector is a row view of ``dense`` (no copy).
+        
+        Raises:
+            ValueError: If the batch has no dense vectors
+        """
+        if self.dense is None:
+            raise ValueError("ChunkBatch has no dense vectors")
+        return ChunkRecord.from_chunks(
+            self.to_chunks(), self.dense, self.sparse, own_metadata=own_metadata
+        )
+
+
+def _vectors_equal(a: Any, b: Any) -> bool:
+    """Compare two vector values, treating NumPy arrays as whole values.
+    
+    Uses ``numpy.array_equal`` when either side is an ndarray, and a plain
+    ``==`` otherwise. Tuples (packed sparse vectors, QuantizedVector) are
+    compared item by item, since their items may be arrays.
+    """
+    if isinstance(a, tuple) and isinstance(b, tuple):
+        return len(a) == len(b) and all(map(_vectors_equal, a, b))
+    if hasattr(a, "ndim") or hasattr(b, "ndim"):
+        import numpy as np
+        
+        return bool(np.array_equal(a, b))
+    return bool(a == b)
+
+
+def _record_metadata(chunk: Chunk) -> Dict[str, Any]:
+    """Copy a chunk's metadata for a ChunkRecord or serialized Chunk.
+    
+    Records and serialized chunks are stored standalone, so shared parent
+    metadata is flattened in when the chunk does not carry its own
+    source_path.
+    """
+    if _SOURCE_PATH in chunk.metadata:
+        return chunk.metadata.copy()
+    parent = _DOC_META.get(chunk.source_ref)
+    if parent is None:
+        raise ValueError(
+            f"Chunk '{chunk.id}' has no 'source_path' and its parent "
+            f"'{chunk.source_ref}' is not registered"
+        )
+    return {**parent, **chunk.metadata}
+
+
+# Field names are resolved once at import time for the from_dict fast path
+Document._FIELDS = tuple(f.name for f in fields(Document))
+Chunk._FIELDS = tuple(f.name for f in fields(Chunk))
+ChunkRecord._FIELDS = tuple(f.name for f in fields(ChunkRecord))
 
 
 # Type aliases for convenience
 Metadata = Dict[str, Any]
 Vector = List[float]
 SparseVector = Dict[str, float]
+PackedSparseVector = Tuple[Sequence[int], Sequence[float]]
+
+
+class ImageRef(TypedDict, total=False):
+    """Typed shape of one entry in ``metadata["images"]``.
+    
+    See the Images Field Specification in Document.
+    """
+    
+    id: str
+    path: str
+    page: int
+    text_offset: int
+    text_length: int
+    position: Dict[str, Any]
+
+
+class DocumentMetadata(TypedDict, total=False):
+    """Typed shape of the common document-level metadata fields.
+    
+    ``metadata`` stays a plain dict at runtime (custom keys are allowed and
+    loaders/transforms add their own), so this is for static analysis only:
+    annotate loader output with it to have mypy check the well-known keys.
+    ``source_path`` is required by validation even though the TypedDict is
+    declared non-total.
+    """
+    
+    source_path: str
+    doc_type: str
+    title: str
+    page_count: int
+    images: List[ImageRef]
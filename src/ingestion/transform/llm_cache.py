@@ -0,0 +1,220 @@
+"""Persistent exact-match cache for LLM refinement responses.
+
+Refining the same text with the same model and prompt at (near-)zero
+temperature gives effectively the same answer every time, so ChunkRefiner
+stores successful responses in a small SQLite database keyed by a SHA-256
+digest of the request and skips the API call on a repeat. Entries expire
+after a TTL and the least recently used ones are evicted beyond a size cap.
+Recently used entries are also kept in memory, so hot keys are served
+without a database round trip.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.libs.llm.base_llm import Message
+from src.observability.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Sampling above this temperature is not reproducible enough to cache
+MAX_CACHEABLE_TEMPERATURE = 0.1
+
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS llm_responses (
+        cache_key BLOB PRIMARY KEY,
+        response TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    )
+"""
+
+
+class LLMResponseCache:
+    """SQLite-backed exact-match response cache with TTL and LRU eviction.
+
+    The cache is safe to share between threads. Storage errors are logged
+    and treated as misses, so a broken cache never blocks refinement.
+
+    The most recently used entries are mirrored in an in-memory LRU keyed by
+    the same 32-byte digest, holding (created_at, response) tuples. Hits on
+    it skip SQLite; their access times are written back on the next store
+    (before eviction runs) or on close.
+
+    Attributes:
+        db_path: Path to the SQLite database file (created if needed).
+        ttl: Seconds after which an entry is no longer returned.
+        max_entries: Entries kept before least recently used ones are evicted.
+        memory_entries: Entries mirrored in memory (at most max_entries).
+    """
+
+    DEFAULT_TTL = 86400  # seconds
+    DEFAULT_MAX_ENTRIES = 10_000
+    DEFAULT_MEMORY_ENTRIES = 1024
+
+    def __init__(
+        self,
+        db_path: str,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            db_path: Path to SQLite database file (parent directories are created).
+            ttl: Entry lifetime in seconds.
+            max_entries: Maximum number of stored responses.
+            memory_entries: Maximum number of responses kept in memory
+                (0 disables the in-memory tier).
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = min(memory_entries, max_entries)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._memory: OrderedDict[bytes, Tuple[float, str]] = OrderedDict()
+        # Access times of memory hits not yet written to the database
+        self._touched: Dict[bytes, float] = {}
+
+    @staticmethod
+    def cache_key(
+        model: Any,
+        messages: List[Message],
+        temperature: Any,
+        max_tokens: Any = None,
+        provider: str = "",
+    ) -> Optional[bytes]:
+        """Build the cache key for a request, or None if it must not be cached.
+
+        Requests are only cacheable with a known model and a temperature of
+        at most MAX_CACHEABLE_TEMPERATURE.
+
+        Returns:
+            SHA-256 digest of provider, model, sampling parameters and messages.
+        """
+        if not isinstance(model, str) or not isinstance(temperature, (int, float)):
+            return None
+        if temperature > MAX_CACHEABLE_TEMPERATURE:
+            return None
+        digest = hashlib.sha256(usedforsecurity=False)
+        digest.update(repr((
+            provider,
+            model,
+            float(temperature),
+            max_tokens if isinstance(max_tokens, int) else None,
+            [(m.role, m.content) for m in messages],
+        )).encode("utf-8"))
+        return digest.digest()
+
+    def get(self, key: Optional[bytes]) -> Optional[str]:
+        """Return the cached response for key, or None on miss or expiry."""
+        if key is None:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                entry = self._memory.get(key)
+                if entry is not None:
+                    if entry[0] >= now - self.ttl:
+                        self._memory.move_to_end(key)
+                        self._touched[key] = now
+                        return entry[1]
+                    del self._memory[key]
+
+                conn = self._connection()
+                row = conn.execute(
+                    "SELECT created_at, response FROM llm_responses "
+                    "WHERE cache_key = ? AND created_at >= ?",
+                    (key, now - self.ttl),
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    "UPDATE llm_responses SET accessed_at = ? WHERE cache_key = ?",
+                    (now, key),
+                )
+                self._remember(key, row[0], row[1])
+                return row[1]
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            return None
+
+    def set(self, key: Optional[bytes], response: str) -> None:
+        """Store a response, evicting expired and least recently used entries."""
+        if key is None:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses "
+                    "(cache_key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, response, now, now),
+                )
+                self._flush_touched(conn)
+                conn.execute(
+                    "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl,)
+                )
+                conn.execute(
+                    "DELETE FROM llm_responses WHERE cache_key NOT IN ("
+                    "SELECT cache_key FROM llm_responses "
+                    "ORDER BY accessed_at DESC LIMIT ?)",
+                    (self.max_entries,),
+                )
+                self._remember(key, now, response)
+        except sqlite3.Error as e:
+            logger.warning(f"LLM cache store failed: {e}")
+
+    def close(self) -> None:
+        """Write back pending access times and close the database connection.
+
+        The connection is reopened on next use.
+        """
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._flush_touched(self._conn)
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache write-back failed: {e}")
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key: bytes, created_at: float, response: str) -> None:
+        """Store an entry in the in-memory LRU. Caller must hold _lock."""
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        """Write memory-hit access times to the database. Caller must hold _lock."""
+        if self._touched:
+            conn.executemany(
+                "UPDATE llm_responses SET accessed_at = ? WHERE cache_key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use. Caller must hold _lock."""
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_CREATE_TABLE_SQL)
+            self._conn = conn
+        return self._conn
@@ -11,6 +11,7 @@ import os
 from typing import Any, Dict, List, Optional
 
 from src.libs.llm.base_llm import BaseLLM, ChatResponse, Message
+from src.libs.llm.http_client import get_http_client, prewarm
 
 
 class AzureLLMError(RuntimeError):
@@ -109,17 +110,14 @@ class AzureLLM(BaseLLM):
             ValueError: If messages are invalid.
             AzureLLMError: If API call fails.
         """
-        # Validate input
-        self.validate_messages(messages)
+        # Validate input and convert messages to API format in one pass
+        api_messages = self.to_api_messages(messages)
         
         # Prepare request parameters
         temperature = kwargs.get("temperature", self.default_temperature)
         max_tokens = kwargs.get("max_tokens", self.default_max_tokens)
         deployment = kwargs.get("deployment_name", self.deployment_name)
         
-        # Convert messages to API format
-        api_messages = [{"role": m.role, "content": m.content} for m in messages]
-        
         # Make API call
         try:
             response_data = self._call_api(
@@ -150,6 +148,10 @@ class AzureLLM(BaseLLM):
                 f"[Azure] API call failed: {type(e).__name__}: {e}"
             ) from e
     
+    def warm_up(self) -> None:
+        """Pre-warm the shared connection pool for this endpoint (non-blocking)."""
+        prewarm(self.endpoint.rstrip('/'))
+    
     def _call_api(
         self,
         messages: List[Dict[str, str]],
@@ -192,16 +194,15 @@ class AzureLLM(BaseLLM):
         }
         
         try:
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(url, json=payload, headers=headers)
-                
-                if response.status_code != 200:
-                    error_detail = self._parse_error_response(response)
-                    raise AzureLLMError(
-                        f"[Azure] API error (HTTP {response.status_code}): {error_detail}"
-                    )
-                
-                return response.json()
+            response = get_http_client().post(url, json=payload, headers=headers)
+            
+            if response.status_code != 200:
+                error_detail = self._parse_error_response(response)
+                raise AzureLLMError(
+                    f"[Azure] API error (HTTP {response.status_code}): {error_detail}"
+                )
+            
+            return response.json()
         except httpx.TimeoutException as e:
             raise AzureLLMError(
                 f"[Azure] Request timed out after 60 seconds"
@@ -8,18 +8,280 @@ and document analysis.
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
+import importlib.util
 import io
+import json
+import math
+import mmap
 import os
-from pathlib import Path
-from typing import Any, Optional
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Optional, Sequence, Union
 
 from src.libs.llm.base_llm import ChatResponse, Message
 from src.libs.llm.base_vision_llm import BaseVisionLLM, ImageInput
+from src.libs.llm.http_client import get_http_client
 
 
 class AzureVisionLLMError(RuntimeError):
-    """Raised when Azure Vision API call fails."""
+    """Raised when Azure Vision API call fails.
+    
+    Attributes:
+        category: Failure class: 'timeout', 'connection', 'http',
+            'response' (malformed body) or 'unknown'.
+        retryable: Whether repeating the same request may succeed
+            (timeouts, connection errors, HTTP 408/429/5xx).
+        status_code: HTTP status code for 'http' errors, else None.
+    """
+    
+    __slots__ = ("category", "retryable", "status_code")
+    
+    def __init__(
+        self,
+        message: str,
+        *,
+        category: str = "unknown",
+        retryable: bool = False,
+        status_code: Optional[int] = None,
+    ) -> None:
+        super().__init__(message)
+        self.category = category
+        self.retryable = retryable
+        self.status_code = status_code
+
+
+# Read size for streaming base64 encoding; a multiple of 3 so each block
+# encodes to complete base64 quanta with no padding in between.
+_B64_READ_CHUNK = 3 * 256 * 1024
+
+
+def _map_file(path: Union[str, os.PathLike]) -> Optional[mmap.mmap]:
+    """Memory-map a file read-only.
+    
+    The mapping is backed by the page cache, so consumers that accept the
+    buffer protocol or a file object (``base64.b64encode``, ``Image.open``)
+    read it without first copying it into a Python ``bytes`` object.
+    
+    Returns:
+        The mapping, or None for empty files and files that cannot be
+        mapped (pipes, character devices); callers fall back to reading.
+    """
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return None
+
+
+def _b64encode_file(path: str) -> str:
+    """Base64-encode a file without holding the raw bytes in memory.
+    
+    Mappable files are encoded straight from a read-only mmap in a single
+    pass. Otherwise the file is read in fixed-size blocks and each block is
+    encoded into a preallocated output buffer. Either way peak memory is
+    about the encoded size rather than raw bytes + encoded bytes + decoded
+    string.
+    
+    Args:
+        path: Path to the file.
+    
+    Returns:
+        Base64-encoded file contents.
+    """
+    mapped = _map_file(path)
+    if mapped is not None:
+        with mapped:
+            return base64.b64encode(mapped).decode("ascii")
+    
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        encoded = bytearray(4 * ((size + 2) // 3))
+        pos = 0
+        while True:
+            block = f.read(_B64_READ_CHUNK)
+            if not block:
+                break
+            block_b64 = base64.b64encode(block)
+            encoded[pos:pos + len(block_b64)] = block_b64
+            pos += len(block_b64)
+    # The file may have shrunk between fstat and the last read
+    del encoded[pos:]
+    return encoded.decode("ascii")
+
+
+def _stdlib_dumps_payload(payload: dict) -> bytes:
+    """Fallback payload encoder used when orjson is not installed."""
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@lru_cache(maxsize=None)
+def _payload_encoder() -> Callable[[dict], bytes]:
+    """Resolve the payload JSON encoder once per process.
+    
+    Uses orjson when installed; vision payloads carry MB-scale base64
+    strings, which orjson writes several times faster than the stdlib
+    encoder.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return _stdlib_dumps_payload
+    return orjson.dumps
+
+
+def _dumps_payload(payload: dict) -> bytes:
+    """Serialize a request payload to a compact UTF-8 JSON body.
+    
+    The body is posted as-is, so httpx does not re-encode it.
+    """
+    return _payload_encoder()(payload)
+
+
+@lru_cache(maxsize=None)
+def _pil_image() -> Any:
+    """Return the ``PIL.Image`` module, or None if Pillow is not installed.
+    
+    Resolved once per process, so the image paths do not repeat the import
+    machinery and ImportError handling on every call.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+# Bytes read from an image file to sniff its dimensions from the header
+_HEADER_PEEK_SIZE = 64 * 1024
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# JPEG start-of-frame markers (all carry the frame dimensions); C4, C8 and
+# CC are DHT/JPG/DAC and share the range but are not frames
+_JPEG_SOF_MARKERS = frozenset(
+    {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+)
+
+
+def _peek_size(buf: Union[bytes, memoryview]) -> Optional[tuple[int, int, str]]:
+    """Read image dimensions from a PNG or JPEG header without decoding.
+    
+    Args:
+        buf: Leading bytes of the image (the whole file is not needed).
+    
+    Returns:
+        ``(width, height, format)`` with format ``"PNG"`` or ``"JPEG"``, or
+        None if the format is not recognized or the header is truncated.
+    """
+    if buf[:8] == _PNG_SIGNATURE:
+        # IHDR is always the first chunk: length(4) type(4) width(4) height(4)
+        if len(buf) < 24 or buf[12:16] != b"IHDR":
+            return None
+        width = int.from_bytes(buf[16:20], "big")
+        height = int.from_bytes(buf[20:24], "big")
+        return width, height, "PNG"
+    
+    if buf[:2] == b"\xff\xd8":
+        i = 2
+        n = len(buf)
+        while i + 1 < n:
+            if buf[i] != 0xFF:
+                return None
+            marker = buf[i + 1]
+            if marker == 0xFF:  # fill byte
+                i += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # standalone markers
+                i += 2
+                continue
+            if i + 4 > n:
+                return None
+            if marker in _JPEG_SOF_MARKERS:
+                # FF Cx, length(2), precision(1), height(2), width(2)
+                if i + 9 > n:
+                    return None
+                height = int.from_bytes(buf[i + 5:i + 7], "big")
+                width = int.from_bytes(buf[i + 7:i + 9], "big")
+                return width, height, "JPEG"
+            if marker in (0xD9, 0xDA):  # EOI / start of scan before any frame
+                return None
+            i += 2 + int.from_bytes(buf[i + 2:i + 4], "big")
+    
+    return None
+
+
+def _tile_image(img: Any, tile: int = 512, max_tiles: int = 10) -> list[Any]:
+    """Split an image into a grid of ``tile`` x ``tile`` crops.
+    
+    Picks the ``cols x rows`` grid (at most ``max_tiles`` cells, and no more
+    cells than the image can fill at native resolution) whose aspect ratio
+    is closest to the image's, resizes the image to exactly
+    ``(cols * tile, rows * tile)`` and crops it cell by cell.
+    
+    Args:
+        img: PIL image.
+        tile: Tile edge length in pixels.
+        max_tiles: Maximum number of tiles.
+    
+    Returns:
+        Tiles in row-major order (a single tile for small images).
+    """
+    pil = _pil_image()
+    
+    width, height = img.size
+    max_cols = max(1, min(max_tiles, math.ceil(width / tile)))
+    max_rows = max(1, min(max_tiles, math.ceil(height / tile)))
+    target = math.log(width / height)
+    
+    best = (1, 1)
+    best_score = (math.inf, 0)
+    for cols in range(1, max_cols + 1):
+        for rows in range(1, min(max_rows, max_tiles // cols) + 1):
+            # Closest aspect ratio first, then the most tiles (most detail)
+            score = (abs(math.log(cols / rows) - target), -(cols * rows))
+            if score < best_score:
+                best, best_score = (cols, rows), score
+    
+    cols, rows = best
+    resized = img.resize((cols * tile, rows * tile), pil.Resampling.BILINEAR, reducing_gap=3.0)
+    return [
+        resized.crop((x * tile, y * tile, (x + 1) * tile, (y + 1) * tile))
+        for y in range(rows)
+        for x in range(cols)
+    ]
+
+
+def _peek_input_size(image: ImageInput) -> Optional[tuple[int, int, str]]:
+    """Sniff the dimensions of an encoded image input from its header.
+    
+    Args:
+        image: Input with ``data`` bytes or a ``path``.
+    
+    Returns:
+        See _peek_size.
+    """
+    if image.data:
+        return _peek_size(image.data)
+    with open(image.path, "rb") as f:
+        return _peek_size(f.read(_HEADER_PEEK_SIZE))
+
+
+@dataclass
+class _VisionRequest:
+    """A prepared Chat Completions request for one text+image prompt."""
+    
+    messages: list[dict]
+    deployment: str
+    temperature: float
+    max_tokens: int
+    cache_key: Optional[bytes] = None
 
 
 class AzureVisionLLM(BaseVisionLLM):
@@ -62,6 +324,17 @@ class AzureVisionLLM(BaseVisionLLM):
     
     DEFAULT_API_VERSION = "2024-02-15-preview"
     DEFAULT_MAX_IMAGE_SIZE = 2048  # pixels
+    RESPONSE_CACHE_SIZE = 512  # entries, when settings.llm.cache_enabled
+    TILE_SIZE = 512  # pixels, when tiling is enabled
+    MAX_TILES = 10
+    # Images needing a scale factor above this are sent unchanged: slight
+    # oversizing is within API limits and cheaper than a lossy re-encode
+    RESIZE_SKIP_RATIO = 0.85
+    
+    # Sync requests go through the shared pool in http_client. Async
+    # clients are bound to an event loop, so one is kept per loop
+    _ASYNC_CLIENTS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    _ASYNC_CLIENTS_LOCK = threading.Lock()
     
     def __init__(
         self,
@@ -71,6 +344,7 @@ class AzureVisionLLM(BaseVisionLLM):
         deployment_name: Optional[str] = None,
         api_version: Optional[str] = None,
         max_image_size: Optional[int] = None,
+        tiling_enabled: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialize the Azure OpenAI Vision LLM provider.
@@ -82,6 +356,9 @@ class AzureVisionLLM(BaseVisionLLM):
             deployment_name: Optional deployment name (defaults to settings.llm.model).
             api_version: Optional API version override.
             max_image_size: Maximum image dimension in pixels for auto-compression.
+            tiling_enabled: Send oversized images as TILE_SIZE tiles plus a
+                downscaled overview instead of only downscaling them. Pass it
+                through LLMFactory.create_vision_llm to enable it.
             **kwargs: Additional configuration overrides.
         
         Raises:
@@ -111,6 +388,16 @@ class AzureVisionLLM(BaseVisionLLM):
         # API version
         self.api_version = api_version or self.DEFAULT_API_VERSION
         
+        self.tiling_enabled = tiling_enabled
+        
+        # Optional in-process response cache (see _cache_key)
+        self.cache_enabled = getattr(settings.llm, "cache_enabled", False)
+        self._response_cache: OrderedDict[bytes, ChatResponse] = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        
+        # Per-thread scratch buffer for image encoding (see _save_image)
+        self._resize_buf = threading.local()
+        
         # Store any additional kwargs for future use
         self._extra_config = kwargs
     
@@ -152,14 +439,187 @@ class AzureVisionLLM(BaseVisionLLM):
         self.validate_text(text)
         self.validate_image(image)
         
-        # Preprocess image (compress if needed)
-        processed_image = self.preprocess_image(
-            image,
-            max_size=(self.max_image_size, self.max_image_size)
-        )
+        request = self._build_request(text, image, messages, kwargs)
         
-        # Convert image to base64 if needed
-        image_base64 = self._get_image_base64(processed_image)
+        # Serve identical requests from the response cache
+        cached = self._cache_lookup(request.cache_key)
+        if cached is not None:
+            return cached
+        
+        # Make API call
+        try:
+            response_data = self._call_api(
+                messages=request.messages,
+                deployment=request.deployment,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+            )
+            response = self._parse_response(response_data, request.deployment)
+        except AzureVisionLLMError:
+            raise
+        except Exception as e:
+            raise self._wrap_error(e) from e
+        
+        self._cache_store(request.cache_key, response)
+        return response
+    
+    async def chat_with_image_async(
+        self,
+        text: str,
+        image: ImageInput,
+        messages: Optional[list[Message]] = None,
+        trace: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResponse:
+        """Async variant of chat_with_image.
+        
+        Image preprocessing runs in a worker thread so the event loop is not
+        blocked by decoding/resizing. Calls on the same event loop share one
+        pooled async client (see _get_async_client).
+        
+        Args:
+            text: The text prompt or question about the image.
+            image: The image input (path, bytes, or base64).
+            messages: Optional conversation history for context.
+            trace: Optional TraceContext for observability (reserved for Stage F).
+            **kwargs: Override parameters (temperature, max_tokens, etc.).
+        
+        Returns:
+            ChatResponse containing the generated text and metadata.
+        
+        Raises:
+            ValueError: If text or image input is invalid.
+            AzureVisionLLMError: If API call fails.
+        """
+        self.validate_text(text)
+        self.validate_image(image)
+        
+        request = await asyncio.to_thread(self._build_request, text, image, messages, kwargs)
+        return await self._complete_async(self._get_async_client(), request)
+    
+    def chat_with_image_batch(
+        self,
+        inputs: list[tuple[str, ImageInput]],
+        messages: Optional[list[Message]] = None,
+        max_concurrency: int = 8,
+        **kwargs: Any,
+    ) -> list[ChatResponse]:
+        """Run many independent text+image requests concurrently.
+        
+        Images are preprocessed and encoded in a thread pool (PIL releases
+        the GIL while decoding and resizing), then all requests are issued
+        concurrently over one async HTTP client, so per-request network
+        latency overlaps instead of adding up.
+        
+        Must not be called from a running event loop; use
+        chat_with_image_async with asyncio.gather there instead.
+        
+        Args:
+            inputs: ``(text, image)`` pairs.
+            messages: Optional conversation history shared by all requests.
+            max_concurrency: Maximum number of requests in flight at once.
+            **kwargs: Override parameters applied to every request.
+        
+        Returns:
+            ChatResponses in the same order as inputs.
+        
+        Raises:
+            ValueError: If any text or image input is invalid, or
+                max_concurrency is less than 1.
+            AzureVisionLLMError: If any API call fails. Requests still in
+                flight are cancelled.
+        
+        Example:
+            >>> responses = vision_llm.chat_with_image_batch([
+            ...     ("Describe figure 1", ImageInput(path="fig1.png")),
+            ...     ("Describe figure 2", ImageInput(path="fig2.png")),
+            ... ])
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if not inputs:
+            return []
+        for text, image in inputs:
+            self.validate_text(text)
+            self.validate_image(image)
+        
+        workers = min(len(inputs), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            requests = list(pool.map(
+                lambda item: self._build_request(item[0], item[1], messages, kwargs),
+                inputs,
+            ))
+        
+        return asyncio.run(self._run_batch(requests, max_concurrency))
+    
+    async def _run_batch(
+        self,
+        requests: list[_VisionRequest],
+        max_concurrency: int,
+    ) -> list[ChatResponse]:
+        """Send prepared requests concurrently over one async client.
+        
+        On the first failure the remaining requests are cancelled and awaited
+        before the client is closed.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async with self._new_async_client() as client:
+            async def run(request: _VisionRequest) -> ChatResponse:
+                async with semaphore:
+                    return await self._complete_async(client, request)
+            
+            tasks = [asyncio.ensure_future(run(r)) for r in requests]
+            try:
+                return list(await asyncio.gather(*tasks))
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+    
+    async def _complete_async(self, client: Any, request: _VisionRequest) -> ChatResponse:
+        """Resolve one prepared request (cache, API call, parsing) asynchronously."""
+        cached = self._cache_lookup(request.cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response_data = await self._call_api_async(
+                client,
+                messages=request.messages,
+                deployment=request.deployment,
+                temperature=request.temperature,
+                max_tokens=request.max_tokens,
+            )
+            response = self._parse_response(response_data, request.deployment)
+        except AzureVisionLLMError:
+            raise
+        except Exception as e:
+            raise self._wrap_error(e) from e
+        
+        self._cache_store(request.cache_key, response)
+        return response
+    
+    def _build_request(
+        self,
+        text: str,
+        image: ImageInput,
+        messages: Optional[list[Message]],
+        kwargs: dict[str, Any],
+    ) -> _VisionRequest:
+        """Preprocess the image and assemble the Chat Completions request.
+        
+        Args:
+            text: The text prompt (already validated).
+            image: The image input (already validated).
+            messages: Optional conversation history.
+            kwargs: Override parameters (temperature, max_tokens, deployment_name).
+        
+        Returns:
+            Prepared request, including the cache key when caching is enabled.
+        """
+        image_url, tile_urls = self._encode_image_urls(image)
         
         # Prepare request parameters
         temperature = kwargs.get("temperature", self.default_temperature)
@@ -170,9 +630,9 @@ class AzureVisionLLM(BaseVisionLLM):
         api_messages = []
         if messages:
             # Add conversation history
-            api_messages.extend([{"role": m.role, "content": m.content} for m in messages])
+            api_messages.extend(m.as_api_dict() for m in messages)
         
-        # Add current text + image message
+        # Add current text + image message (plus any tiles)
         current_message = {
             "role": "user",
             "content": [
@@ -183,42 +643,164 @@ class AzureVisionLLM(BaseVisionLLM):
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:{processed_image.mime_type};base64,{image_base64}"
+                        "url": image_url
+                    }
+                },
+                *(
+                    {
+                        "type": "image_url",
+                        "image_url": {"url": tile_url}
                     }
-                }
+                    for tile_url in tile_urls
+                ),
             ]
         }
         api_messages.append(current_message)
         
-        # Make API call
-        try:
-            response_data = self._call_api(
-                messages=api_messages,
-                deployment=deployment,
-                temperature=temperature,
-                max_tokens=max_tokens,
+        cache_key = None
+        if self.cache_enabled:
+            cache_key = self._cache_key(
+                image_url, text, deployment, temperature, max_tokens,
+                api_messages[:-1], tile_urls,
             )
-            
-            # Parse response
-            content = response_data["choices"][0]["message"]["content"]
-            usage = response_data.get("usage")
-            
-            return ChatResponse(
-                content=content,
-                model=response_data.get("model", deployment),
-                usage=usage,
-                raw_response=response_data,
+        
+        return _VisionRequest(
+            messages=api_messages,
+            deployment=deployment,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            cache_key=cache_key,
+        )
+    
+    def _encode_image_urls(self, image: ImageInput) -> tuple[str, tuple[str, ...]]:
+        """Preprocess an image and build its ``data:`` URLs.
+        
+        With tiling, oversized images become a thumbnail overview plus
+        full-detail tiles; otherwise the image is compressed if needed.
+        When ``image.cache_encoded`` is set, the URLs are memoized on the
+        input per (max_image_size, tiling_enabled), so later calls skip
+        decoding, resizing and base64 encoding entirely.
+        
+        Returns:
+            ``(image_url, tile_urls)``; tile_urls is empty without tiling.
+        """
+        memo_key = (self.max_image_size, self.tiling_enabled)
+        if image.cache_encoded:
+            cached = image._encoded.get(memo_key)
+            if cached is not None:
+                return cached
+        
+        tiled = self._encode_tiled(image) if self.tiling_enabled else None
+        if tiled is not None:
+            processed_image, tiles = tiled
+        else:
+            tiles = []
+            processed_image = self.preprocess_image(
+                image,
+                max_size=(self.max_image_size, self.max_image_size)
             )
-        except KeyError as e:
-            raise AzureVisionLLMError(
-                f"[Azure Vision] Unexpected response format: missing key {e}"
-            ) from e
-        except Exception as e:
-            if isinstance(e, AzureVisionLLMError):
-                raise
-            raise AzureVisionLLMError(
-                f"[Azure Vision] API call failed: {type(e).__name__}: {e}"
-            ) from e
+        
+        # Convert image to base64 if needed
+        image_base64 = self._get_image_base64(processed_image)
+        urls = (
+            f"data:{processed_image.mime_type};base64,{image_base64}",
+            tuple(f"data:{mime_type};base64,{tile_base64}" for mime_type, tile_base64 in tiles),
+        )
+        
+        if image.cache_encoded:
+            image._encoded[memo_key] = urls
+        return urls
+    
+    @staticmethod
+    def _wrap_error(error: Exception) -> AzureVisionLLMError:
+        """Translate an unexpected exception from the call/parse step."""
+        if isinstance(error, KeyError):
+            return AzureVisionLLMError(
+                f"[Azure Vision] Unexpected response format: missing key {error}",
+                category="response",
+            )
+        return AzureVisionLLMError(
+            f"[Azure Vision] API call failed: {type(error).__name__}: {error}"
+        )
+    
+    @staticmethod
+    def _parse_response(response_data: dict, deployment: str) -> ChatResponse:
+        """Convert a Chat Completions response body into a ChatResponse.
+        
+        Raises:
+            KeyError, IndexError: If the response body is malformed.
+        """
+        content = response_data["choices"][0]["message"]["content"]
+        usage = response_data.get("usage")
+        
+        return ChatResponse(
+            content=content,
+            model=response_data.get("model", deployment),
+            usage=usage,
+            raw_response=response_data,
+        )
+    
+    def _cache_lookup(self, cache_key: Optional[bytes]) -> Optional[ChatResponse]:
+        """Return a fresh copy of a cached response, or None on miss."""
+        if cache_key is None:
+            return None
+        with self._response_cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is None:
+                return None
+            self._response_cache.move_to_end(cache_key)
+        return ChatResponse(
+            content=cached.content,
+            model=cached.model,
+            usage=cached.usage,
+        )
+    
+    def _cache_store(self, cache_key: Optional[bytes], response: ChatResponse) -> None:
+        """Cache a response (without its raw body), evicting the oldest entry."""
+        if cache_key is None:
+            return
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = ChatResponse(
+                content=response.content,
+                model=response.model,
+                usage=response.usage,
+            )
+            if len(self._response_cache) > self.RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    @staticmethod
+    def _cache_key(
+        image_url: str,
+        text: str,
+        deployment: str,
+        temperature: float,
+        max_tokens: int,
+        history: list[dict],
+        tiles: Sequence[str] = (),
+    ) -> bytes:
+        """Build the response cache key for a vision request.
+        
+        The image is hashed after preprocessing, so inputs that differ only
+        above max_image_size still collide once resized. Conversation history
+        is part of the key since it changes the answer.
+        
+        Returns:
+            SHA-256 digest of the request.
+        """
+        digest = hashlib.sha256(usedforsecurity=False)
+        digest.update(image_url.encode("ascii"))
+        digest.update(b"\0")
+        for tile_url in tiles:
+            digest.update(tile_url.encode("ascii"))
+            digest.update(b"\0")
+        digest.update(repr((
+            text,
+            deployment,
+            temperature,
+            max_tokens,
+            [(m["role"], m["content"]) for m in history],
+        )).encode("utf-8"))
+        return digest.digest()
     
     def preprocess_image(
         self,
@@ -241,57 +823,221 @@ class AzureVisionLLM(BaseVisionLLM):
             Preprocessed ImageInput with compressed data if needed.
         
         Note:
-            If the image is already within size limits, returns it unchanged.
+            If the image is already within size limits, or would only shrink
+            by a factor above RESIZE_SKIP_RATIO, returns it unchanged. For
+            PNG and JPEG this is decided from the file header alone.
         """
         if not max_size:
             return image
         
-        try:
-            from PIL import Image
-        except ImportError:
-            # If PIL not available, skip preprocessing
-            return image
+        raw = image.is_raw
+        if not raw:
+            if not image.data and not image.path:
+                # Already base64-encoded (or empty), skip preprocessing
+                return image
+            # Fast path: read dimensions from the PNG/JPEG header and return
+            # already-small images untouched, without loading or decoding them
+            peeked = _peek_input_size(image)
+            if peeked is not None and not self._needs_resize(peeked[0], peeked[1], max_size):
+                return image
         
-        # Get image bytes
-        if image.data:
-            image_bytes = image.data
-        elif image.path:
-            image_bytes = Path(image.path).read_bytes()
-        elif image.base64:
-            # Already encoded, skip preprocessing
-            return image
-        else:
+        pil = _pil_image()
+        if pil is None:
+            if raw:
+                raise ImportError(
+                    "Pillow is required to encode raw pixel images. "
+                    "Install it with: pip install pillow"
+                )
+            # If PIL not available, skip preprocessing
             return image
         
-        # Load image and check size
-        img = Image.open(io.BytesIO(image_bytes))
-        width, height = img.size
-        
-        # Check if compression needed
-        max_width, max_height = max_size
-        if width <= max_width and height <= max_height:
-            # No compression needed
+        # Load image and check size; raw pixels are always encoded
+        img = self._open_image(image)
+        needs_resize = self._needs_resize(img.width, img.height, max_size)
+        if not needs_resize and not raw:
             return image
         
-        # Calculate new size maintaining aspect ratio
-        ratio = min(max_width / width, max_height / height)
-        new_size = (int(width * ratio), int(height * ratio))
+        # Preserve original format if possible (read before resizing)
+        img_format = img.format or "PNG"
         
-        # Resize image
-        img_resized = img.resize(new_size, Image.Resampling.LANCZOS)
+        # Resize in place maintaining aspect ratio. thumbnail() first calls
+        # draft() so JPEGs are DCT-decoded at 1/2, 1/4 or 1/8 scale instead
+        # of full resolution, then box-reduces by an integer factor before
+        # the final filtered pass (see _resample_filter).
+        if needs_resize:
+            ratio = min(max_size[0] / img.width, max_size[1] / img.height)
+            img.thumbnail(max_size, self._resample_filter(ratio), reducing_gap=2.0)
         
         # Convert to bytes
-        buffer = io.BytesIO()
-        # Preserve original format if possible
-        img_format = img.format or "PNG"
-        img_resized.save(buffer, format=img_format)
-        compressed_bytes = buffer.getvalue()
+        if img_format == "JPEG":
+            # Skip the extra Huffman optimization pass; 4:2:0 subsampling
+            compressed_bytes = self._save_image(
+                img, format=img_format, quality=85, optimize=False, subsampling=2
+            )
+        elif img_format == "PNG":
+            # zlib level 1 is several times faster than the default 6 for
+            # a few percent larger output
+            compressed_bytes = self._save_image(
+                img, format=img_format, compress_level=1, optimize=False
+            )
+        else:
+            buffer = io.BytesIO()
+            img.save(buffer, format=img_format)
+            compressed_bytes = buffer.getvalue()
         
         # Return new ImageInput with compressed data
         return ImageInput(
             data=compressed_bytes,
-            mime_type=image.mime_type
+            mime_type="image/png" if raw else image.mime_type
+        )
+    
+    @staticmethod
+    def _resample_filter(ratio: float) -> Any:
+        """Pick the final resampling filter for a downscale by ``ratio``.
+        
+        Large reductions are dominated by the cheap integer box reduction
+        that reducing_gap performs first, so extra filter taps buy nothing:
+        BOX at 4x or more, BILINEAR at 2x or more, LANCZOS for mild
+        downscales where its sharpness is visible.
+        """
+        pil = _pil_image()
+        
+        if ratio <= 0.25:
+            return pil.Resampling.BOX
+        if ratio <= 0.5:
+            return pil.Resampling.BILINEAR
+        return pil.Resampling.LANCZOS
+    
+    def _save_image(self, img: Any, **save_options: Any) -> bytes:
+        """Encode a PIL image to bytes through a reused per-thread buffer.
+        
+        The buffer is rewound but not truncated: ``BytesIO.truncate`` hands
+        the memory back, which would defeat the reuse. Only the prefix
+        written by this call is copied out. Used for the sequential JPEG
+        and PNG writers only, which never read past what they wrote.
+        
+        Args:
+            img: PIL image to encode.
+            **save_options: Keyword arguments for ``Image.save``.
+        
+        Returns:
+            The encoded image bytes.
+        """
+        buffer = getattr(self._resize_buf, "buffer", None)
+        if buffer is None:
+            buffer = self._resize_buf.buffer = io.BytesIO()
+        buffer.seek(0)
+        img.save(buffer, **save_options)
+        size = buffer.tell()
+        with buffer.getbuffer() as view, view[:size] as written:
+            return written.tobytes()
+    
+    @staticmethod
+    def _open_image(image: ImageInput) -> Any:
+        """Open an ImageInput as a PIL image.
+        
+        Raw pixel buffers are wrapped with ``Image.frombuffer`` (shared, not
+        copied, for layouts PIL stores natively such as 'L' and 'RGBA') and
+        NumPy arrays with ``Image.fromarray`` via ``__array_interface__``,
+        so neither goes through an encode/decode round-trip.
+        """
+        pil = _pil_image()
+        
+        data = image.data
+        if data is not None and hasattr(data, "__array_interface__"):
+            return pil.fromarray(data)
+        if image.raw_size is not None:
+            mode = image.raw_mode
+            return pil.frombuffer(mode, image.raw_size, data, "raw", mode, 0, 1)
+        if data is not None:
+            return pil.open(io.BytesIO(data))
+        # Decode from a read-only mapping; PIL keeps it alive until loaded
+        mapped = _map_file(image.path)
+        return pil.open(mapped if mapped is not None else image.path)
+    
+    def _encode_tiled(
+        self,
+        image: ImageInput,
+    ) -> Optional[tuple[ImageInput, list[tuple[str, str]]]]:
+        """Split an oversized image into a thumbnail overview plus tiles.
+        
+        The image is decoded once for both. The overview is downscaled to
+        TILE_SIZE, so each tile carries more detail than the overview it
+        accompanies instead of duplicating a max_image_size rendition at
+        higher token cost. Tiles are encoded in parallel; PIL releases the
+        GIL while compressing.
+        
+        Args:
+            image: The original (not downscaled) image.
+        
+        Returns:
+            ``(overview, tiles)`` with tiles as ``(mime_type, base64)`` in
+            row-major order, or None if tiling does not apply: the image
+            fits max_image_size (per _needs_resize), would yield a single
+            tile, is base64-only, or PIL is not installed.
+        """
+        if image.data is None and image.path is None:
+            return None
+        max_size = (self.max_image_size, self.max_image_size)
+        if not image.is_raw:
+            peeked = _peek_input_size(image)
+            if peeked is not None and not self._needs_resize(peeked[0], peeked[1], max_size):
+                return None
+        pil = _pil_image()
+        if pil is None:
+            return None
+        
+        img = self._open_image(image)
+        if not self._needs_resize(img.width, img.height, max_size):
+            return None
+        
+        tile_imgs = _tile_image(img, tile=self.TILE_SIZE, max_tiles=self.MAX_TILES)
+        if len(tile_imgs) < 2:
+            return None
+        
+        if img.format == "JPEG":
+            mime_type = "image/jpeg"
+            save_options = {"format": "JPEG", "quality": 85, "optimize": False, "subsampling": 2}
+            if img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+        else:
+            mime_type = "image/png"
+            save_options = {"format": "PNG", "compress_level": 1, "optimize": False}
+        
+        def encode(tile_img: Any) -> tuple[str, str]:
+            data = self._save_image(tile_img, **save_options)
+            return mime_type, base64.b64encode(data).decode("ascii")
+        
+        # Overview from the already-decoded image, longest edge TILE_SIZE
+        scale = self.TILE_SIZE / max(img.width, img.height)
+        overview = img.resize(
+            (max(1, round(img.width * scale)), max(1, round(img.height * scale))),
+            pil.Resampling.BILINEAR,
+            reducing_gap=3.0,
         )
+        
+        with ThreadPoolExecutor(max_workers=min(len(tile_imgs), os.cpu_count() or 1)) as pool:
+            tiles = list(pool.map(encode, tile_imgs))
+        
+        overview_bytes = self._save_image(overview, **save_options)
+        return ImageInput(data=overview_bytes, mime_type=mime_type), tiles
+    
+    def _needs_resize(self, width: int, height: int, max_size: tuple[int, int]) -> bool:
+        """Check whether an image of the given size is worth downscaling.
+        
+        Args:
+            width: Image width in pixels.
+            height: Image height in pixels.
+            max_size: Maximum dimensions (width, height) in pixels.
+        
+        Returns:
+            True if the scale factor needed to fit max_size is at most
+            RESIZE_SKIP_RATIO.
+        """
+        if width <= 0 or height <= 0:
+            return False
+        ratio = min(max_size[0] / width, max_size[1] / height)
+        return ratio <= self.RESIZE_SKIP_RATIO
     
     def _get_image_base64(self, image: ImageInput) -> str:
         """Convert ImageInput to base64 string.
@@ -308,11 +1054,12 @@ class AzureVisionLLM(BaseVisionLLM):
         try:
             if image.base64:
                 return image.base64
+            elif image.is_raw:
+                raise ValueError("raw pixel data must be encoded by preprocess_image first")
             elif image.data:
-                return base64.b64encode(image.data).decode("utf-8")
+                return base64.b64encode(image.data).decode("ascii")
             elif image.path:
-                image_bytes = Path(image.path).read_bytes()
-                return base64.b64encode(image_bytes).decode("utf-8")
+                return _b64encode_file(image.path)
             else:
                 raise ValueError("ImageInput has no valid data source")
         except Exception as e:
@@ -320,6 +1067,42 @@ class AzureVisionLLM(BaseVisionLLM):
                 f"[Azure Vision] Failed to encode image: {e}"
             ) from e
     
+    @staticmethod
+    def _client_options() -> dict[str, Any]:
+        """Connection pool and timeout settings for the per-loop async clients."""
+        import httpx
+        
+        return {
+            "http2": importlib.util.find_spec("h2") is not None,
+            "timeout": httpx.Timeout(60.0, connect=5.0),
+            "limits": httpx.Limits(max_keepalive_connections=64, max_connections=128),
+        }
+    
+    @classmethod
+    def _new_async_client(cls) -> Any:
+        """Create an ``httpx.AsyncClient`` with the shared pool settings."""
+        import httpx
+        
+        return httpx.AsyncClient(**cls._client_options())
+    
+    @classmethod
+    def _get_async_client(cls) -> Any:
+        """Return the pooled async client for the running event loop.
+        
+        Async clients are bound to the event loop they are used in, so one
+        is kept per loop rather than process-wide; it is dropped together
+        with its loop. Must be called from a coroutine.
+        """
+        loop = asyncio.get_running_loop()
+        client = cls._ASYNC_CLIENTS.get(loop)
+        if client is None or client.is_closed:
+            with cls._ASYNC_CLIENTS_LOCK:
+                client = cls._ASYNC_CLIENTS.get(loop)
+                if client is None or client.is_closed:
+                    client = cls._new_async_client()
+                    cls._ASYNC_CLIENTS[loop] = client
+        return client
+    
     def _call_api(
         self,
         messages: list[dict],
@@ -340,37 +1123,121 @@ class AzureVisionLLM(BaseVisionLLM):
         
         Raises:
             AzureVisionLLMError: If API call fails.
+        """
+        import httpx
         
-        Note:
-            This is a mock implementation for testing. In production,
-            this would use the requests library or Azure SDK to make
-            actual HTTP calls to the Azure OpenAI API.
+        url, headers = self._request_target(deployment)
+        body = self._request_body(messages, temperature, max_tokens)
+        
+        try:
+            response = get_http_client().post(url, content=body, headers=headers)
+        except httpx.RequestError as e:
+            raise self._transport_error(e) from e
+        
+        return self._check_response(response)
+    
+    async def _call_api_async(
+        self,
+        client: Any,
+        messages: list[dict],
+        deployment: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> dict:
+        """Async counterpart of _call_api using the given ``httpx.AsyncClient``.
+        
+        Raises:
+            AzureVisionLLMError: If API call fails.
         """
-        # Build API URL
+        import httpx
+        
+        url, headers = self._request_target(deployment)
+        body = self._request_body(messages, temperature, max_tokens)
+        
+        try:
+            response = await client.post(url, content=body, headers=headers)
+        except httpx.RequestError as e:
+            raise self._transport_error(e) from e
+        
+        return self._check_response(response)
+    
+    def _request_target(self, deployment: str) -> tuple[str, dict[str, str]]:
+        """Return the chat completions URL and auth headers for a deployment."""
         url = (
-            f"{self.endpoint}/openai/deployments/{deployment}/chat/completions"
-            f"?api-version={self.api_version}"
+            f"{self.endpoint.rstrip('/')}/openai/deployments/{deployment}/"
+            f"chat/completions?api-version={self.api_version}"
         )
+        headers = {
+            "api-key": self.api_key,
+            "Content-Type": "application/json",
+        }
+        return url, headers
+    
+    @staticmethod
+    def _request_body(messages: list[dict], temperature: float, max_tokens: int) -> bytes:
+        """Serialize the request payload.
         
-        # Prepare request payload
-        payload = {
+        Images travel inline as base64 ``data:`` URLs: the Chat Completions
+        endpoint takes a JSON body only and has no multipart or raw-bytes
+        upload. Binary upload exists for the separate Azure AI Vision
+        analyze API, which does not answer free-form prompts.
+        """
+        return _dumps_payload({
             "messages": messages,
             "temperature": temperature,
             "max_tokens": max_tokens,
-        }
+        })
+    
+    @staticmethod
+    def _transport_error(error: Exception) -> AzureVisionLLMError:
+        """Map an ``httpx.RequestError`` to a retryable AzureVisionLLMError."""
+        import httpx
         
-        # In production, this would make actual HTTP request:
-        # import requests
-        # headers = {
-        #     "api-key": self.api_key,
-        #     "Content-Type": "application/json"
-        # }
-        # response = requests.post(url, json=payload, headers=headers)
-        # response.raise_for_status()
-        # return response.json()
-        
-        # For testing, raise NotImplementedError to be mocked
-        raise NotImplementedError(
-            "[Azure Vision] _call_api must be mocked in tests. "
-            "In production, this would use requests library to call Azure API."
+        if isinstance(error, httpx.TimeoutException):
+            return AzureVisionLLMError(
+                "[Azure Vision] Request timed out after 60 seconds",
+                category="timeout",
+                retryable=True,
+            )
+        return AzureVisionLLMError(
+            f"[Azure Vision] Connection failed: {type(error).__name__}: {error}",
+            category="connection",
+            retryable=True,
         )
+    
+    def _check_response(self, response: Any) -> dict:
+        """Return the JSON body of a successful response.
+        
+        Raises:
+            AzureVisionLLMError: If the response status is not 200.
+        """
+        status_code = response.status_code
+        if status_code != 200:
+            error_detail = self._parse_error_response(response)
+            raise AzureVisionLLMError(
+                f"[Azure Vision] API error (HTTP {status_code}): {error_detail}",
+                category="http",
+                retryable=status_code in (408, 429) or status_code >= 500,
+                status_code=status_code,
+            )
+        return response.json()
+    
+    def _parse_error_response(self, response: Any) -> str:
+        """Parse error details from API response.
+        
+        Args:
+            response: The HTTP response object.
+        
+        Returns:
+            Human-readable error message.
+        """
+        try:
+            error_data = response.json()
+            if "error" in error_data:
+                error = error_data["error"]
+                if isinstance(error, dict):
+                    return error.get("message", str(error))
+                return str(error)
+            return response.text
+        except Exception:
+            return response.text or "Unknown error"
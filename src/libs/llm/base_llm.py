@@ -7,27 +7,53 @@ through configuration-driven instantiation.
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
 
+# Roles accepted by validate_messages
+_VALID_ROLES = frozenset({"system", "user", "assistant"})
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Message:
     """Represents a single message in a chat conversation.
     
+    Messages are immutable (and therefore hashable), so their API form can
+    be built once and reused across requests; see as_api_dict.
+    
     Attributes:
         role: The role of the message sender ('system', 'user', or 'assistant').
         content: The text content of the message.
     """
     role: str
     content: str
+    _api_dict: Optional[Dict[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def as_api_dict(self) -> Dict[str, str]:
+        """Return the ``{"role": ..., "content": ...}`` dict sent to chat APIs.
+        
+        Built on first use and memoized on the message, so long histories
+        are not re-converted on every request. The returned dict is shared
+        and must not be mutated.
+        """
+        api_dict = self._api_dict
+        if api_dict is None:
+            api_dict = {"role": self.role, "content": self.content}
+            object.__setattr__(self, "_api_dict", api_dict)
+        return api_dict
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatResponse:
     """Response from an LLM chat completion.
     
+    Slotted (no per-instance ``__dict__``): responses are created per call
+    and often retained in caches and traces.
+    
     Attributes:
         content: The generated text response.
         model: The model identifier that generated the response.
@@ -76,6 +102,58 @@ class BaseLLM(ABC):
         """
         pass
     
+    async def achat(
+        self,
+        messages: List[Message],
+        trace: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> ChatResponse:
+        """Asynchronous variant of chat().
+        
+        The default runs chat() in a worker thread, so callers can issue
+        several requests concurrently with asyncio.gather. Providers with a
+        native async client may override this.
+        
+        Args:
+            messages: List of conversation messages (role + content).
+            trace: Optional TraceContext for observability (reserved for Stage F).
+            **kwargs: Provider-specific parameters (temperature, max_tokens, etc.).
+        
+        Returns:
+            ChatResponse containing the generated text and metadata.
+        """
+        return await asyncio.to_thread(self.chat, messages, trace, **kwargs)
+    
+    def stream_chat(
+        self,
+        messages: List[Message],
+        trace: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """Generate a chat completion as a stream of text deltas.
+        
+        Callers may stop iterating (and close the iterator) early to abandon
+        the request. The default yields the whole chat() response as a
+        single delta; providers that support server-sent streaming override
+        this so text arrives as it is generated.
+        
+        Args:
+            messages: List of conversation messages (role + content).
+            trace: Optional TraceContext for observability (reserved for Stage F).
+            **kwargs: Provider-specific parameters (temperature, max_tokens, etc.).
+        
+        Yields:
+            Successive pieces of the generated text.
+        """
+        yield self.chat(messages, trace=trace, **kwargs).content
+    
+    def warm_up(self) -> None:
+        """Start opening a connection to the provider ahead of the first request.
+        
+        Must not block or raise. The default does nothing; providers using
+        the shared HTTP client override it to pre-warm the pool.
+        """
+    
     def validate_messages(self, messages: List[Message]) -> None:
         """Validate message list structure.
         
@@ -87,15 +165,43 @@ class BaseLLM(ABC):
         """
         if not messages:
             raise ValueError("Messages list cannot be empty")
-        
-        valid_roles = {"system", "user", "assistant"}
         for i, msg in enumerate(messages):
-            if not isinstance(msg, Message):
-                raise ValueError(f"Message at index {i} is not a Message instance")
-            if msg.role not in valid_roles:
-                raise ValueError(
-                    f"Message at index {i} has invalid role '{msg.role}'. "
-                    f"Must be one of: {valid_roles}"
-                )
-            if not msg.content or not msg.content.strip():
-                raise ValueError(f"Message at index {i} has empty content")
+            _check_message(i, msg)
+    
+    def to_api_messages(self, messages: List[Message]) -> List[Dict[str, str]]:
+        """Validate messages and convert them to API dicts in a single pass.
+        
+        Providers call this instead of validate_messages followed by a
+        separate conversion loop, so the history is traversed once.
+        
+        Args:
+            messages: List of messages to validate.
+        
+        Returns:
+            The messages' as_api_dict() forms, in order.
+        
+        Raises:
+            ValueError: If messages list is empty or contains invalid roles.
+        """
+        if not messages:
+            raise ValueError("Messages list cannot be empty")
+        return [_checked_api_dict(i, msg) for i, msg in enumerate(messages)]
+
+
+def _check_message(index: int, msg: Message) -> None:
+    """Validate one message of a history (see BaseLLM.validate_messages)."""
+    if not isinstance(msg, Message):
+        raise ValueError(f"Message at index {index} is not a Message instance")
+    if msg.role not in _VALID_ROLES:
+        raise ValueError(
+            f"Message at index {index} has invalid role '{msg.role}'. "
+            f"Must be one of: {', '.join(sorted(_VALID_ROLES))}"
+        )
+    if not msg.content or not msg.content.strip():
+        raise ValueError(f"Message at index {index} has empty content")
+
+
+def _checked_api_dict(index: int, msg: Message) -> Dict[str, str]:
+    """Validate one message and return its API dict."""
+    _check_message(index, msg)
+    return msg.as_api_dict()
@@ -12,7 +12,7 @@ understanding with embedded images.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional, Union
 
@@ -27,17 +27,39 @@ class ImageInput:
     - File path: Local image file to be read and encoded
     - Bytes: Raw image bytes (already loaded)
     - Base64: Already encoded image string
+    - Pixels: Uncompressed pixel data, either a buffer (bytes, memoryview,
+      mmap) with raw_size/raw_mode, or a uint8 NumPy array. Providers wrap
+      it without decoding and encode it once during preprocessing.
     
     Attributes:
         path: Path to the image file (if loading from disk).
-        data: Raw image bytes (if already loaded).
+        data: Encoded image bytes, or raw pixels (see raw_size / NumPy array).
         base64: Base64-encoded image string (if already encoded).
         mime_type: MIME type of the image (e.g., 'image/png', 'image/jpeg').
+        raw_size: (width, height) when data holds raw pixels rather than an
+            encoded image.
+        raw_mode: PIL pixel layout of raw data (e.g. 'RGB', 'RGBA', 'L').
+        cache_encoded: Memoize the provider's encoded form of this image on
+            the instance, so repeated requests about the same image (e.g.
+            multi-turn Q&A) skip preprocessing and base64 encoding. The
+            image must not be modified afterwards.
     """
     path: Optional[Union[str, Path]] = None
-    data: Optional[bytes] = None
+    data: Optional[Any] = None
     base64: Optional[str] = None
     mime_type: str = "image/png"
+    raw_size: Optional[tuple[int, int]] = None
+    raw_mode: str = "RGB"
+    cache_encoded: bool = False
+    # Provider-owned memo of encoded forms, used when cache_encoded is set
+    _encoded: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    @property
+    def is_raw(self) -> bool:
+        """Whether data holds uncompressed pixels instead of an encoded image."""
+        return self.data is not None and (
+            self.raw_size is not None or hasattr(self.data, "__array_interface__")
+        )
     
     def __post_init__(self) -> None:
         """Validate that exactly one input format is provided."""
@@ -50,6 +72,8 @@ class ImageInput:
             raise ValueError("Must provide one of: path, data, or base64")
         if provided_inputs > 1:
             raise ValueError("Must provide exactly one of: path, data, or base64")
+        if self.raw_size is not None and self.data is None:
+            raise ValueError("raw_size requires pixel data in data")
 
 
 class BaseVisionLLM(ABC):
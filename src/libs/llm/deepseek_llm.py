@@ -11,6 +11,7 @@ import os
 from typing import Any, Dict, List, Optional
 
 from src.libs.llm.base_llm import BaseLLM, ChatResponse, Message
+from src.libs.llm.http_client import get_http_client, prewarm
 
 
 class DeepSeekLLMError(RuntimeError):
@@ -95,17 +96,14 @@ class DeepSeekLLM(BaseLLM):
             ValueError: If messages are invalid.
             DeepSeekLLMError: If API call fails.
         """
-        # Validate input
-        self.validate_messages(messages)
+        # Validate input and convert messages to API format in one pass
+        api_messages = self.to_api_messages(messages)
         
         # Prepare request parameters
         temperature = kwargs.get("temperature", self.default_temperature)
         max_tokens = kwargs.get("max_tokens", self.default_max_tokens)
         model = kwargs.get("model", self.model)
         
-        # Convert messages to API format
-        api_messages = [{"role": m.role, "content": m.content} for m in messages]
-        
         # Make API call
         try:
             response_data = self._call_api(
@@ -136,6 +134,10 @@ class DeepSeekLLM(BaseLLM):
                 f"[DeepSeek] API call failed: {type(e).__name__}: {e}"
             ) from e
     
+    def warm_up(self) -> None:
+        """Pre-warm the shared connection pool for this endpoint (non-blocking)."""
+        prewarm(f"{self.base_url.rstrip('/')}/models")
+    
     def _call_api(
         self,
         messages: List[Dict[str, str]],
@@ -174,16 +176,15 @@ class DeepSeekLLM(BaseLLM):
         }
         
         try:
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(url, json=payload, headers=headers)
-                
-                if response.status_code != 200:
-                    error_detail = self._parse_error_response(response)
-                    raise DeepSeekLLMError(
-                        f"[DeepSeek] API error (HTTP {response.status_code}): {error_detail}"
-                    )
-                
-                return response.json()
+            response = get_http_client().post(url, json=payload, headers=headers)
+            
+            if response.status_code != 200:
+                error_detail = self._parse_error_response(response)
+                raise DeepSeekLLMError(
+                    f"[DeepSeek] API error (HTTP {response.status_code}): {error_detail}"
+                )
+            
+            return response.json()
         except httpx.TimeoutException as e:
             raise DeepSeekLLMError(
                 f"[DeepSeek] Request timed out after 60 seconds"
@@ -0,0 +1,99 @@
+"""Shared HTTP connection pool for the text LLM providers.
+
+The OpenAI, Azure and DeepSeek providers send every request through one
+process-wide ``httpx.Client`` instead of opening a client per call, so
+TCP+TLS connections to the endpoint are kept alive and reused across
+requests and across provider instances.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from typing import Any, Optional
+
+# Pool sizing: enough concurrent connections for batched refinement
+# (e.g. ChunkRefiner.atransform) while capping idle keep-alive sockets.
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30.0
+
+# Read timeout matches the providers' "timed out after 60 seconds" errors
+REQUEST_TIMEOUT = 60.0
+CONNECT_TIMEOUT = 10.0
+
+_client: Optional[Any] = None
+_client_lock = threading.Lock()
+_warmed_urls: set = set()
+
+
+def get_http_client() -> Any:
+    """Return the shared pooled ``httpx.Client``, creating it on first use.
+
+    The client is thread-safe and is closed at interpreter exit. If it has
+    been closed (see close_http_client), a new one is created.
+
+    Returns:
+        Shared ``httpx.Client`` instance.
+    """
+    global _client
+    client = _client
+    if client is None or client.is_closed:
+        with _client_lock:
+            client = _client
+            if client is None or client.is_closed:
+                import httpx
+
+                client = httpx.Client(
+                    timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY,
+                    ),
+                )
+                _client = client
+    return client
+
+
+def prewarm(url: str) -> Optional[threading.Thread]:
+    """Open a pooled connection for url in a background daemon thread.
+    
+    Sends a HEAD request through the shared client so the TCP+TLS handshake
+    (typically 100-300 ms) is done before the first real request, which
+    then reuses the kept-alive connection. The response status is ignored
+    and errors are swallowed. Each URL is warmed at most once per client.
+    
+    Args:
+        url: Any URL on the provider's host.
+    
+    Returns:
+        The started thread, or None if url was already warmed.
+    """
+    with _client_lock:
+        if url in _warmed_urls:
+            return None
+        _warmed_urls.add(url)
+    
+    def warm() -> None:
+        try:
+            get_http_client().head(url)
+        except Exception:
+            pass  # best effort; the real request reports connection errors
+    
+    thread = threading.Thread(target=warm, name="http-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def close_http_client() -> None:
+    """Close the shared client and its pooled connections, if any."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+        _warmed_urls.clear()
+    if client is not None:
+        client.close()
+
+
+atexit.register(close_http_client)
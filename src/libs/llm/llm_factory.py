@@ -9,7 +9,10 @@ Supports both text-only LLMs and Vision LLMs (multimodal).
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import sys
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Optional, cast
 
 from src.libs.llm.base_llm import BaseLLM
 from src.libs.llm.base_vision_llm import BaseVisionLLM
@@ -55,6 +58,12 @@ class LLMFactory:
     # Registry of supported Vision LLM providers (to be populated in B9+ tasks)
     _VISION_PROVIDERS: dict[str, type[BaseVisionLLM]] = {}
     
+    # Provider instances keyed by (provider class, id(settings), overrides).
+    # Entries hold weak references to both the settings object (guarding
+    # against id reuse) and the instance, so the cache never keeps either alive.
+    _INSTANCE_CACHE: dict[tuple, tuple[weakref.ref, weakref.ref]] = {}
+    _INSTANCE_CACHE_LOCK = threading.Lock()
+    
     @classmethod
     def register_provider(cls, name: str, provider_class: type[BaseLLM]) -> None:
         """Register a new LLM provider implementation.
@@ -73,7 +82,9 @@ class LLMFactory:
             raise ValueError(
                 f"Provider class {provider_class.__name__} must inherit from BaseLLM"
             )
-        cls._PROVIDERS[name.lower()] = provider_class
+        # Interned, like the provider names Settings produces
+        cls._PROVIDERS[sys.intern(name.lower())] = provider_class
+        cls.clear_instance_cache()
     
     @classmethod
     def create(cls, settings: Settings, **override_kwargs: Any) -> BaseLLM:
@@ -84,7 +95,9 @@ class LLMFactory:
             **override_kwargs: Optional parameters to override config values.
         
         Returns:
-            An instance of the configured LLM provider.
+            An instance of the configured LLM provider. While the caller holds
+            it, repeated calls with the same settings object and overrides
+            return the same instance.
         
         Raises:
             ValueError: If the configured provider is not supported.
@@ -95,18 +108,21 @@ class LLMFactory:
             >>> llm = LLMFactory.create(settings)
             >>> response = llm.chat([Message(role='user', content='Hello')])
         """
-        # Extract provider name from settings
+        # Extract provider name from settings and look up its class. Loaded
+        # Settings already hold the lowercased name, so only other settings
+        # objects pay for lower()
         try:
-            provider_name = settings.llm.provider.lower()
+            provider_name = settings.llm.provider
+            provider_class = cls._PROVIDERS.get(provider_name)
+            if provider_class is None:
+                provider_name = provider_name.lower()
+                provider_class = cls._PROVIDERS.get(provider_name)
         except AttributeError as e:
             raise ValueError(
                 "Missing required configuration: settings.llm.provider. "
                 "Please ensure 'llm.provider' is specified in settings.yaml"
             ) from e
         
-        # Look up provider class in registry
-        provider_class = cls._PROVIDERS.get(provider_name)
-        
         if provider_class is None:
             available = ", ".join(sorted(cls._PROVIDERS.keys())) if cls._PROVIDERS else "none"
             raise ValueError(
@@ -115,14 +131,22 @@ class LLMFactory:
                 f"Provider implementations will be added in tasks B7.1-B7.2."
             )
         
+        # Reuse the instance created for the same settings object and overrides
+        key = cls._instance_key(provider_class, settings, override_kwargs)
+        instance = cls._cached_instance(key, settings)
+        if instance is not None:
+            return cast(BaseLLM, instance)
+        
         # Instantiate the provider
         # Provider classes should accept settings and optional kwargs
         try:
-            return provider_class(settings=settings, **override_kwargs)
+            instance = provider_class(settings=settings, **override_kwargs)
         except Exception as e:
             raise RuntimeError(
                 f"Failed to instantiate LLM provider '{provider_name}': {e}"
             ) from e
+        
+        return cast(BaseLLM, cls._cache_instance(key, settings, instance))
     
     @classmethod
     def list_providers(cls) -> list[str]:
@@ -155,7 +179,8 @@ class LLMFactory:
             raise ValueError(
                 f"Provider class {provider_class.__name__} must inherit from BaseVisionLLM"
             )
-        cls._VISION_PROVIDERS[name.lower()] = provider_class
+        cls._VISION_PROVIDERS[sys.intern(name.lower())] = provider_class
+        cls.clear_instance_cache()
     
     @classmethod
     def create_vision_llm(
@@ -174,7 +199,9 @@ class LLMFactory:
             **override_kwargs: Optional parameters to override config values.
         
         Returns:
-            An instance of the configured Vision LLM provider.
+            An instance of the configured Vision LLM provider. While the
+            caller holds it, repeated calls with the same settings object and
+            overrides return the same instance.
         
         Raises:
             ValueError: If the configured provider is not supported or configuration is missing.
@@ -186,22 +213,7 @@ class LLMFactory:
             >>> image = ImageInput(path="diagram.png")
             >>> response = vision_llm.chat_with_image("Describe this", image)
         """
-        # Extract provider name from settings
-        # Vision LLM config may be nested under settings.vision_llm or settings.llm
-        try:
-            # Try vision_llm section first
-            if hasattr(settings, 'vision_llm') and hasattr(settings.vision_llm, 'provider'):
-                provider_name = settings.vision_llm.provider.lower()
-            # Fallback to llm.provider (some providers support both text and vision)
-            elif hasattr(settings, 'llm') and hasattr(settings.llm, 'provider'):
-                provider_name = settings.llm.provider.lower()
-            else:
-                raise AttributeError("No vision_llm or llm provider configuration found")
-        except AttributeError as e:
-            raise ValueError(
-                "Missing required configuration: settings.vision_llm.provider or settings.llm.provider. "
-                "Please ensure 'vision_llm.provider' or 'llm.provider' is specified in settings.yaml"
-            ) from e
+        provider_name = cls._resolve_vision_provider_name(settings)
         
         # Look up provider class in vision registry
         provider_class = cls._VISION_PROVIDERS.get(provider_name)
@@ -214,13 +226,121 @@ class LLMFactory:
                 f"Vision LLM implementations will be added in tasks B9+."
             )
         
+        # Reuse the instance created for the same settings object and overrides
+        key = cls._instance_key(provider_class, settings, override_kwargs)
+        instance = cls._cached_instance(key, settings)
+        if instance is not None:
+            return cast(BaseVisionLLM, instance)
+        
         # Instantiate the provider
         try:
-            return provider_class(settings=settings, **override_kwargs)
+            instance = provider_class(settings=settings, **override_kwargs)
         except Exception as e:
             raise RuntimeError(
                 f"Failed to instantiate Vision LLM provider '{provider_name}': {e}"
             ) from e
+        
+        return cast(BaseVisionLLM, cls._cache_instance(key, settings, instance))
+    
+    @staticmethod
+    def _resolve_vision_provider_name(settings: Any) -> str:
+        """Resolve the lowercased Vision LLM provider name for settings.
+        
+        Vision LLM config may be nested under settings.vision_llm or fall
+        back to settings.llm (some providers support both text and vision).
+        The result is memoized on the settings object as
+        ``_resolved_vision_provider``, so repeated factory calls skip the
+        lookup; settings are treated as immutable once loaded. Objects
+        that cannot take new attributes are simply resolved every time.
+        
+        Raises:
+            ValueError: If neither provider field is configured.
+        """
+        provider_name = getattr(settings, "_resolved_vision_provider", None)
+        if isinstance(provider_name, str):
+            return provider_name
+        
+        # try/except rather than hasattr: hasattr performs the same lookup
+        # and swallows the exception anyway
+        try:
+            try:
+                provider = settings.vision_llm.provider
+            except AttributeError:
+                provider = settings.llm.provider
+            provider_name = sys.intern(provider.lower())
+        except AttributeError as e:
+            raise ValueError(
+                "Missing required configuration: settings.vision_llm.provider or settings.llm.provider. "
+                "Please ensure 'vision_llm.provider' or 'llm.provider' is specified in settings.yaml"
+            ) from e
+        
+        try:
+            # object.__setattr__ also works on frozen dataclasses like Settings
+            object.__setattr__(settings, "_resolved_vision_provider", provider_name)
+        except (AttributeError, TypeError):
+            pass
+        return provider_name
+    
+    @staticmethod
+    def _instance_key(
+        provider_class: type,
+        settings: Any,
+        override_kwargs: dict[str, Any],
+    ) -> Optional[tuple]:
+        """Build the instance cache key, or None if the call is not cacheable.
+        
+        Settings are keyed by identity (they are immutable once loaded), so a
+        new settings object always gets a new instance. Overrides must be
+        hashable to be part of the key.
+        """
+        key = (provider_class, id(settings), tuple(sorted(override_kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    @classmethod
+    def _cached_instance(cls, key: Optional[tuple], settings: Any) -> Any:
+        """Return the live cached instance for key if it belongs to this settings object."""
+        if key is None:
+            return None
+        entry = cls._INSTANCE_CACHE.get(key)
+        if entry is None or entry[0]() is not settings:
+            return None
+        return entry[1]()
+    
+    @classmethod
+    def _cache_instance(cls, key: Optional[tuple], settings: Any, instance: Any) -> Any:
+        """Store instance under key; returns the winner if another thread raced us."""
+        if key is None:
+            return instance
+        
+        def _evict(ref: weakref.ref, key: tuple = key) -> None:
+            # Drop the entry once its settings object or instance is collected.
+            # No lock here: GC may run this while the lock is already held.
+            entry = cls._INSTANCE_CACHE.get(key)
+            if entry is not None and (entry[0] is ref or entry[1] is ref):
+                cls._INSTANCE_CACHE.pop(key, None)
+        
+        try:
+            entry = (weakref.ref(settings, _evict), weakref.ref(instance, _evict))
+        except TypeError:
+            # Settings or provider does not support weak references; don't cache
+            return instance
+        
+        with cls._INSTANCE_CACHE_LOCK:
+            existing = cls._cached_instance(key, settings)
+            if existing is not None:
+                return existing
+            cls._INSTANCE_CACHE[key] = entry
+        return instance
+    
+    @classmethod
+    def clear_instance_cache(cls) -> None:
+        """Drop all cached LLM and Vision LLM instances."""
+        with cls._INSTANCE_CACHE_LOCK:
+            cls._INSTANCE_CACHE.clear()
     
     @classmethod
     def list_vision_providers(cls) -> list[str]:
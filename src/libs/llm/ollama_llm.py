@@ -99,17 +99,14 @@ class OllamaLLM(BaseLLM):
             ValueError: If messages are invalid.
             OllamaLLMError: If API call fails.
         """
-        # Validate input
-        self.validate_messages(messages)
+        # Validate input and convert messages to API format in one pass
+        api_messages = self.to_api_messages(messages)
         
         # Prepare request parameters
         temperature = kwargs.get("temperature", self.default_temperature)
         max_tokens = kwargs.get("max_tokens", self.default_max_tokens)
         model = kwargs.get("model", self.model)
         
-        # Convert messages to Ollama API format
-        api_messages = [{"role": m.role, "content": m.content} for m in messages]
-        
         # Make API call
         try:
             response_data = self._call_api(
@@ -7,10 +7,13 @@ endpoints by configuring the base_url.
 
 from __future__ import annotations
 
+import json
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, Iterator, List, Optional
 
 from src.libs.llm.base_llm import BaseLLM, ChatResponse, Message
+from src.libs.llm.http_client import get_http_client, prewarm
 
 
 class OpenAILLMError(RuntimeError):
@@ -39,6 +42,12 @@ class OpenAILLM(BaseLLM):
     
     DEFAULT_BASE_URL = "https://api.openai.com/v1"
     
+    # Batch API: results arrive within the completion window at reduced cost;
+    # status polls back off exponentially from the interval up to the cap
+    BATCH_COMPLETION_WINDOW = "24h"
+    BATCH_POLL_INTERVAL = 10.0  # seconds
+    BATCH_MAX_POLL_INTERVAL = 300.0  # seconds
+    
     def __init__(
         self,
         settings: Any,
@@ -95,17 +104,14 @@ class OpenAILLM(BaseLLM):
             ValueError: If messages are invalid.
             OpenAILLMError: If API call fails.
         """
-        # Validate input
-        self.validate_messages(messages)
+        # Validate input and convert messages to API format in one pass
+        api_messages = self.to_api_messages(messages)
         
         # Prepare request parameters
         temperature = kwargs.get("temperature", self.default_temperature)
         max_tokens = kwargs.get("max_tokens", self.default_max_tokens)
         model = kwargs.get("model", self.model)
         
-        # Convert messages to API format
-        api_messages = [{"role": m.role, "content": m.content} for m in messages]
-        
         # Make API call
         try:
             response_data = self._call_api(
@@ -136,6 +142,213 @@ class OpenAILLM(BaseLLM):
                 f"[OpenAI] API call failed: {type(e).__name__}: {e}"
             ) from e
     
+    def warm_up(self) -> None:
+        """Pre-warm the shared connection pool for this endpoint (non-blocking)."""
+        prewarm(f"{self.base_url.rstrip('/')}/models")
+    
+    def stream_chat(
+        self,
+        messages: List[Message],
+        trace: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> Iterator[str]:
+        """Stream a chat completion from the OpenAI API (``stream=True``).
+        
+        Content deltas are yielded as the server sends them. Closing the
+        iterator early closes the HTTP response, which cancels generation.
+        
+        Args:
+            messages: List of conversation messages.
+            trace: Optional TraceContext for observability (reserved for Stage F).
+            **kwargs: Override parameters (temperature, max_tokens, etc.).
+        
+        Yields:
+            Successive pieces of the generated text.
+        
+        Raises:
+            ValueError: If messages are invalid.
+            OpenAILLMError: If API call fails.
+        """
+        import httpx
+        
+        api_messages = self.to_api_messages(messages)
+        url = f"{self.base_url.rstrip('/')}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        payload = {
+            "model": kwargs.get("model", self.model),
+            "messages": api_messages,
+            "temperature": kwargs.get("temperature", self.default_temperature),
+            "max_tokens": kwargs.get("max_tokens", self.default_max_tokens),
+            "stream": True,
+        }
+        
+        try:
+            with get_http_client().stream("POST", url, json=payload, headers=headers) as response:
+                if response.status_code != 200:
+                    response.read()
+                    error_detail = self._parse_error_response(response)
+                    raise OpenAILLMError(
+                        f"[OpenAI] API error (HTTP {response.status_code}): {error_detail}"
+                    )
+                
+                # Server-sent events: "data: {chunk}" lines, ending with "data: [DONE]"
+                for line in response.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json.loads(data).get("choices")
+                    if choices:
+                        content = (choices[0].get("delta") or {}).get("content")
+                        if content:
+                            yield content
+        except ValueError as e:
+            raise OpenAILLMError(
+                f"[OpenAI] Malformed stream event: {e}"
+            ) from e
+        except httpx.TimeoutException as e:
+            raise OpenAILLMError(
+                "[OpenAI] Request timed out after 60 seconds"
+            ) from e
+        except httpx.RequestError as e:
+            raise OpenAILLMError(
+                f"[OpenAI] Connection failed: {type(e).__name__}: {e}"
+            ) from e
+    
+    def batch_chat(
+        self,
+        requests: Dict[str, List[Message]],
+        trace: Optional[Any] = None,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Dict[str, ChatResponse]:
+        """Run many chat completions through the OpenAI Batch API.
+        
+        The requests are uploaded as one JSONL file, a batch is created for
+        the chat completions endpoint, and its status is polled with
+        exponential backoff until it finishes. This trades latency (up to
+        BATCH_COMPLETION_WINDOW) for lower cost, so it suits offline jobs.
+        
+        Args:
+            requests: Conversations keyed by a caller-chosen custom_id.
+            trace: Optional TraceContext for observability (reserved for Stage F).
+            timeout: Optional seconds to wait before giving up (default: no limit).
+            **kwargs: Override parameters (temperature, max_tokens, model).
+        
+        Returns:
+            ChatResponse per custom_id. Requests that failed individually
+            are missing from the result.
+        
+        Raises:
+            ValueError: If any messages are invalid.
+            OpenAILLMError: If the upload fails, or the batch fails, expires,
+                is cancelled or does not finish within timeout.
+        """
+        model = kwargs.get("model", self.model)
+        body = {
+            "model": model,
+            "temperature": kwargs.get("temperature", self.default_temperature),
+            "max_tokens": kwargs.get("max_tokens", self.default_max_tokens),
+        }
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {**body, "messages": self.to_api_messages(messages)},
+            })
+            for custom_id, messages in requests.items()
+        ]
+        if not lines:
+            return {}
+        
+        input_file = self._batch_request(
+            "POST", "/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", "\n".join(lines).encode("utf-8"), "application/jsonl")},
+        ).json()
+        batch = self._batch_request(
+            "POST", "/batches",
+            json={
+                "input_file_id": input_file["id"],
+                "endpoint": "/v1/chat/completions",
+                "completion_window": self.BATCH_COMPLETION_WINDOW,
+            },
+        ).json()
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = self.BATCH_POLL_INTERVAL
+        while batch.get("status") not in ("completed", "failed", "expired", "cancelled"):
+            if deadline is not None and time.monotonic() + interval > deadline:
+                raise OpenAILLMError(
+                    f"[OpenAI] Batch {batch['id']} did not finish within {timeout} seconds"
+                )
+            time.sleep(interval)
+            interval = min(interval * 2, self.BATCH_MAX_POLL_INTERVAL)
+            batch = self._batch_request("GET", f"/batches/{batch['id']}").json()
+        
+        if batch["status"] != "completed":
+            raise OpenAILLMError(
+                f"[OpenAI] Batch {batch['id']} {batch['status']}: {batch.get('errors')}"
+            )
+        if not batch.get("output_file_id"):
+            return {}
+        
+        output = self._batch_request("GET", f"/files/{batch['output_file_id']}/content")
+        responses: Dict[str, ChatResponse] = {}
+        try:
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                data = response["body"]
+                responses[result["custom_id"]] = ChatResponse(
+                    content=data["choices"][0]["message"]["content"],
+                    model=data.get("model", model),
+                    usage=data.get("usage"),
+                    raw_response=data,
+                )
+        except (KeyError, IndexError, ValueError) as e:
+            raise OpenAILLMError(
+                f"[OpenAI] Unexpected batch output format: {type(e).__name__}: {e}"
+            ) from e
+        return responses
+    
+    def _batch_request(self, method: str, path: str, **kwargs: Any) -> Any:
+        """Send a Files/Batches API request and return the successful response.
+        
+        Raises:
+            OpenAILLMError: If the request fails or returns an error status.
+        """
+        import httpx
+        
+        url = f"{self.base_url.rstrip('/')}{path}"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        try:
+            response = get_http_client().request(method, url, headers=headers, **kwargs)
+        except httpx.TimeoutException as e:
+            raise OpenAILLMError(
+                "[OpenAI] Request timed out after 60 seconds"
+            ) from e
+        except httpx.RequestError as e:
+            raise OpenAILLMError(
+                f"[OpenAI] Connection failed: {type(e).__name__}: {e}"
+            ) from e
+        
+        if response.status_code != 200:
+            error_detail = self._parse_error_response(response)
+            raise OpenAILLMError(
+                f"[OpenAI] API error (HTTP {response.status_code}): {error_detail}"
+            )
+        return response
+    
     def _call_api(
         self,
         messages: List[Dict[str, str]],
@@ -174,16 +387,15 @@ class OpenAILLM(BaseLLM):
         }
         
         try:
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(url, json=payload, headers=headers)
-                
-                if response.status_code != 200:
-                    error_detail = self._parse_error_response(response)
-                    raise OpenAILLMError(
-                        f"[OpenAI] API error (HTTP {response.status_code}): {error_detail}"
-                    )
-                
-                return response.json()
+            response = get_http_client().post(url, json=payload, headers=headers)
+            
+            if response.status_code != 200:
+                error_detail = self._parse_error_response(response)
+                raise OpenAILLMError(
+                    f"[OpenAI] API error (HTTP {response.status_code}): {error_detail}"
+                )
+            
+            return response.json()
         except httpx.TimeoutException as e:
             raise OpenAILLMError(
                 f"[OpenAI] Request timed out after 60 seconds"
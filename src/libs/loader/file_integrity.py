@@ -12,11 +12,145 @@ Design Principles:
 """
 
 import hashlib
+import mmap
+import os
 import sqlite3
+import stat
+import threading
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Sequence, Union
+
+# hashlib.file_digest is new in Python 3.11
+_file_digest = getattr(hashlib, "file_digest", None)
+
+# Read size for the fallback hashing loop
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Files at least this large are hashed from a memory mapping
+_MMAP_HASH_THRESHOLD = 1024 * 1024
+
+# compute_sha256_many hashes fewer files than this sequentially
+_PARALLEL_HASH_MIN_FILES = 32
+
+# Applied once per connection; these settings are not stored in the
+# database file. (WAL mode and page size are, see _connection.)
+# synchronous=NORMAL is durable across process crashes in WAL mode; a
+# power loss may drop the last marks, which only means those files are
+# re-ingested.
+_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=60000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Table definition, also used to rebuild tables from older versions
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        file_hash BLOB PRIMARY KEY,
+        file_path TEXT NOT NULL,
+        status TEXT NOT NULL,
+        collection TEXT,
+        error_msg TEXT,
+        processed_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL,
+        mtime_ns INTEGER,
+        size INTEGER
+    )
+"""
+
+# Declared column types that older tables may lack; any mismatch triggers
+# a one-off rebuild in _migrate_legacy_table
+_REBUILT_COLUMN_TYPES = {"file_hash": "BLOB", "processed_at": "INTEGER"}
+
+# Columns added after the first schema version, with their types
+_ADDED_COLUMNS = (("mtime_ns", "INTEGER"), ("size", "INTEGER"))
+
+# Per-file queries. Kept as constants so each call passes the same SQL
+# text and hits the connection's prepared-statement cache.
+_SELECT_STATUS_SQL = "SELECT status FROM ingestion_history WHERE file_hash = ?"
+_QUICK_SKIP_SQL = """
+    SELECT 1 FROM ingestion_history
+    WHERE file_path = ? AND status = 'success'
+      AND mtime_ns = ? AND size = ?
+    LIMIT 1
+"""
+
+# One statement for every mark. processed_at is only written on insert.
+# A failure leaves the stored collection alone; a success replaces it.
+# Needs SQLite 3.24+ for ON CONFLICT ... DO UPDATE.
+_UPSERT_SQL = """
+    INSERT INTO ingestion_history
+    (file_hash, file_path, status, collection, error_msg, processed_at, updated_at,
+     mtime_ns, size)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(file_hash) DO UPDATE SET
+        file_path = excluded.file_path,
+        status = excluded.status,
+        collection = CASE WHEN excluded.status = 'failed'
+                          THEN collection ELSE excluded.collection END,
+        error_msg = excluded.error_msg,
+        updated_at = excluded.updated_at,
+        mtime_ns = excluded.mtime_ns,
+        size = excluded.size
+"""
+
+# Rows written per transaction by the batch marks
+_MARK_BATCH_SIZE = 10_000
+
+# Key prefix for chained hashes, so they never collide with plain SHA256
+_CHAINED_HASH_PREFIX = "sha256-chain"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def timestamp_to_datetime(timestamp_ns: int) -> datetime:
+    """Convert a stored processed_at/updated_at value to an aware UTC datetime.
+    
+    Args:
+        timestamp_ns: Nanoseconds since the Unix epoch, as stored.
+        
+    Returns:
+        The timestamp as a timezone-aware UTC datetime (microsecond precision).
+    """
+    return _EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+
+
+def _timestamp_ns(value: Any) -> Any:
+    """Convert an ISO 8601 timestamp from older versions to nanoseconds.
+    
+    Integers and unparsable values are returned unchanged.
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+def _hash_key(file_hash: str) -> Union[bytes, str]:
+    """Return the stored form of a file hash.
+    
+    SHA256 hex digests are stored as their 32 raw bytes, which halves the
+    primary key index. Other keys, such as chained hashes, are stored as
+    given; a BLOB never equals a TEXT value, so the two cannot collide.
+    """
+    if len(file_hash) == 64:
+        try:
+            return bytes.fromhex(file_hash)
+        except ValueError:
+            pass
+    return file_hash
 
 
 class FileIntegrityChecker(ABC):
@@ -94,23 +228,74 @@ class FileIntegrityChecker(ABC):
             RuntimeError: If database operation fails.
         """
         pass
+    
+    def mark_success_batch(
+        self,
+        records: Sequence[tuple[str, str, Optional[str]]]
+    ) -> None:
+        """Mark several files as successfully processed.
+        
+        The default implementation calls mark_success per record;
+        implementations may override it to write records together.
+        
+        Args:
+            records: (file_hash, file_path, collection) tuples.
+            
+        Raises:
+            RuntimeError: If database operation fails.
+        """
+        for file_hash, file_path, collection in records:
+            self.mark_success(file_hash, file_path, collection)
+    
+    def mark_failed_batch(self, records: Sequence[tuple[str, str, str]]) -> None:
+        """Mark processing of several files as failed.
+        
+        The default implementation calls mark_failed per record;
+        implementations may override it to write records together.
+        
+        Args:
+            records: (file_hash, file_path, error_msg) tuples.
+            
+        Raises:
+            RuntimeError: If database operation fails.
+        """
+        for file_hash, file_path, error_msg in records:
+            self.mark_failed(file_hash, file_path, error_msg)
+    
+    def quick_skip(self, file_path: str) -> bool:
+        """Check whether a file is known unchanged without hashing it.
+        
+        Callers still hash the file and call should_skip when this returns
+        False. The default implementation never short-circuits.
+        
+        Args:
+            file_path: Path of the file.
+            
+        Returns:
+            True if the file can be skipped without hashing.
+        """
+        return False
 
 
 class SQLiteIntegrityChecker(FileIntegrityChecker):
     """SQLite-backed file integrity checker.
     
     Stores ingestion history in a SQLite database with WAL mode for
-    concurrent access.
+    concurrent access. A single connection is opened on first use and
+    shared by all calls (serialized by a lock), so PRAGMAs are applied
+    once instead of on every check or mark.
     
     Database Schema:
         ingestion_history (
-            file_hash TEXT PRIMARY KEY,
+            file_hash BLOB PRIMARY KEY,  -- raw SHA256 digest
             file_path TEXT NOT NULL,
             status TEXT NOT NULL,  -- 'success' or 'failed'
             collection TEXT,
             error_msg TEXT,
-            processed_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
+            processed_at INTEGER NOT NULL,  -- ns since epoch, see timestamp_to_datetime
+            updated_at INTEGER NOT NULL,
+            mtime_ns INTEGER,  -- file stat when hashed, for quick_skip
+            size INTEGER
         )
     
     Args:
@@ -120,6 +305,9 @@ class SQLiteIntegrityChecker(FileIntegrityChecker):
         sqlite3.DatabaseError: If database file is corrupted.
     """
     
+    # Maximum number of should_skip results kept in memory
+    SKIP_CACHE_SIZE = 100_000
+    
     def __init__(self, db_path: str):
         """Initialize checker and create database if needed.
         
@@ -127,18 +315,53 @@ class SQLiteIntegrityChecker(FileIntegrityChecker):
             db_path: Path to SQLite database file.
         """
         self.db_path = db_path
-        self._conn = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._skip_cache: OrderedDict[str, bool] = OrderedDict()
+        # file_path -> (file_hash, mtime_ns, size) as seen when hashed
+        self._hashed_stats: OrderedDict[str, tuple[str, int, int]] = OrderedDict()
         self._ensure_database()
     
     def close(self) -> None:
-        """Close database connection if open."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Close database connection if open.
+        
+        The checker stays usable; the next call reconnects.
+        """
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
     
     def __del__(self):
         """Cleanup: close connection on deletion."""
-        self.close()
+        if hasattr(self, "_lock"):
+            self.close()
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return the shared connection, opening it on first use.
+        
+        Must be called with ``self._lock`` held. The connection runs in
+        autocommit mode, so each statement commits on its own.
+        """
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            try:
+                # WAL mode persists in the file; switching takes an
+                # exclusive lock, so only do it for new or older databases
+                mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+                if mode.lower() != "wal":
+                    # Only takes effect while the database is still empty
+                    conn.execute("PRAGMA page_size=4096")
+                    conn.execute("PRAGMA journal_mode=WAL")
+                for pragma in _PRAGMAS:
+                    conn.execute(pragma)
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
     
     def _ensure_database(self) -> None:
         """Create database file and schema if they don't exist."""
@@ -146,40 +369,92 @@ class SQLiteIntegrityChecker(FileIntegrityChecker):
         db_file = Path(self.db_path)
         db_file.parent.mkdir(parents=True, exist_ok=True)
         
-        # Connect and initialize schema
-        conn = sqlite3.connect(self.db_path)
-        try:
-            # Enable WAL mode for concurrent access
-            conn.execute("PRAGMA journal_mode=WAL")
+        # Connect (enabling WAL mode) and initialize schema
+        with self._lock:
+            conn = self._connection()
             
             # Create table if not exists
+            conn.execute(_CREATE_TABLE_SQL.format(table="ingestion_history"))
+            self._add_missing_columns(conn)
+            self._migrate_legacy_table(conn)
+            
+            # Status scans (e.g. reporting) are answered from the index
+            # alone; it subsumes the old single-column idx_status
             conn.execute("""
-                CREATE TABLE IF NOT EXISTS ingestion_history (
-                    file_hash TEXT PRIMARY KEY,
-                    file_path TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    collection TEXT,
-                    error_msg TEXT,
-                    processed_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
+                CREATE INDEX IF NOT EXISTS idx_status_hash
+                ON ingestion_history(status, file_hash)
             """)
+            conn.execute("DROP INDEX IF EXISTS idx_status")
             
-            # Create index on status for faster queries
+            # quick_skip looks rows up by path
             conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON ingestion_history(status)
+                CREATE INDEX IF NOT EXISTS idx_path
+                ON ingestion_history(file_path)
             """)
             
-            conn.commit()
-        finally:
-            conn.close()
+            # Partial index: most rows have no collection
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_collection
+                ON ingestion_history(collection)
+                WHERE collection IS NOT NULL
+            """)
+    
+    @staticmethod
+    def _migrate_legacy_table(conn: sqlite3.Connection) -> None:
+        """Rebuild a table from older versions with TEXT hashes or timestamps.
+        
+        Hex hashes become BLOBs and ISO 8601 timestamps become integer
+        nanoseconds. Runs once: afterwards the declared column types match
+        the current schema. Indexes are dropped with the old table and
+        recreated by the caller.
+        """
+        declared = {
+            col[1]: col[2].upper()
+            for col in conn.execute("PRAGMA table_info(ingestion_history)")
+        }
+        if all(declared.get(name) == sql_type for name, sql_type in _REBUILT_COLUMN_TYPES.items()):
+            return
+        
+        conn.create_function("hash_key", 1, _hash_key, deterministic=True)
+        conn.create_function("timestamp_ns", 1, _timestamp_ns, deterministic=True)
+        conn.execute("BEGIN")
+        try:
+            conn.execute(_CREATE_TABLE_SQL.format(table="ingestion_history_new"))
+            conn.execute("""
+                INSERT INTO ingestion_history_new
+                SELECT hash_key(file_hash), file_path, status, collection,
+                       error_msg, timestamp_ns(processed_at),
+                       timestamp_ns(updated_at), mtime_ns, size
+                FROM ingestion_history
+            """)
+            conn.execute("DROP TABLE ingestion_history")
+            conn.execute("ALTER TABLE ingestion_history_new RENAME TO ingestion_history")
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+    
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection) -> None:
+        """Add columns introduced after a database was created."""
+        existing = {col[1] for col in conn.execute("PRAGMA table_info(ingestion_history)")}
+        for name, sql_type in _ADDED_COLUMNS:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE ingestion_history ADD COLUMN {name} {sql_type}")
     
     def compute_sha256(self, file_path: str) -> str:
         """Compute SHA256 hash of file using chunked reading.
         
-        Uses 64KB chunks to handle large files without loading entire
-        file into memory.
+        On Python 3.11+ this delegates to ``hashlib.file_digest``, which
+        streams the file through OpenSSL without a Python-level loop (and
+        uses the CPU's SHA extensions where available). Older versions
+        fall back to reading 1MB chunks into a single reused buffer.
+        Files of 1MB or more are instead memory-mapped and hashed with a
+        single update call, leaving readahead to the kernel. None of these
+        loads the entire file into memory.
+        
+        The file's mtime and size at hashing time are remembered, so a
+        following mark_success can store them for quick_skip.
         
         Args:
             file_path: Path to the file to hash.
@@ -191,32 +466,199 @@ class SQLiteIntegrityChecker(FileIntegrityChecker):
             FileNotFoundError: If file does not exist.
             IOError: If path is not a file or cannot be read.
         """
-        path = Path(file_path)
+        self._require_file(file_path)
+        
+        try:
+            # Unbuffered: both paths read into their own buffer
+            with open(file_path, "rb", buffering=0) as f:
+                st = os.fstat(f.fileno())
+                if st.st_size >= _MMAP_HASH_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+                            mapped.madvise(mmap.MADV_SEQUENTIAL)
+                        file_hash = hashlib.sha256(mapped).hexdigest()
+                elif _file_digest is not None:
+                    file_hash = _file_digest(f, "sha256").hexdigest()
+                else:
+                    # Read in 1MB chunks without allocating per chunk
+                    sha256_hash = hashlib.sha256()
+                    buffer = bytearray(_HASH_CHUNK_SIZE)
+                    view = memoryview(buffer)
+                    while n := f.readinto(buffer):
+                        sha256_hash.update(view[:n])
+                    file_hash = sha256_hash.hexdigest()
+        except Exception as e:
+            raise IOError(f"Failed to read file {file_path}: {e}")
         
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
+        self._remember_stat(file_path, file_hash, st)
+        return file_hash
+    
+    def compute_sha256_many(
+        self,
+        file_paths: Sequence[str],
+        workers: Optional[int] = None,
+    ) -> dict[str, str]:
+        """Compute SHA256 hashes of many files, in parallel for large batches.
         
-        if not path.is_file():
-            raise IOError(f"Path is not a file: {file_path}")
+        Batches of 32 or more files are spread over a thread pool; hashlib
+        and the file reads release the GIL, so small files are hashed
+        concurrently instead of paying per-file latency in sequence.
+        Each file is hashed exactly as by compute_sha256.
+        
+        Args:
+            file_paths: Paths of the files to hash. Duplicates are hashed once.
+            workers: Number of hashing threads (defaults to the CPU count).
+            
+        Returns:
+            Mapping of each path to its hexadecimal SHA256 hash.
+            
+        Raises:
+            FileNotFoundError: If a file does not exist.
+            IOError: If a path is not a file or cannot be read.
+        """
+        unique_paths = list(dict.fromkeys(file_paths))
+        
+        if len(unique_paths) < _PARALLEL_HASH_MIN_FILES:
+            hashes = [self.compute_sha256(path) for path in unique_paths]
+        else:
+            max_workers = min(len(unique_paths), workers or os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                hashes = list(pool.map(self.compute_sha256, unique_paths))
+        
+        return dict(zip(unique_paths, hashes))
+    
+    def compute_sha256_parallel(
+        self,
+        file_path: str,
+        chunk_size: int = 16 * 1024 * 1024,
+        workers: Optional[int] = None,
+    ) -> str:
+        """Compute a chained SHA256 of a large file using several threads.
+        
+        The file is memory-mapped and split into ``chunk_size`` pieces that
+        are hashed concurrently (hashlib releases the GIL for large
+        buffers). The chunk digests are then folded in order as
+        ``h_c = sha256(h_{c-1} || sha256(chunk_c))``.
+        
+        The result is NOT the file's plain SHA256 and depends on
+        ``chunk_size``, so it is returned as
+        ``"sha256-chain:<chunk_size>:<hex>"``. Keys produced this way never
+        match keys from compute_sha256; use one method consistently for a
+        given database.
+        
+        Args:
+            file_path: Path to the file to hash.
+            chunk_size: Size in bytes of each independently hashed piece.
+            workers: Number of hashing threads (defaults to the CPU count).
+            
+        Returns:
+            Prefixed chained hash string.
+            
+        Raises:
+            ValueError: If chunk_size is not positive.
+            FileNotFoundError: If file does not exist.
+            IOError: If path is not a file or cannot be read.
+        """
+        if chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
         
-        # Compute hash using chunked reading
-        sha256_hash = hashlib.sha256()
+        self._require_file(file_path)
         
         try:
             with open(file_path, "rb") as f:
-                # Read in 64KB chunks
-                for chunk in iter(lambda: f.read(65536), b""):
-                    sha256_hash.update(chunk)
+                st = os.fstat(f.fileno())
+                size = st.st_size
+                if size == 0:
+                    # Cannot map an empty file; hash it as one empty chunk
+                    digests = [hashlib.sha256(b"").digest()]
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        def digest(start: int) -> bytes:
+                            with memoryview(mapped) as view, view[start:start + chunk_size] as part:
+                                return hashlib.sha256(part).digest()
+                        
+                        offsets = range(0, size, chunk_size)
+                        max_workers = min(len(offsets), workers or os.cpu_count() or 1)
+                        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                            digests = list(pool.map(digest, offsets))
         except Exception as e:
             raise IOError(f"Failed to read file {file_path}: {e}")
         
-        return sha256_hash.hexdigest()
+        chained = b""
+        for chunk_digest in digests:
+            chained = hashlib.sha256(chained + chunk_digest).digest()
+        
+        file_hash = f"{_CHAINED_HASH_PREFIX}:{chunk_size}:{chained.hex()}"
+        self._remember_stat(file_path, file_hash, st)
+        return file_hash
+    
+    def quick_skip(self, file_path: str) -> bool:
+        """Check whether a file is unchanged since its last successful mark.
+        
+        Compares the file's current mtime and size with those recorded
+        when it was hashed, without reading its contents. A False result
+        only means the file must be hashed and checked with should_skip.
+        
+        Args:
+            file_path: Path of the file, as passed to mark_success.
+            
+        Returns:
+            True if a successful record with the same path, mtime and size
+            exists, False otherwise (including when the file is missing).
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return False
+        
+        with self._lock:
+            cursor = self._connection().execute(
+                _QUICK_SKIP_SQL, (file_path, st.st_mtime_ns, st.st_size)
+            )
+            return cursor.fetchone() is not None
+    
+    def _remember_stat(self, file_path: str, file_hash: str, st: os.stat_result) -> None:
+        """Record the stat a file had when it was hashed, for the next mark."""
+        with self._lock:
+            self._hashed_stats[file_path] = (file_hash, st.st_mtime_ns, st.st_size)
+            self._hashed_stats.move_to_end(file_path)
+            if len(self._hashed_stats) > self.SKIP_CACHE_SIZE:
+                self._hashed_stats.popitem(last=False)
+    
+    def _hashed_stat(self, file_hash: str, file_path: str) -> tuple[Optional[int], Optional[int]]:
+        """Return (mtime_ns, size) recorded when file_path hashed to file_hash.
+        
+        Returns (None, None) if the file was not hashed by this checker or
+        its last hash differs, so quick_skip cannot match the record.
+        """
+        with self._lock:
+            recorded = self._hashed_stats.get(file_path)
+        if recorded is None or recorded[0] != file_hash:
+            return None, None
+        return recorded[1], recorded[2]
+    
+    @staticmethod
+    def _require_file(file_path: str) -> None:
+        """Raise if file_path does not name an existing regular file.
+        
+        Uses a single stat call; the file is not opened, so FIFOs and
+        devices are rejected before a read could block on them.
+        """
+        try:
+            st = os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+        
+        if not stat.S_ISREG(st.st_mode):
+            raise IOError(f"Path is not a file: {file_path}")
     
     def should_skip(self, file_hash: str) -> bool:
         """Check if file should be skipped.
         
         Only files with status='success' are skipped. Failed files
-        can be retried.
+        can be retried. Results are kept in a bounded LRU cache that this
+        checker's marks invalidate; marks written by other processes are
+        not seen for hashes already cached.
         
         Args:
             file_hash: SHA256 hash of the file.
@@ -224,20 +666,23 @@ class SQLiteIntegrityChecker(FileIntegrityChecker):
         Returns:
             True if file has status='success', False otherwise.
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.execute(
-                "SELECT status FROM ingestion_history WHERE file_hash = ?",
-                (file_hash,)
+        with self._lock:
+            skip = self._skip_cache.get(file_hash)
+            if skip is not None:
+                self._skip_cache.move_to_end(file_hash)
+                return skip
+            
+            cursor = self._connection().execute(
+                _SELECT_STATUS_SQL, (_hash_key(file_hash),)
             )
             result = cursor.fetchone()
             
-            if result is None:
-                return False
-            
-            return result[0] == "success"
-        finally:
-            conn.close()
+            skip = result is not None and result[0] == "success"
+            self._skip_cache[file_hash] = skip
+            if len(self._skip_cache) > self.SKIP_CACHE_SIZE:
+                self._skip_cache.popitem(last=False)
+        
+        return skip
     
     def mark_success(
         self, 
@@ -247,7 +692,8 @@ class SQLiteIntegrityChecker(FileIntegrityChecker):
     ) -> None:
         """Mark file as successfully processed.
         
-        Uses INSERT OR REPLACE for idempotent operation.
+        Uses a single UPSERT for idempotent operation; processed_at keeps
+        the time of the first mark.
         
         Args:
             file_hash: SHA256 hash of the file.
@@ -257,41 +703,15 @@ class SQLiteIntegrityChecker(FileIntegrityChecker):
         Raises:
             RuntimeError: If database operation fails.
         """
-        now = datetime.now(timezone.utc).isoformat()
+        now = time.time_ns()
         
-        conn = sqlite3.connect(self.db_path)
-        try:
-            # Check if record exists to preserve processed_at
-            cursor = conn.execute(
-                "SELECT processed_at FROM ingestion_history WHERE file_hash = ?",
-                (file_hash,)
-            )
-            result = cursor.fetchone()
-            
-            if result:
-                # Update existing record
-                conn.execute("""
-                    UPDATE ingestion_history 
-                    SET file_path = ?,
-                        status = 'success',
-                        collection = ?,
-                        error_msg = NULL,
-                        updated_at = ?
-                    WHERE file_hash = ?
-                """, (file_path, collection, now, file_hash))
-            else:
-                # Insert new record
-                conn.execute("""
-                    INSERT INTO ingestion_history 
-                    (file_hash, file_path, status, collection, error_msg, processed_at, updated_at)
-                    VALUES (?, ?, 'success', ?, NULL, ?, ?)
-                """, (file_hash, file_path, collection, now, now))
-            
-            conn.commit()
-        except sqlite3.Error as e:
-            raise RuntimeError(f"Failed to mark success for {file_path}: {e}")
-        finally:
-            conn.close()
+        self._write_marks(
+            [
+                (file_hash, file_path, "success", collection, None, now, now)
+                + self._hashed_stat(file_hash, file_path)
+            ],
+            f"Failed to mark success for {file_path}",
+        )
     
     def mark_failed(
         self, 
@@ -311,37 +731,96 @@ class SQLiteIntegrityChecker(FileIntegrityChecker):
         Raises:
             RuntimeError: If database operation fails.
         """
-        now = datetime.now(timezone.utc).isoformat()
+        now = time.time_ns()
         
-        conn = sqlite3.connect(self.db_path)
-        try:
-            # Check if record exists to preserve processed_at
-            cursor = conn.execute(
-                "SELECT processed_at FROM ingestion_history WHERE file_hash = ?",
-                (file_hash,)
-            )
-            result = cursor.fetchone()
+        self._write_marks(
+            [(file_hash, file_path, "failed", None, error_msg, now, now, None, None)],
+            f"Failed to mark failure for {file_path}",
+        )
+    
+    def mark_success_batch(
+        self,
+        records: Sequence[tuple[str, str, Optional[str]]]
+    ) -> None:
+        """Mark several files as successfully processed.
+        
+        Records are written with executemany, committing every 10,000
+        rows, so a large ingestion run pays one commit per batch instead
+        of one per file.
+        
+        Args:
+            records: (file_hash, file_path, collection) tuples.
             
-            if result:
-                # Update existing record
-                conn.execute("""
-                    UPDATE ingestion_history 
-                    SET file_path = ?,
-                        status = 'failed',
-                        error_msg = ?,
-                        updated_at = ?
-                    WHERE file_hash = ?
-                """, (file_path, error_msg, now, file_hash))
-            else:
-                # Insert new record
-                conn.execute("""
-                    INSERT INTO ingestion_history 
-                    (file_hash, file_path, status, collection, error_msg, processed_at, updated_at)
-                    VALUES (?, ?, 'failed', NULL, ?, ?, ?)
-                """, (file_hash, file_path, error_msg, now, now))
+        Raises:
+            RuntimeError: If database operation fails. Batches committed
+                before the failure are kept.
+        """
+        now = time.time_ns()
+        
+        self._write_marks(
+            [
+                (file_hash, file_path, "success", collection, None, now, now)
+                + self._hashed_stat(file_hash, file_path)
+                for file_hash, file_path, collection in records
+            ],
+            f"Failed to mark success for {len(records)} files",
+        )
+    
+    def mark_failed_batch(self, records: Sequence[tuple[str, str, str]]) -> None:
+        """Mark processing of several files as failed.
+        
+        Written like mark_success_batch.
+        
+        Args:
+            records: (file_hash, file_path, error_msg) tuples.
+            
+        Raises:
+            RuntimeError: If database operation fails. Batches committed
+                before the failure are kept.
+        """
+        now = time.time_ns()
+        
+        self._write_marks(
+            [
+                (file_hash, file_path, "failed", None, error_msg, now, now, None, None)
+                for file_hash, file_path, error_msg in records
+            ],
+            f"Failed to mark failure for {len(records)} files",
+        )
+    
+    def _write_marks(self, rows: list[tuple], error_prefix: str) -> None:
+        """UPSERT mark rows, one transaction per _MARK_BATCH_SIZE rows.
+        
+        Writes of at least one full batch are followed by ANALYZE.
+        
+        Args:
+            rows: Parameter tuples for _UPSERT_SQL.
+            error_prefix: Start of the RuntimeError message on failure.
+            
+        Raises:
+            RuntimeError: If database operation fails.
+        """
+        with self._lock:
+            for row in rows:
+                self._skip_cache.pop(row[0], None)
             
-            conn.commit()
-        except sqlite3.Error as e:
-            raise RuntimeError(f"Failed to mark failure for {file_path}: {e}")
-        finally:
-            conn.close()
+            conn = self._connection()
+            try:
+                for start in range(0, len(rows), _MARK_BATCH_SIZE):
+                    conn.execute("BEGIN")
+                    conn.executemany(
+                        _UPSERT_SQL,
+                        [
+                            (_hash_key(row[0]),) + row[1:]
+                            for row in rows[start:start + _MARK_BATCH_SIZE]
+                        ],
+                    )
+                    conn.execute("COMMIT")
+                
+                # Refresh planner statistics after bulk loads
+                if len(rows) >= _MARK_BATCH_SIZE:
+                    conn.execute("ANALYZE")
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise RuntimeError(f"{error_prefix}: {e}")
@@ -4,10 +4,11 @@ Splitter Module.
 This package contains text splitter abstractions and implementations:
 - Base splitter class
 - Splitter factory
-- Implementations (Recursive, Semantic, FixedLength)
+- Implementations (Recursive, ContentDefined, Semantic, FixedLength)
 """
 
 from src.libs.splitter.base_splitter import BaseSplitter
+from src.libs.splitter.content_defined_splitter import ContentDefinedSplitter
 from src.libs.splitter.splitter_factory import SplitterFactory
 
 # Import concrete implementations (they auto-register with factory)
@@ -20,4 +21,5 @@ __all__ = [
     "BaseSplitter",
     "SplitterFactory",
     "RecursiveSplitter",
+    "ContentDefinedSplitter",
 ]
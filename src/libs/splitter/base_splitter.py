@@ -58,7 +58,8 @@ class BaseSplitter(ABC):
         """
         if not isinstance(text, str):
             raise ValueError(f"Input text must be a string, got {type(text).__name__}")
-        if not text.strip():
+        # isspace() answers without building a stripped copy of the text
+        if not text or text.isspace():
             raise ValueError("Input text cannot be empty or whitespace-only")
     
     def validate_chunks(self, chunks: List[str]) -> None:
@@ -79,7 +80,7 @@ class BaseSplitter(ABC):
                 raise ValueError(
                     f"Chunk at index {i} is not a string (type: {type(chunk).__name__})"
                 )
-            if not chunk.strip():
+            if not chunk or chunk.isspace():
                 raise ValueError(
                     f"Chunk at index {i} is empty or whitespace-only"
                 )
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""Content-defined text splitter using a Gear rolling hash.
+
+This module provides a splitting strategy whose chunk boundaries are chosen
+by the text itself rather than by position. A rolling Gear hash is computed
+over the characters and a boundary is placed wherever its top bits are zero.
+An insertion or deletion only moves the boundaries next to it, so the
+unchanged regions of an edited document produce identical chunks, and
+downstream stages keyed on chunk content can skip re-embedding them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, List, Optional
+
+from src.libs.splitter.base_splitter import BaseSplitter
+
+_MASK64 = (1 << 64) - 1
+
+# Gear table derived from SHA256 rather than a seeded PRNG, so boundaries
+# stay identical across processes and Python versions
+_GEAR = tuple(
+    int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], "big")
+    for i in range(256)
+)
+
+
+class ContentDefinedSplitter(BaseSplitter):
+    """Content-defined splitter (Gear hash, as in FastCDC).
+
+    Each character updates the hash as ``h = (h << 1) + GEAR[c]`` (64-bit),
+    so the top bits depend on the last 64 characters. A boundary is cut
+    after a character when the top ``log2(chunk_size - min_size)`` bits
+    are all zero, giving chunks of roughly chunk_size characters. No
+    boundary is considered before min_size characters, and one is forced
+    at max_size.
+
+    Design Principles Applied:
+    - Pluggable: Implements BaseSplitter interface for factory instantiation.
+    - Config-Driven: Reads chunk_size from settings.ingestion.
+    - Deterministic: The same text always yields the same chunks.
+
+    Attributes:
+        chunk_size: Target average chunk size in characters.
+        min_size: Minimum chunk size in characters (except the last chunk).
+        max_size: Maximum chunk size in characters.
+    """
+
+    def __init__(
+        self,
+        settings: Any,
+        chunk_size: Optional[int] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize ContentDefinedSplitter.
+
+        Args:
+            settings: Application settings containing ingestion configuration.
+            chunk_size: Optional override for the target chunk size
+                (defaults to settings.ingestion.chunk_size).
+            min_size: Optional minimum chunk size (defaults to chunk_size // 4).
+            max_size: Optional maximum chunk size (defaults to chunk_size * 4).
+            **kwargs: Additional parameters (currently unused).
+
+        Raises:
+            ValueError: If the sizes are missing or inconsistent.
+        """
+        self.settings = settings
+
+        if chunk_size is None:
+            try:
+                chunk_size = settings.ingestion.chunk_size
+            except AttributeError as e:
+                raise ValueError(
+                    "Missing ingestion configuration in settings. "
+                    "Expected settings.ingestion.chunk_size"
+                ) from e
+
+        if not isinstance(chunk_size, int) or chunk_size < 2:
+            raise ValueError(f"chunk_size must be an integer >= 2, got: {chunk_size}")
+
+        self.chunk_size = chunk_size
+        self.min_size = min_size if min_size is not None else chunk_size // 4
+        self.max_size = max_size if max_size is not None else chunk_size * 4
+
+        if not 0 <= self.min_size < self.chunk_size <= self.max_size:
+            raise ValueError(
+                "Sizes must satisfy 0 <= min_size < chunk_size <= max_size, got: "
+                f"min_size={self.min_size}, chunk_size={self.chunk_size}, "
+                f"max_size={self.max_size}"
+            )
+
+        # Expected chunk length is about min_size + 2**bits
+        bits = max(1, (self.chunk_size - self.min_size).bit_length() - 1)
+        self._boundary_mask = ((1 << bits) - 1) << (64 - bits)
+
+    def split_text(
+        self,
+        text: str,
+        trace: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Split text at content-defined boundaries.
+
+        Whitespace-only pieces are merged into the preceding chunk (or the
+        following one at the start of the text), so every chunk passes
+        validate_chunks and the chunks still join back into the input.
+
+        Args:
+            text: Input text to split. Must be a non-empty string.
+            trace: Optional TraceContext for observability (reserved for Stage F).
+            **kwargs: Additional parameters (currently unused).
+
+        Returns:
+            A list of text chunks whose concatenation equals the input.
+
+        Raises:
+            ValueError: If input text is invalid (empty, wrong type).
+        """
+        self.validate_text(text)
+
+        chunks: List[str] = []
+        pending = ""
+        start = 0
+        while start < len(text):
+            end = self._find_boundary(text, start)
+            piece = text[start:end]
+            start = end
+            if piece.isspace():
+                if chunks:
+                    chunks[-1] += piece
+                else:
+                    pending += piece
+                continue
+            chunks.append(pending + piece)
+            pending = ""
+
+        self.validate_chunks(chunks)
+        return chunks
+
+    def _find_boundary(self, text: str, start: int) -> int:
+        """Return the end index of the chunk starting at start."""
+        limit = min(len(text), start + self.max_size)
+        begin = start + self.min_size
+        if begin >= limit:
+            return limit
+
+        gear = _GEAR
+        mask = self._boundary_mask
+        h = 0
+        for offset, char in enumerate(text[begin:limit], begin + 1):
+            # Fold code points above 0xFF so non-Latin scripts use the whole table
+            code = ord(char)
+            h = ((h << 1) + gear[(code ^ (code >> 8)) & 0xFF]) & _MASK64
+            if not h & mask:
+                return offset
+        return limit
@@ -10,6 +10,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from src.libs.splitter.base_splitter import BaseSplitter
+from src.libs.splitter.content_defined_splitter import ContentDefinedSplitter
 
 if TYPE_CHECKING:
     from src.core.settings import Settings
@@ -27,6 +28,8 @@ def _register_builtin_providers() -> None:
         SplitterFactory.register_provider("recursive", RecursiveSplitter)
     except ImportError:
         pass  # RecursiveSplitter not available (missing langchain dependency)
+    
+    SplitterFactory.register_provider("content_defined", ContentDefinedSplitter)
 
 
 class SplitterFactory:
@@ -7,16 +7,24 @@ This package contains vector store abstractions and implementations:
 - Implementations (Chroma, etc.)
 """
 
+from typing import Any
+
 from src.libs.vector_store.base_vector_store import BaseVectorStore
 from src.libs.vector_store.vector_store_factory import VectorStoreFactory
 
-# Auto-register ChromaStore provider
-try:
-    from src.libs.vector_store.chroma_store import ChromaStore
-    VectorStoreFactory.register_provider('chroma', ChromaStore)
-except ImportError:
-    # ChromaDB not installed, skip registration
-    pass
+# Register ChromaStore by path: chromadb is imported only when a 'chroma'
+# store is created (or ChromaStore is accessed), not on package import
+VectorStoreFactory.register_provider(
+    'chroma', 'src.libs.vector_store.chroma_store:ChromaStore'
+)
+
+
+def __getattr__(name: str) -> Any:
+    """Import ChromaStore on first attribute access."""
+    if name == 'ChromaStore':
+        from src.libs.vector_store.chroma_store import ChromaStore
+        return ChromaStore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'BaseVectorStore',
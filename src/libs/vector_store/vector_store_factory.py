@@ -7,7 +7,8 @@ of different backends without code changes.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import importlib
+from typing import TYPE_CHECKING, Any, Union
 
 from src.libs.vector_store.base_vector_store import BaseVectorStore
 
@@ -28,23 +29,40 @@ class VectorStoreFactory:
     - Fail-Fast: Raises clear errors for unknown providers.
     """
     
-    # Registry of supported providers (to be populated in B7.x tasks)
-    _PROVIDERS: dict[str, type[BaseVectorStore]] = {}
+    # Registry of supported providers (to be populated in B7.x tasks).
+    # Values are classes, or "module:attr" paths imported on first use.
+    _PROVIDERS: dict[str, Union[type[BaseVectorStore], str]] = {}
     
     @classmethod
-    def register_provider(cls, name: str, provider_class: type[BaseVectorStore]) -> None:
+    def register_provider(
+        cls,
+        name: str,
+        provider_class: Union[type[BaseVectorStore], str],
+    ) -> None:
         """Register a new VectorStore provider implementation.
         
         This method allows provider implementations to register themselves
-        with the factory, supporting extensibility.
+        with the factory, supporting extensibility. Passing a
+        ``"module:ClassName"`` path instead of the class defers importing
+        the provider (and its backend library) until it is first created.
         
         Args:
             name: The provider identifier (e.g., 'chroma', 'qdrant', 'milvus').
-            provider_class: The BaseVectorStore subclass implementing the provider.
+            provider_class: The BaseVectorStore subclass implementing the
+                provider, or its import path as ``"module:ClassName"``.
         
         Raises:
-            ValueError: If provider_class doesn't inherit from BaseVectorStore.
+            ValueError: If provider_class doesn't inherit from BaseVectorStore,
+                or is a path not of the form ``"module:ClassName"``.
         """
+        if isinstance(provider_class, str):
+            module_name, _, attr = provider_class.partition(":")
+            if not module_name or not attr:
+                raise ValueError(
+                    f"Provider path '{provider_class}' must have the form 'module:ClassName'"
+                )
+            cls._PROVIDERS[name.lower()] = provider_class
+            return
         if not issubclass(provider_class, BaseVectorStore):
             raise ValueError(
                 f"Provider class {provider_class.__name__} must inherit from BaseVectorStore"
@@ -82,6 +100,8 @@ class VectorStoreFactory:
         
         # Look up provider class in registry
         provider_class = cls._PROVIDERS.get(provider_name)
+        if isinstance(provider_class, str):
+            provider_class = cls._import_provider(provider_name, provider_class)
         
         if provider_class is None:
             available = ", ".join(sorted(cls._PROVIDERS.keys())) if cls._PROVIDERS else "none"
@@ -100,6 +120,32 @@ class VectorStoreFactory:
                 f"Failed to instantiate VectorStore provider '{provider_name}': {e}"
             ) from e
     
+    @classmethod
+    def _import_provider(cls, name: str, path: str) -> type[BaseVectorStore]:
+        """Import a provider registered by path and cache the class.
+        
+        Args:
+            name: The provider identifier.
+            path: The ``"module:ClassName"`` path it was registered with.
+        
+        Returns:
+            The imported provider class, now stored in the registry.
+        
+        Raises:
+            RuntimeError: If the module or class cannot be imported.
+            ValueError: If the class doesn't inherit from BaseVectorStore.
+        """
+        module_name, _, attr = path.partition(":")
+        try:
+            provider_class = getattr(importlib.import_module(module_name), attr)
+        except (ImportError, AttributeError) as e:
+            raise RuntimeError(
+                f"Failed to import VectorStore provider '{name}' from '{path}': {e}"
+            ) from e
+        
+        cls.register_provider(name, provider_class)
+        return provider_class
+    
     @classmethod
     def list_providers(cls) -> list[str]:
         """List all registered provider names.
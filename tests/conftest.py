@@ -4,14 +4,12 @@ This module contains pytest configuration and fixtures that are shared
 across all test modules.
 """
 
-import sys
 from pathlib import Path
 
 import pytest
 
-# Add the project root to the Python path
+# The project root is put on sys.path by pytest (pythonpath in pyproject.toml)
 PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
 
 
 @pytest.fixture
@@ -10,8 +10,10 @@ Required environment variables:
 """
 
 import os
+from functools import lru_cache
+from types import SimpleNamespace
+
 import pytest
-from unittest.mock import Mock
 
 from src.core.settings import Settings, load_settings
 from src.core.types import Chunk
@@ -61,6 +63,41 @@ EXPECTED_CLEAN_RESULT_KEYWORDS = [
 ]
 
 
+SETTINGS_PATH = "config/settings.yaml"
+
+
+@lru_cache(maxsize=1)
+def _load_yaml_config(path: str) -> dict:
+    """Parse settings.yaml once per process (libyaml loader when available).
+    
+    PyYAML is imported on first call, like in src.core.settings.
+    """
+    import yaml
+    
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=loader) or {}
+
+
+@lru_cache(maxsize=1)
+def _load_real_settings(path: str) -> Settings:
+    """Load and validate settings.yaml once per process."""
+    return load_settings(path)
+
+
+@lru_cache(maxsize=1)
+def _inject_azure_env(path: str) -> None:
+    """Export the Azure credentials from settings.yaml (once per process)."""
+    config = _load_yaml_config(path)
+    if 'llm' in config and config['llm'].get('provider') == 'azure':
+        os.environ["AZURE_OPENAI_API_KEY"] = config['llm'].get('api_key', '')
+        os.environ["AZURE_OPENAI_ENDPOINT"] = config['llm'].get('azure_endpoint', '')
+        os.environ["ENDPOINT"] = config['llm'].get('azure_endpoint', '')
+        
+        os.environ["AZURE_OPENAI_API_VERSION"] = config['llm'].get('api_version', '')
+        os.environ["OPENAI_API_VERSION"] = config['llm'].get('api_version', '') 
+
+
 # Fixtures
 
 @pytest.fixture
@@ -89,53 +126,39 @@ def create_settings_for_provider(provider: str) -> Settings:
     if provider == 'azure':
         # Load real settings from settings.yaml for Azure
         try:
-            import yaml
-            with open("config/settings.yaml", "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
-            
             # Inject into environment variables for AzureLLM
-            if 'llm' in config and config['llm'].get('provider') == 'azure':
-                os.environ["AZURE_OPENAI_API_KEY"] = config['llm'].get('api_key', '')
-                os.environ["AZURE_OPENAI_ENDPOINT"] = config['llm'].get('azure_endpoint', '')
-                os.environ["ENDPOINT"] = config['llm'].get('azure_endpoint', '')
-                
-                os.environ["AZURE_OPENAI_API_VERSION"] = config['llm'].get('api_version', '')
-                os.environ["OPENAI_API_VERSION"] = config['llm'].get('api_version', '') 
+            _inject_azure_env(SETTINGS_PATH)
             
-            real_settings = load_settings("config/settings.yaml")
-
-            # Create a Mock Settings object to allow modification (real settings are frozen)
-            settings = Mock(spec=Settings)
-            # Copy necessary frozen configs
-            settings.llm = real_settings.llm
-            settings.ingestion = Mock()
-            # Enable LLM for chunk refiner
-            settings.ingestion.chunk_refiner = {'use_llm': True}
-            return settings
+            real_settings = _load_real_settings(SETTINGS_PATH)
+
+            # Plain namespace reusing the frozen LLM config, with LLM
+            # enabled for chunk refiner (real settings cannot be modified)
+            return SimpleNamespace(
+                llm=real_settings.llm,
+                ingestion=SimpleNamespace(chunk_refiner={'use_llm': True}),
+            )
         except Exception as e:
             pytest.skip(f"Failed to load settings.yaml or configure Azure: {e}")
     
     # For non-Azure providers, use environment variables
-    settings = Mock(spec=Settings)
-    settings.ingestion = Mock()
-    settings.ingestion.chunk_refiner = {'use_llm': True}
-    
-    # LLM configuration
-    settings.llm = Mock()
-    settings.llm.provider = provider
+    llm = SimpleNamespace(provider=provider)
     
     if provider == 'openai':
-        settings.llm.model = "gpt-3.5-turbo"
-        settings.llm.api_key = os.getenv('OPENAI_API_KEY')
-        settings.llm.temperature = 0.3
-        settings.llm.max_tokens = 1000
+        llm.model = "gpt-3.5-turbo"
+        llm.api_key = os.getenv('OPENAI_API_KEY')
+        llm.temperature = 0.3
+        llm.max_tokens = 1000
         
     elif provider == 'ollama':
-        settings.llm.model = "llama2"
-        settings.llm.base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
-        settings.llm.temperature = 0.3
+        llm.model = "llama2"
+        llm.base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
+        llm.temperature = 0.3
+        llm.max_tokens = 1000
         
-    return settings
+    return SimpleNamespace(
+        llm=llm,
+        ingestion=SimpleNamespace(chunk_refiner={'use_llm': True}),
+    )
 
 
 # Helper function to check provider availability
@@ -149,9 +172,7 @@ def is_provider_available(provider: str) -> tuple[bool, str]:
     if provider == 'azure':
         # For Azure, check if settings.yaml exists and has LLM config
         try:
-            import yaml
-            with open("config/settings.yaml", "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+            config = _load_yaml_config(SETTINGS_PATH)
             
             if 'llm' in config and config['llm'].get('provider') == 'azure':
                 return True, 'settings.yaml'
@@ -239,13 +260,16 @@ def test_multiple_providers_if_available(provider, env_var, sample_noisy_chunk):
 def test_graceful_fallback_with_invalid_model(sample_noisy_chunk):
     """Test that refiner falls back to rule-based when LLM fails."""
     # Create settings with intentionally invalid model
-    settings = Mock(spec=Settings)
-    settings.ingestion = Mock()
-    settings.ingestion.chunk_refiner = {'use_llm': True}
-    settings.llm = Mock()
-    settings.llm.provider = 'openai'
-    settings.llm.model = 'nonexistent-model-xyz'
-    settings.llm.api_key = os.getenv('OPENAI_API_KEY', 'fake-key')
+    settings = SimpleNamespace(
+        ingestion=SimpleNamespace(chunk_refiner={'use_llm': True}),
+        llm=SimpleNamespace(
+            provider='openai',
+            model='nonexistent-model-xyz',
+            api_key=os.getenv('OPENAI_API_KEY', 'fake-key'),
+            temperature=0.3,
+            max_tokens=1000,
+        ),
+    )
     
     refiner = ChunkRefiner(settings)
     trace = TraceContext()
@@ -271,9 +295,9 @@ def test_refinement_quality_comparison(sample_noisy_chunk):
     This test provides visual comparison for manual quality assessment.
     """
     # Rule-based only
-    settings_rule = Mock(spec=Settings)
-    settings_rule.ingestion = Mock()
-    settings_rule.ingestion.chunk_refiner = {'use_llm': False}
+    settings_rule = SimpleNamespace(
+        ingestion=SimpleNamespace(chunk_refiner={'use_llm': False})
+    )
     
     refiner_rule = ChunkRefiner(settings_rule)
     result_rule = refiner_rule.transform([sample_noisy_chunk])
@@ -305,9 +329,10 @@ def test_refinement_quality_comparison(sample_noisy_chunk):
 
 
 @pytest.mark.integration
+@pytest.mark.asyncio
 @pytest.mark.skipif(not is_provider_available('openai')[0], reason="OPENAI_API_KEY not set")
-def test_batch_refinement_performance(sample_noisy_chunk):
-    """Test refining multiple chunks in a batch."""
+async def test_batch_refinement_performance(sample_noisy_chunk):
+    """Test refining multiple chunks concurrently in a batch."""
     settings = create_settings_for_provider('openai')
     refiner = ChunkRefiner(settings)
     trace = TraceContext()
@@ -330,7 +355,7 @@ def test_batch_refinement_performance(sample_noisy_chunk):
     # Refine all
     import time
     start_time = time.time()
-    result = refiner.transform(chunks, trace=trace)
+    result = await refiner.atransform(chunks, trace=trace)
     elapsed_time = time.time() - start_time
     
     # Assertions
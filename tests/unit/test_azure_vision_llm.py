@@ -10,13 +10,14 @@ This module tests the AzureVisionLLM provider implementation, including:
 
 import base64
 import io
+import json
 from pathlib import Path
 from typing import Any
 from unittest.mock import Mock, patch, MagicMock
 
 import pytest
 
-from src.libs.llm.azure_vision_llm import AzureVisionLLM, AzureVisionLLMError
+from src.libs.llm.azure_vision_llm import AzureVisionLLM, AzureVisionLLMError, _peek_size
 from src.libs.llm.base_llm import ChatResponse, Message
 from src.libs.llm.base_vision_llm import ImageInput
 from src.libs.llm.llm_factory import LLMFactory
@@ -199,6 +200,37 @@ class TestImagePreprocessing:
         decoded = base64.b64decode(result)
         assert decoded == test_image_bytes
     
+    @pytest.mark.parametrize("mapped", [True, False])
+    def test_get_image_base64_from_large_path(self, mock_settings, monkeypatch, tmp_path, mapped):
+        """Large files encode the same from a mapping or in blocks as one-shot encoding."""
+        import os
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        if not mapped:
+            monkeypatch.setattr("src.libs.llm.azure_vision_llm._map_file", lambda path: None)
+        
+        # Spans several read blocks and is not a multiple of 3
+        payload = os.urandom(2 * 1024 * 1024 + 1)
+        image_path = tmp_path / "large.bin"
+        image_path.write_bytes(payload)
+        
+        llm = AzureVisionLLM(mock_settings)
+        result = llm._get_image_base64(ImageInput(path=str(image_path)))
+        
+        assert result == base64.b64encode(payload).decode("ascii")
+    
+    def test_get_image_base64_from_empty_path(self, mock_settings, monkeypatch, tmp_path):
+        """Empty files cannot be mapped and encode to an empty string."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        image_path = tmp_path / "empty.bin"
+        image_path.write_bytes(b"")
+        
+        llm = AzureVisionLLM(mock_settings)
+        assert llm._get_image_base64(ImageInput(path=str(image_path))) == ""
+    
     @pytest.mark.skipif(
         not _has_pil(),
         reason="PIL not available"
@@ -277,6 +309,178 @@ class TestImagePreprocessing:
         width, height = compressed_img.size
         assert abs(width / height - 2.0) < 0.01  # Allow small floating point error
     
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_preprocess_image_slightly_oversized_unchanged(self, mock_settings, monkeypatch):
+        """Images needing only a small downscale are not re-encoded."""
+        from PIL import Image
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (1100, 1000), color='yellow').save(buffer, format='PNG')
+        image = ImageInput(data=buffer.getvalue())
+        
+        llm = AzureVisionLLM(mock_settings)
+        
+        # 1024 / 1100 = 0.93 > RESIZE_SKIP_RATIO
+        assert llm.preprocess_image(image, max_size=(1024, 1024)) is image
+        # 800 / 1100 = 0.73 needs a real resize
+        assert llm.preprocess_image(image, max_size=(800, 800)) is not image
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    @pytest.mark.parametrize("ratio, expected", [
+        (0.2, "BOX"),
+        (0.25, "BOX"),
+        (0.4, "BILINEAR"),
+        (0.8, "LANCZOS"),
+    ])
+    def test_resample_filter_by_ratio(self, ratio, expected):
+        """Cheaper filters are used for larger downscales."""
+        from PIL import Image
+        
+        assert AzureVisionLLM._resample_filter(ratio) == getattr(Image.Resampling, expected)
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_save_image_reuses_buffer(self, mock_settings, monkeypatch):
+        """A smaller encode after a larger one returns only its own bytes."""
+        from PIL import Image
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        large = Image.effect_noise((256, 256), 64).convert("RGB")
+        small = Image.new("RGB", (8, 8), color="red")
+        
+        llm._save_image(large, format="PNG")
+        buffer = llm._resize_buf.buffer
+        data = llm._save_image(small, format="PNG")
+        
+        assert llm._resize_buf.buffer is buffer
+        expected = io.BytesIO()
+        small.save(expected, format="PNG")
+        assert data == expected.getvalue()
+        assert Image.open(io.BytesIO(data)).size == (8, 8)
+    
+    def test_preprocess_image_large_jpeg(self, mock_settings, monkeypatch):
+        """Large JPEG is downscaled and stays JPEG."""
+        try:
+            from PIL import Image
+        except ImportError:
+            pytest.skip("PIL not available")
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        jpeg_img = Image.new('RGB', (4000, 3000), color='purple')
+        buffer = io.BytesIO()
+        jpeg_img.save(buffer, format='JPEG')
+        
+        llm = AzureVisionLLM(mock_settings)
+        image = ImageInput(data=buffer.getvalue(), mime_type="image/jpeg")
+        
+        result = llm.preprocess_image(image, max_size=(1000, 1000))
+        
+        compressed_img = Image.open(io.BytesIO(result.data))
+        assert compressed_img.format == "JPEG"
+        assert compressed_img.size == (1000, 750)
+        assert result.mime_type == "image/jpeg"
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    @pytest.mark.parametrize("fmt,options", [
+        ("PNG", {}),
+        ("JPEG", {}),
+        ("JPEG", {"progressive": True}),
+    ])
+    def test_peek_size_reads_header_dimensions(self, fmt, options):
+        """PNG and JPEG dimensions are read from the header."""
+        from PIL import Image
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (321, 123), color='red').save(buffer, format=fmt, **options)
+        
+        assert _peek_size(buffer.getvalue()[:4096]) == (321, 123, fmt)
+    
+    def test_peek_size_unknown_format(self):
+        """Unrecognized or truncated headers return None."""
+        assert _peek_size(b"GIF89a\x01\x00\x01\x00") is None
+        assert _peek_size(b"\x89PNG\r\n\x1a\n") is None
+        assert _peek_size(b"\xff\xd8\xff") is None
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_preprocess_image_small_file_skips_decode(self, mock_settings, monkeypatch, test_image_bytes, tmp_path):
+        """Small images are returned unchanged without being opened by PIL."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        image_path = tmp_path / "small.png"
+        image_path.write_bytes(test_image_bytes)
+        
+        llm = AzureVisionLLM(mock_settings)
+        image = ImageInput(path=str(image_path))
+        
+        with patch("PIL.Image.open", side_effect=AssertionError("decoded")):
+            result = llm.preprocess_image(image, max_size=(2048, 2048))
+        
+        assert result is image
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_preprocess_image_raw_pixels(self, mock_settings, monkeypatch):
+        """Raw pixel buffers are wrapped without decoding and encoded as PNG."""
+        from PIL import Image
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        pixels = bytes([255, 0, 0]) * (40 * 30)
+        image = ImageInput(data=memoryview(pixels), raw_size=(40, 30), raw_mode="RGB")
+        assert image.is_raw
+        
+        llm = AzureVisionLLM(mock_settings)
+        result = llm.preprocess_image(image, max_size=(2048, 2048))
+        
+        assert result.mime_type == "image/png"
+        decoded = Image.open(io.BytesIO(result.data))
+        assert decoded.size == (40, 30)
+        assert decoded.getpixel((0, 0)) == (255, 0, 0)
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_preprocess_image_numpy_array(self, mock_settings, monkeypatch):
+        """NumPy arrays are accepted as pixel data and downscaled when needed."""
+        np = pytest.importorskip("numpy")
+        from PIL import Image
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        array = np.zeros((1000, 2000, 3), dtype=np.uint8)
+        llm = AzureVisionLLM(mock_settings)
+        result = llm.preprocess_image(ImageInput(data=array), max_size=(800, 800))
+        
+        assert Image.open(io.BytesIO(result.data)).size == (800, 400)
+    
     def test_preprocess_image_already_base64(self, mock_settings, monkeypatch, test_image_base64):
         """Base64 images are not preprocessed."""
         monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
@@ -289,6 +493,20 @@ class TestImagePreprocessing:
         
         # Should return same image unchanged
         assert result.base64 == test_image_base64
+    
+    def test_preprocess_image_without_pil(self, mock_settings, monkeypatch):
+        """Without Pillow, encoded images pass through and raw pixels are rejected."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        monkeypatch.setattr("src.libs.llm.azure_vision_llm._pil_image", lambda: None)
+        
+        llm = AzureVisionLLM(mock_settings)
+        encoded = ImageInput(data=b"not an image header")
+        raw = ImageInput(data=bytes(12), raw_size=(2, 2))
+        
+        assert llm.preprocess_image(encoded, max_size=(100, 100)) is encoded
+        with pytest.raises(ImportError, match="Pillow is required"):
+            llm.preprocess_image(raw, max_size=(100, 100))
 
 
 # ================================
@@ -432,6 +650,65 @@ class TestChatWithImage:
             with pytest.raises(AzureVisionLLMError, match="API call failed"):
                 llm.chat_with_image(text="Test", image=image)
     
+    def test_chat_with_image_response_cache(self, mock_settings, monkeypatch, test_image_bytes):
+        """Identical requests are served from the cache when enabled."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        mock_settings.llm.cache_enabled = True
+        
+        llm = AzureVisionLLM(mock_settings)
+        image = ImageInput(data=test_image_bytes)
+        mock_response = {
+            "choices": [{"message": {"content": "A red square"}}],
+            "model": "gpt-4o",
+        }
+        
+        with patch.object(llm, '_call_api', return_value=mock_response) as mock_call:
+            first = llm.chat_with_image(text="Describe", image=image)
+            second = llm.chat_with_image(text="Describe", image=image)
+            llm.chat_with_image(text="Describe", image=image, temperature=0.1)
+        
+        assert mock_call.call_count == 2
+        assert second.content == first.content == "A red square"
+        assert second.raw_response is None
+    
+    def test_chat_with_image_cache_disabled_by_default(self, mock_settings, monkeypatch, test_image_bytes):
+        """Without cache_enabled every request reaches the API."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        image = ImageInput(data=test_image_bytes)
+        mock_response = {"choices": [{"message": {"content": "A red square"}}]}
+        
+        with patch.object(llm, '_call_api', return_value=mock_response) as mock_call:
+            llm.chat_with_image(text="Describe", image=image)
+            llm.chat_with_image(text="Describe", image=image)
+        
+        assert mock_call.call_count == 2
+    
+    def test_chat_with_image_reuses_cached_encoding(self, mock_settings, monkeypatch, test_image_bytes):
+        """cache_encoded inputs are preprocessed and encoded only once."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        image = ImageInput(data=test_image_bytes, cache_encoded=True)
+        mock_response = {"choices": [{"message": {"content": "A red square"}}]}
+        
+        with patch.object(llm, '_call_api', return_value=mock_response) as mock_call, \
+                patch.object(llm, 'preprocess_image', wraps=llm.preprocess_image) as mock_preprocess:
+            llm.chat_with_image(text="What is it?", image=image)
+            llm.chat_with_image(text="What color?", image=image)
+        
+        assert mock_preprocess.call_count == 1
+        urls = [
+            call.kwargs["messages"][-1]["content"][1]["image_url"]["url"]
+            for call in mock_call.call_args_list
+        ]
+        assert urls[0] is urls[1]
+        assert urls[0].startswith("data:image/png;base64,")
+    
     def test_chat_with_image_malformed_response(self, mock_settings, monkeypatch, test_image_bytes):
         """Handle malformed API response."""
         monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
@@ -448,6 +725,309 @@ class TestChatWithImage:
                 llm.chat_with_image(text="Test", image=image)
 
 
+# ================================
+# Test Image Tiling
+# ================================
+
+class TestImageTiling:
+    """Test tiling of oversized images."""
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_tile_image_grid_matches_aspect(self):
+        """A 2:1 image is split into a 2:1 grid of 512px tiles."""
+        from PIL import Image
+        from src.libs.llm.azure_vision_llm import _tile_image
+        
+        tiles = _tile_image(Image.new('RGB', (3000, 1500)), tile=512, max_tiles=10)
+        
+        assert len(tiles) == 8  # 4 x 2
+        assert all(t.size == (512, 512) for t in tiles)
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_tiling_adds_tile_parts(self, mock_settings, monkeypatch):
+        """Oversized images are sent as overview + tiles when tiling is enabled."""
+        from PIL import Image
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (3000, 1500), color='blue').save(buffer, format='PNG')
+        image = ImageInput(data=buffer.getvalue())
+        mock_response = {"choices": [{"message": {"content": "ok"}}]}
+        
+        for tiling_enabled, expected_parts in ((True, 10), (False, 2)):
+            llm = AzureVisionLLM(mock_settings, tiling_enabled=tiling_enabled)
+            with patch.object(llm, '_call_api', return_value=mock_response) as mock_call:
+                llm.chat_with_image(text="Read the table", image=image)
+            
+            content = mock_call.call_args.kwargs["messages"][-1]["content"]
+            assert len(content) == expected_parts
+            assert content[0]["type"] == "text"
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_tiling_skips_small_images(self, mock_settings, monkeypatch, test_image_bytes):
+        """Images within max_image_size are not tiled."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings, tiling_enabled=True)
+        
+        assert llm.tiling_enabled is True
+        assert llm._encode_tiled(ImageInput(data=test_image_bytes)) is None
+    
+    @pytest.mark.skipif(
+        not _has_pil(),
+        reason="PIL not available"
+    )
+    def test_tiling_overview_is_thumbnail_and_decodes_once(self, mock_settings, monkeypatch):
+        """The overview is smaller than each tile grid and the image is decoded once."""
+        from PIL import Image
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (4000, 3000), color='blue').save(buffer, format='JPEG')
+        llm = AzureVisionLLM(mock_settings, tiling_enabled=True)
+        
+        with patch.object(AzureVisionLLM, '_open_image', wraps=AzureVisionLLM._open_image) as mock_open:
+            overview, tiles = llm._encode_tiled(ImageInput(data=buffer.getvalue()))
+        
+        assert mock_open.call_count == 1
+        assert Image.open(io.BytesIO(overview.data)).size == (512, 384)
+        assert overview.mime_type == "image/jpeg"
+        assert len(tiles) == 6  # 3 x 2 grid of 512px tiles
+
+
+# ================================
+# Test HTTP Transport
+# ================================
+
+class TestCallApi:
+    """Test _call_api request construction and shared client reuse."""
+    
+    def test_call_api_uses_shared_http_client(self, mock_settings, monkeypatch):
+        """Sync requests go through the pool shared with the text LLM providers."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        shared = MagicMock(is_closed=False)
+        shared.post.return_value.status_code = 200
+        shared.post.return_value.json.return_value = {"choices": []}
+        
+        with patch("src.libs.llm.http_client._client", shared):
+            llm._call_api(messages=[], deployment="gpt-4o", temperature=0.0, max_tokens=1)
+        
+        shared.post.assert_called_once()
+    
+    def test_call_api_posts_to_deployment(self, mock_settings, monkeypatch):
+        """Request goes to the deployment URL with api-key header."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com/")
+        
+        llm = AzureVisionLLM(mock_settings)
+        mock_client = MagicMock()
+        mock_client.post.return_value.status_code = 200
+        mock_client.post.return_value.json.return_value = {"choices": []}
+        
+        with patch("src.libs.llm.azure_vision_llm.get_http_client", return_value=mock_client):
+            result = llm._call_api(
+                messages=[{"role": "user", "content": "Hi"}],
+                deployment="gpt-4o",
+                temperature=0.2,
+                max_tokens=50,
+            )
+        
+        assert result == {"choices": []}
+        args, kwargs = mock_client.post.call_args
+        assert args[0] == (
+            "https://test.openai.azure.com/openai/deployments/gpt-4o/"
+            "chat/completions?api-version=2024-02-15-preview"
+        )
+        assert kwargs["headers"]["api-key"] == "test-key"
+        body = json.loads(kwargs["content"])
+        assert body["max_tokens"] == 50
+        assert body["messages"] == [{"role": "user", "content": "Hi"}]
+    
+    def test_call_api_http_error(self, mock_settings, monkeypatch):
+        """Non-200 responses raise AzureVisionLLMError with the API message."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        mock_client = MagicMock()
+        mock_client.post.return_value.status_code = 429
+        mock_client.post.return_value.json.return_value = {
+            "error": {"message": "Rate limit exceeded"}
+        }
+        
+        with patch("src.libs.llm.azure_vision_llm.get_http_client", return_value=mock_client):
+            with pytest.raises(AzureVisionLLMError, match="HTTP 429.*Rate limit exceeded") as exc_info:
+                llm._call_api(messages=[], deployment="gpt-4o", temperature=0.0, max_tokens=1)
+        
+        assert exc_info.value.category == "http"
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retryable is True
+    
+    def test_call_api_timeout_is_retryable(self, mock_settings, monkeypatch):
+        """Timeouts raise a retryable AzureVisionLLMError."""
+        import httpx
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        mock_client = MagicMock()
+        mock_client.post.side_effect = httpx.ReadTimeout("timed out")
+        
+        with patch("src.libs.llm.azure_vision_llm.get_http_client", return_value=mock_client):
+            with pytest.raises(AzureVisionLLMError, match="timed out") as exc_info:
+                llm._call_api(messages=[], deployment="gpt-4o", temperature=0.0, max_tokens=1)
+        
+        assert exc_info.value.category == "timeout"
+        assert exc_info.value.retryable is True
+        assert exc_info.value.status_code is None
+
+
+# ================================
+# Test Async and Batch
+# ================================
+
+class TestAsyncAndBatch:
+    """Test chat_with_image_async and chat_with_image_batch."""
+    
+    def test_chat_with_image_async(self, mock_settings, monkeypatch, test_image_bytes):
+        """Async call returns the parsed response."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        mock_response = {"choices": [{"message": {"content": "A red square"}}]}
+        
+        with patch.object(llm, '_call_api_async', new=AsyncMock(return_value=mock_response)):
+            response = asyncio.run(
+                llm.chat_with_image_async(text="Describe", image=ImageInput(data=test_image_bytes))
+            )
+        
+        assert response.content == "A red square"
+    
+    def test_async_calls_share_client_per_loop(self, mock_settings, monkeypatch, test_image_bytes):
+        """Async calls on one event loop reuse a single async client."""
+        import asyncio
+        from unittest.mock import AsyncMock
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        mock_call = AsyncMock(return_value={"choices": [{"message": {"content": "ok"}}]})
+        
+        async def run_twice():
+            image = ImageInput(data=test_image_bytes)
+            await llm.chat_with_image_async(text="one", image=image)
+            await llm.chat_with_image_async(text="two", image=image)
+        
+        with patch.object(llm, '_call_api_async', new=mock_call):
+            asyncio.run(run_twice())
+        
+        first_client = mock_call.call_args_list[0].args[0]
+        assert mock_call.call_args_list[1].args[0] is first_client
+    
+    def test_chat_with_image_batch_preserves_order(self, mock_settings, monkeypatch, test_image_bytes):
+        """Batch responses line up with their inputs."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        
+        async def fake_call(client, messages, deployment, temperature, max_tokens):
+            prompt = messages[-1]["content"][0]["text"]
+            return {"choices": [{"message": {"content": f"answer to {prompt}"}}]}
+        
+        inputs = [(f"q{i}", ImageInput(data=test_image_bytes)) for i in range(5)]
+        with patch.object(llm, '_call_api_async', side_effect=fake_call):
+            responses = llm.chat_with_image_batch(inputs, max_concurrency=2)
+        
+        assert [r.content for r in responses] == [f"answer to q{i}" for i in range(5)]
+    
+    def test_chat_with_image_batch_empty(self, mock_settings, monkeypatch):
+        """Empty batch returns an empty list without any API call."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        assert AzureVisionLLM(mock_settings).chat_with_image_batch([]) == []
+    
+    @pytest.mark.parametrize("max_concurrency", [0, -1])
+    def test_chat_with_image_batch_rejects_invalid_concurrency(
+        self, mock_settings, monkeypatch, test_image_bytes, max_concurrency
+    ):
+        """max_concurrency below 1 is rejected instead of hanging."""
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        with pytest.raises(ValueError, match="max_concurrency"):
+            llm.chat_with_image_batch(
+                [("q", ImageInput(data=test_image_bytes))], max_concurrency=max_concurrency
+            )
+    
+    def test_chat_with_image_batch_cancels_pending_on_failure(
+        self, mock_settings, monkeypatch, test_image_bytes
+    ):
+        """A failing request cancels its siblings before the client closes."""
+        import asyncio
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        cancelled = []
+        
+        async def fake_call(client, messages, deployment, temperature, max_tokens):
+            if messages[-1]["content"][0]["text"] == "fail":
+                raise AzureVisionLLMError("[Azure Vision] boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        
+        inputs = [(text, ImageInput(data=test_image_bytes)) for text in ("slow", "fail", "slow")]
+        with patch.object(llm, '_call_api_async', side_effect=fake_call):
+            with pytest.raises(AzureVisionLLMError, match="boom"):
+                llm.chat_with_image_batch(inputs)
+        
+        assert len(cancelled) == 2
+    
+    def test_chat_with_image_batch_wraps_errors(self, mock_settings, monkeypatch, test_image_bytes):
+        """Failures inside the batch surface as AzureVisionLLMError."""
+        from unittest.mock import AsyncMock
+        
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://test.openai.azure.com")
+        
+        llm = AzureVisionLLM(mock_settings)
+        inputs = [("q", ImageInput(data=test_image_bytes))]
+        
+        with patch.object(llm, '_call_api_async', new=AsyncMock(return_value={"choices": []})):
+            with pytest.raises(AzureVisionLLMError, match="API call failed.*IndexError"):
+                llm.chat_with_image_batch(inputs)
+
+
 # ================================
 # Test Factory Integration
 # ================================
@@ -1,15 +1,16 @@
 """Unit tests for ChunkRefiner transform."""
 
+import asyncio
 import json
 import pytest
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 
-from src.core.settings import Settings
-from src.core.types import Chunk
+from src.core.types import Chunk, ChunkBatch
 from src.core.trace.trace_context import TraceContext
 from src.ingestion.transform.chunk_refiner import ChunkRefiner
-from src.libs.llm.base_llm import BaseLLM
+from src.libs.llm.base_llm import BaseLLM, ChatResponse
 
 
 # Fixtures
@@ -25,19 +26,13 @@ def noisy_chunks_data():
 @pytest.fixture
 def mock_settings():
     """Create mock settings without LLM enabled."""
-    settings = Mock(spec=Settings)
-    settings.ingestion = Mock()
-    settings.ingestion.chunk_refiner = {'use_llm': False}
-    return settings
+    return SimpleNamespace(ingestion=SimpleNamespace(chunk_refiner={'use_llm': False}))
 
 
 @pytest.fixture
 def mock_settings_with_llm():
     """Create mock settings with LLM enabled."""
-    settings = Mock(spec=Settings)
-    settings.ingestion = Mock()
-    settings.ingestion.chunk_refiner = {'use_llm': True}
-    return settings
+    return SimpleNamespace(ingestion=SimpleNamespace(chunk_refiner={'use_llm': True}))
 
 
 @pytest.fixture
@@ -180,6 +175,28 @@ class TestTransformPipelineRuleOnly:
         result = refiner.transform([])
         assert result == []
     
+    def test_transform_chunk_batch(self, mock_settings):
+        """Test that a ChunkBatch is refined column-wise and keeps its vectors."""
+        refiner = ChunkRefiner(mock_settings)
+        chunks = [
+            Chunk(id=f"c{i}", text=f"Text  {i}\n\n\n\nmore", metadata={"source_path": "t.pdf"})
+            for i in range(3)
+        ]
+        dense = [[0.1], [0.2], [0.3]]
+        batch = ChunkBatch.from_chunks(chunks, sparse_vectors=[{"a": 1.0}] * 3)
+        batch.dense = dense
+        
+        result = refiner.transform_chunk_batch(batch)
+        async_result = asyncio.run(refiner.atransform_chunk_batch(batch))
+        
+        for refined in (result, async_result):
+            assert isinstance(refined, ChunkBatch)
+            assert refined.ids == ["c0", "c1", "c2"]
+            assert refined.texts == [f"Text {i}\n\nmore" for i in range(3)]
+            assert all(m['refined_by'] == 'rule' for m in refined.metadatas)
+            assert refined.dense is dense
+            assert refined.sparse == [{"a": 1.0}] * 3
+    
     def test_metadata_preserved(self, mock_settings, sample_chunk):
         """Test that original metadata is preserved."""
         refiner = ChunkRefiner(mock_settings)
@@ -260,6 +277,334 @@ class TestLLMEnhancement:
         assert stage_data['data']['fallback_count'] == 0
 
 
+# Test Async Transform
+
+class TestAsyncTransform:
+    """Test atransform concurrent refinement."""
+    
+    def test_atransform_rule_only_matches_transform(self, mock_settings, noisy_chunks_data):
+        """Test atransform without LLM gives the same result as transform."""
+        refiner = ChunkRefiner(mock_settings)
+        chunks = [
+            Chunk(id=f"c{i}", text=case["input"], metadata={"source_path": "t.pdf"})
+            for i, case in enumerate(noisy_chunks_data.values())
+        ]
+        
+        expected = refiner.transform(chunks)
+        result = asyncio.run(refiner.atransform(chunks))
+        
+        assert [c.text for c in result] == [c.text for c in expected]
+        assert [c.id for c in result] == [c.id for c in chunks]
+    
+    def test_atransform_empty_list(self, mock_settings):
+        """Test atransform with empty list."""
+        refiner = ChunkRefiner(mock_settings)
+        assert asyncio.run(refiner.atransform([])) == []
+    
+    def test_atransform_runs_llm_calls_concurrently(self, mock_settings_with_llm, mock_llm):
+        """Test all LLM calls are in flight at the same time."""
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=mock_llm)
+        refiner._prompt_template = "Refine: {text}"
+        n_chunks = 5
+        in_flight = []
+        
+        async def fake_achat(messages, trace=None):
+            in_flight.append(messages[0].content)
+            # Only completes once every chunk's request has started
+            while len(in_flight) < n_chunks:
+                await asyncio.sleep(0)
+            return f"LLM {messages[0].content}"
+        
+        mock_llm.achat.side_effect = fake_achat
+        chunks = [
+            Chunk(id=f"c{i}", text=f"text {i}", metadata={"source_path": "t.pdf"})
+            for i in range(n_chunks)
+        ]
+        
+        result = asyncio.run(asyncio.wait_for(refiner.atransform(chunks), timeout=5))
+        
+        assert [c.text for c in result] == [f"LLM Refine: text {i}" for i in range(n_chunks)]
+        assert all(c.metadata['refined_by'] == 'llm' for c in result)
+        mock_llm.chat.assert_not_called()
+    
+    def test_atransform_failure_falls_back_per_chunk(self, mock_settings_with_llm, mock_llm):
+        """Test a failed LLM call only falls back for its own chunk."""
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=mock_llm)
+        refiner._prompt_template = "Refine: {text}"
+        
+        async def fake_achat(messages, trace=None):
+            if "bad" in messages[0].content:
+                raise RuntimeError("LLM API error")
+            return "LLM result"
+        
+        mock_llm.achat.side_effect = fake_achat
+        chunks = [
+            Chunk(id="c1", text="good  text", metadata={"source_path": "t.pdf"}),
+            Chunk(id="c2", text="bad  text", metadata={"source_path": "t.pdf"}),
+            Chunk(id="c3", text="good  text", metadata={"source_path": "t.pdf"}),
+        ]
+        trace = TraceContext()
+        
+        result = asyncio.run(refiner.atransform(chunks, trace=trace))
+        
+        assert [c.metadata['refined_by'] for c in result] == ['llm', 'rule', 'llm']
+        assert result[1].text == "bad text"
+        assert result[1].metadata['refine_fallback_reason'] == 'llm_failed'
+        stage_data = trace.get_stage_data('chunk_refiner')
+        assert stage_data['data']['llm_enhanced_count'] == 2
+        assert stage_data['data']['fallback_count'] == 1
+        assert stage_data['data']['success_count'] == 3
+    
+    def test_atransform_exception_preserves_original(self, mock_settings):
+        """Test an unexpected error preserves the original chunk."""
+        refiner = ChunkRefiner(mock_settings)
+        original_method = refiner._rule_based_refine
+        
+        def failing_refine(text):
+            if "fail" in text:
+                raise ValueError("Intentional test error")
+            return original_method(text)
+        
+        refiner._rule_based_refine = failing_refine
+        chunks = [
+            Chunk(id="c1", text="Normal text", metadata={"source_path": "test1.pdf"}),
+            Chunk(id="c2", text="This should fail processing", metadata={"source_path": "test2.pdf"}),
+        ]
+        
+        result = asyncio.run(refiner.atransform(chunks))
+        
+        assert result[1] is chunks[1]
+        assert result[0].metadata['refined_by'] == 'rule'
+    
+    def test_atransform_duplicate_chunks_share_llm_call(self, mock_settings_with_llm, mock_llm):
+        """Test chunks with identical cleaned text are refined by one LLM call."""
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=mock_llm)
+        refiner._prompt_template = "Refine: {text}"
+        mock_llm.achat.return_value = "LLM result"
+        chunks = [
+            Chunk(id="c1", text="Repeated   footer", metadata={"source_path": "t.pdf"}),
+            Chunk(id="c2", text="Repeated footer  ", metadata={"source_path": "t.pdf"}),
+            Chunk(id="c3", text="Unique text", metadata={"source_path": "t.pdf"}),
+        ]
+        trace = TraceContext()
+        
+        result = asyncio.run(refiner.atransform(chunks, trace=trace))
+        
+        assert mock_llm.achat.await_count == 2
+        assert [c.id for c in result] == ["c1", "c2", "c3"]
+        assert all(c.metadata['refined_by'] == 'llm' for c in result)
+        stage_data = trace.get_stage_data('chunk_refiner')
+        assert stage_data['data']['distinct_text_count'] == 2
+        assert stage_data['data']['llm_enhanced_count'] == 3
+    
+    def test_default_achat_delegates_to_chat(self):
+        """Test BaseLLM.achat runs chat in a worker thread."""
+        from src.libs.llm.base_llm import ChatResponse, Message
+        
+        class EchoLLM(BaseLLM):
+            def chat(self, messages, trace=None, **kwargs):
+                return ChatResponse(content=messages[0].content, model=kwargs.get("model", "echo"))
+        
+        response = asyncio.run(
+            EchoLLM().achat([Message(role="user", content="hi")], model="m")
+        )
+        
+        assert response.content == "hi"
+        assert response.model == "m"
+
+
+# Test Streaming
+
+class StreamingLLM(BaseLLM):
+    """LLM stub that streams fixed deltas and records when it is closed."""
+    
+    def __init__(self, deltas):
+        self.deltas = deltas
+        self.yielded = 0
+        self.closed = False
+    
+    def chat(self, messages, trace=None, **kwargs):
+        raise AssertionError("chat() should not be called when streaming")
+    
+    def stream_chat(self, messages, trace=None, **kwargs):
+        try:
+            for delta in self.deltas:
+                self.yielded += 1
+                yield delta
+        finally:
+            self.closed = True
+
+
+@pytest.fixture
+def mock_settings_streaming():
+    """Create mock settings with LLM streaming enabled."""
+    return SimpleNamespace(ingestion=SimpleNamespace(chunk_refiner={'use_llm': True, 'stream': True}))
+
+
+class TestStreaming:
+    """Test streamed LLM refinement."""
+    
+    def test_stream_collects_deltas(self, mock_settings_streaming, sample_chunk):
+        """Test streamed deltas are joined into the refined text."""
+        llm = StreamingLLM(["Refined ", "text"])
+        refiner = ChunkRefiner(mock_settings_streaming, llm=llm)
+        refiner._prompt_template = "Refine: {text}"
+        
+        result = refiner.transform([sample_chunk])
+        async_result = asyncio.run(refiner.atransform([sample_chunk]))
+        
+        for refined in (result, async_result):
+            assert refined[0].text == "Refined text"
+            assert refined[0].metadata['refined_by'] == 'llm'
+        assert llm.closed
+    
+    def test_runaway_stream_abandoned(self, mock_settings_streaming, sample_chunk):
+        """Test output far longer than the input is cut off and falls back."""
+        llm = StreamingLLM(["x" * 100] * 50)
+        refiner = ChunkRefiner(mock_settings_streaming, llm=llm)
+        refiner._prompt_template = "Refine: {text}"
+        
+        result = refiner.transform([sample_chunk])
+        
+        assert result[0].metadata['refined_by'] == 'rule'
+        assert result[0].metadata['refine_fallback_reason'] == 'llm_failed'
+        assert llm.closed
+        assert llm.yielded == 3  # stopped just past the 256-character floor
+    
+    def test_streaming_disabled_by_default(self, mock_settings_with_llm):
+        """Test chat() is used unless streaming is configured."""
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=Mock(spec=BaseLLM))
+        assert refiner.stream is False
+
+
+# Test Batch Deduplication
+
+class TestBatchDeduplication:
+    """Test identical chunks in a batch share one LLM call."""
+    
+    def test_duplicate_chunks_share_llm_call(self, mock_settings_with_llm, mock_llm):
+        """Test transform calls the LLM once per distinct cleaned text."""
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=mock_llm)
+        refiner._prompt_template = "Refine: {text}"
+        mock_llm.chat.return_value = "LLM result"
+        chunks = [
+            Chunk(id=f"c{i}", text=text, metadata={"source_path": "t.pdf"})
+            for i, text in enumerate(["Same  text", "Same text", "Other text", "Same   text"])
+        ]
+        trace = TraceContext()
+        
+        result = refiner.transform(chunks, trace=trace)
+        
+        assert mock_llm.chat.call_count == 2
+        assert [c.id for c in result] == ["c0", "c1", "c2", "c3"]
+        assert all(c.metadata['refined_by'] == 'llm' for c in result)
+        stage_data = trace.get_stage_data('chunk_refiner')
+        assert stage_data['data']['distinct_text_count'] == 2
+    
+    def test_duplicate_failure_falls_back_for_each_chunk(self, mock_settings_with_llm, mock_llm):
+        """Test a failed shared call falls back for every duplicate."""
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=mock_llm)
+        refiner._prompt_template = "Refine: {text}"
+        mock_llm.chat.side_effect = Exception("LLM API error")
+        chunks = [
+            Chunk(id="c1", text="Same text", metadata={"source_path": "t.pdf"}),
+            Chunk(id="c2", text="Same text", metadata={"source_path": "t.pdf"}),
+        ]
+        
+        result = refiner.transform(chunks)
+        
+        assert mock_llm.chat.call_count == 1
+        assert all(c.metadata['refine_fallback_reason'] == 'llm_failed' for c in result)
+
+
+# Test Batch API Submission
+
+class BatchLLM(BaseLLM):
+    """LLM stub with a batch_chat that records each submitted job."""
+    
+    def __init__(self, fail_ids=(), error=None):
+        self.jobs = []
+        self.fail_ids = set(fail_ids)
+        self.error = error
+    
+    def chat(self, messages, trace=None, **kwargs):
+        raise AssertionError("chat() should not be called for batch submission")
+    
+    def batch_chat(self, requests, trace=None, **kwargs):
+        self.jobs.append(requests)
+        if self.error:
+            raise self.error
+        return {
+            custom_id: ChatResponse(
+                content=f"LLM: {messages[0].content}", model="batch-model"
+            )
+            for custom_id, messages in requests.items()
+            if custom_id not in self.fail_ids
+        }
+
+
+class TestBatchAPI:
+    """Test transform_batch_async submits one batch job."""
+    
+    def make_chunks(self, texts):
+        return [
+            Chunk(id=f"c{i}", text=text, metadata={"source_path": "t.pdf"})
+            for i, text in enumerate(texts)
+        ]
+    
+    def test_one_job_per_batch(self, mock_settings_with_llm):
+        """Test distinct texts are submitted together keyed by chunk id."""
+        llm = BatchLLM()
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=llm)
+        refiner._prompt_template = "{text}"
+        chunks = self.make_chunks(["First  text", "Second text", "First text"])
+        trace = TraceContext()
+        
+        result = asyncio.run(refiner.transform_batch_async(chunks, trace=trace))
+        
+        assert len(llm.jobs) == 1
+        assert set(llm.jobs[0]) == {"c0", "c1"}
+        assert [c.text for c in result] == ["LLM: First text", "LLM: Second text", "LLM: First text"]
+        assert all(c.metadata['refined_by'] == 'llm' for c in result)
+        assert trace.get_stage_data('chunk_refiner')['data']['distinct_text_count'] == 2
+    
+    def test_failed_request_falls_back(self, mock_settings_with_llm):
+        """Test a request missing from the output falls back to rules."""
+        llm = BatchLLM(fail_ids={"c1"})
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=llm)
+        refiner._prompt_template = "{text}"
+        
+        result = asyncio.run(refiner.transform_batch_async(self.make_chunks(["One", "Two  text"])))
+        
+        assert result[0].metadata['refined_by'] == 'llm'
+        assert result[1].text == "Two text"
+        assert result[1].metadata['refine_fallback_reason'] == 'llm_failed'
+    
+    def test_failed_job_falls_back_for_all(self, mock_settings_with_llm):
+        """Test a failed batch job keeps every chunk's rule-based text."""
+        llm = BatchLLM(error=RuntimeError("batch expired"))
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=llm)
+        refiner._prompt_template = "{text}"
+        
+        result = asyncio.run(refiner.transform_batch_async(self.make_chunks(["One", "Two"])))
+        
+        assert [c.text for c in result] == ["One", "Two"]
+        assert all(c.metadata['refined_by'] == 'rule' for c in result)
+    
+    def test_falls_back_to_atransform(self, mock_settings_with_llm, mock_llm):
+        """Test LLMs without batch_chat (or use_batch_api=False) use atransform."""
+        mock_llm.achat.return_value = "LLM refined text"
+        refiner = ChunkRefiner(mock_settings_with_llm, llm=mock_llm)
+        refiner._prompt_template = "{text}"
+        
+        with patch.object(refiner, 'atransform', wraps=refiner.atransform) as atransform:
+            result = asyncio.run(refiner.transform_batch_async(self.make_chunks(["One"])))
+            asyncio.run(refiner.transform_batch_async(self.make_chunks(["One"]), use_batch_api=False))
+        
+        assert atransform.call_count == 2
+        assert result[0].text == "LLM refined text"
+
+
 # Test Prompt Loading
 
 class TestPromptLoading:
@@ -346,8 +691,7 @@ class TestConfiguration:
     
     def test_use_llm_disabled_by_default(self):
         """Test that LLM is disabled when config missing."""
-        settings = Mock(spec=Settings)
-        settings.ingestion = None
+        settings = SimpleNamespace(ingestion=None)
         
         refiner = ChunkRefiner(settings)
         
@@ -366,6 +710,14 @@ class TestConfiguration:
             _ = refiner.llm
             mock_factory.assert_called_once()
     
+    def test_injected_llm_warmed_up(self, mock_settings, mock_settings_with_llm, mock_llm):
+        """Test the provider connection is pre-warmed only when the LLM is used."""
+        ChunkRefiner(mock_settings, llm=mock_llm)
+        mock_llm.warm_up.assert_not_called()
+        
+        ChunkRefiner(mock_settings_with_llm, llm=mock_llm)
+        mock_llm.warm_up.assert_called_once()
+    
     def test_llm_init_failure_disables_llm(self, mock_settings_with_llm):
         """Test that LLM initialization failure disables LLM mode."""
         with patch('src.ingestion.transform.chunk_refiner.LLMFactory.create', side_effect=Exception("Init failed")):
@@ -62,6 +62,7 @@ def test_load_settings_success(tmp_path: Path) -> None:
     settings = load_settings(settings_path)
 
     assert settings.llm.provider == "openai"
+    assert settings.llm.cache_enabled is False
     assert settings.embedding.dimensions == 1536
     assert settings.vector_store.collection_name == "knowledge_hub"
     assert settings.retrieval.rrf_k == 60
@@ -0,0 +1,124 @@
+"""Unit tests for ContentDefinedSplitter.
+
+Test Coverage:
+- Configuration-driven instantiation from settings
+- Chunk size bounds and lossless reassembly
+- Boundary stability under local edits
+- Whitespace-only pieces and non-Latin text
+- Factory registration
+"""
+
+import random
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.libs.splitter.content_defined_splitter import ContentDefinedSplitter
+from src.libs.splitter.splitter_factory import SplitterFactory
+
+
+def create_mock_settings(chunk_size: int = 200) -> Any:
+    """Create mock settings object."""
+    settings = MagicMock()
+    settings.ingestion.chunk_size = chunk_size
+    settings.ingestion.splitter = "content_defined"
+    return settings
+
+
+def sample_text(n_words: int = 5000, seed: int = 7) -> str:
+    """Build deterministic pseudo-prose."""
+    rng = random.Random(seed)
+    words = ["retrieval", "vector", "chunk", "query", "the", "a", "of", "index", "model.\n\n"]
+    return " ".join(rng.choice(words) for _ in range(n_words))
+
+
+class TestContentDefinedSplitterConfiguration:
+    """Tests for ContentDefinedSplitter configuration."""
+
+    def test_defaults_from_settings(self):
+        splitter = ContentDefinedSplitter(create_mock_settings(chunk_size=400))
+        assert splitter.chunk_size == 400
+        assert splitter.min_size == 100
+        assert splitter.max_size == 1600
+
+    def test_missing_ingestion_config(self):
+        settings = MagicMock(spec=[])
+        with pytest.raises(ValueError, match="Missing ingestion configuration"):
+            ContentDefinedSplitter(settings)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"chunk_size": 1},
+        {"chunk_size": 100, "min_size": 100},
+        {"chunk_size": 100, "max_size": 50},
+    ])
+    def test_invalid_sizes(self, kwargs):
+        with pytest.raises(ValueError):
+            ContentDefinedSplitter(create_mock_settings(), **kwargs)
+
+    def test_registered_with_factory(self):
+        SplitterFactory.register_provider("content_defined", ContentDefinedSplitter)
+        splitter = SplitterFactory.create(create_mock_settings())
+        assert isinstance(splitter, ContentDefinedSplitter)
+
+
+class TestContentDefinedSplitting:
+    """Tests for content-defined boundaries."""
+
+    def test_chunks_reassemble_within_bounds(self):
+        splitter = ContentDefinedSplitter(create_mock_settings())
+        text = sample_text()
+
+        chunks = splitter.split_text(text)
+
+        assert "".join(chunks) == text
+        assert all(len(chunk) <= splitter.max_size for chunk in chunks)
+        assert all(len(chunk) >= splitter.min_size for chunk in chunks[:-1])
+        assert len(chunks) > 10
+
+    def test_deterministic(self):
+        text = sample_text()
+        first = ContentDefinedSplitter(create_mock_settings()).split_text(text)
+        second = ContentDefinedSplitter(create_mock_settings()).split_text(text)
+        assert first == second
+
+    def test_insertion_only_changes_nearby_chunks(self):
+        splitter = ContentDefinedSplitter(create_mock_settings())
+        text = sample_text()
+        middle = len(text) // 2
+        edited = text[:middle] + " an inserted sentence " + text[middle:]
+
+        original = splitter.split_text(text)
+        changed = set(splitter.split_text(edited)) - set(original)
+
+        # Boundaries resynchronize shortly after the edit
+        assert 1 <= len(changed) <= 3
+
+    def test_short_text_single_chunk(self):
+        splitter = ContentDefinedSplitter(create_mock_settings())
+        assert splitter.split_text("short text") == ["short text"]
+
+    def test_whitespace_pieces_are_merged(self):
+        splitter = ContentDefinedSplitter(
+            create_mock_settings(), chunk_size=8, min_size=2, max_size=8
+        )
+        text = " " * 20 + "word" + " " * 20
+
+        chunks = splitter.split_text(text)
+
+        assert "".join(chunks) == text
+        assert not any(chunk.isspace() for chunk in chunks)
+
+    def test_non_latin_text(self):
+        splitter = ContentDefinedSplitter(create_mock_settings(chunk_size=100))
+        text = "检索增强生成系统将文档切分为块。" * 200
+
+        chunks = splitter.split_text(text)
+
+        assert "".join(chunks) == text
+        assert len(chunks) > 5
+
+    def test_invalid_input(self):
+        splitter = ContentDefinedSplitter(create_mock_settings())
+        with pytest.raises(ValueError, match="empty or whitespace-only"):
+            splitter.split_text("   ")
@@ -1,4 +1,4 @@
-"""Unit tests for core data types (Document, Chunk, ChunkRecord).
+"""Unit tests for core data types (Document, Chunk, ChunkRecord, ChunkBatch).
 
 Tests cover:
 - Type instantiation
@@ -9,7 +9,19 @@ Tests cover:
 """
 
 import pytest
-from src.core.types import Document, Chunk, ChunkRecord
+from src.core.types import (
+    Document,
+    Chunk,
+    ChunkBatch,
+    ChunkRecord,
+    ImageOffsetIndex,
+    QuantizedVector,
+    dequantize_dense_vector,
+    pack_sparse_vector,
+    quantize_dense_vector,
+    register_document_metadata,
+    unregister_document_metadata,
+)
 
 
 class TestDocument:
@@ -144,6 +156,45 @@ class TestChunk:
         assert restored.start_offset == original.start_offset
         assert restored.end_offset == original.end_offset
         assert restored.source_ref == original.source_ref
+    
+    def test_chunk_shared_parent_metadata(self):
+        """Test Chunk resolves document-level metadata from a registered parent."""
+        import json
+        
+        register_document_metadata(
+            "doc_shared", {"source_path": "data/test.pdf", "title": "Report"}
+        )
+        try:
+            chunk = Chunk(
+                id="chunk_shared_001",
+                text="Content",
+                metadata={"chunk_index": 0, "title": "Section 1"},
+                source_ref="doc_shared"
+            )
+            
+            assert "source_path" not in chunk.metadata
+            assert chunk.full_metadata["source_path"] == "data/test.pdf"
+            assert chunk.full_metadata["title"] == "Section 1"  # chunk-level wins
+            
+            record = ChunkRecord.from_chunk(chunk, dense_vector=[0.1])
+            assert record.metadata == {
+                "source_path": "data/test.pdf", "title": "Section 1", "chunk_index": 0
+            }
+            records = ChunkRecord.from_chunks([chunk], [[0.1]], own_metadata=True)
+            assert records[0].metadata["source_path"] == "data/test.pdf"
+            assert records[0].metadata is not chunk.metadata
+            
+            # Serialized chunks are self-contained
+            restored = Chunk.from_dict(chunk.to_dict())
+            assert restored.metadata == record.metadata
+            assert json.loads(chunk.to_json_bytes())["metadata"] == record.metadata
+        finally:
+            unregister_document_metadata("doc_shared")
+        
+        with pytest.raises(ValueError, match="source_path"):
+            chunk.to_dict()
+        with pytest.raises(ValueError, match="source_path"):
+            Chunk(id="c", text="t", metadata={}, source_ref="doc_shared")
 
 
 class TestChunkRecord:
@@ -223,6 +274,168 @@ class TestChunkRecord:
         assert record.metadata == chunk.metadata
         assert record.dense_vector == dense_vec
         assert record.sparse_vector == sparse_vec
+        assert record.metadata is not chunk.metadata
+        assert record == ChunkRecord(
+            id=chunk.id, text=chunk.text, metadata=chunk.metadata,
+            dense_vector=dense_vec, sparse_vector=sparse_vec
+        )
+    
+    def test_chunk_record_from_chunk_requires_source_path(self):
+        """Test from_chunk still rejects a record without a source_path."""
+        register_document_metadata("doc_parent", {"source_path": "data/test.pdf"})
+        try:
+            chunk = Chunk(id="c1", text="t", metadata={"source_path": None},
+                          source_ref="doc_parent")
+            with pytest.raises(ValueError, match="source_path"):
+                ChunkRecord.from_chunk(chunk)
+        finally:
+            unregister_document_metadata("doc_parent")
+    
+    def test_chunk_record_from_chunk_with_dtype(self):
+        """Test that from_chunk can store the dense vector as a NumPy array."""
+        np = pytest.importorskip("numpy")
+        chunk = Chunk(
+            id="chunk_123_001",
+            text="Content",
+            metadata={"source_path": "data/test.pdf"}
+        )
+        
+        record = ChunkRecord.from_chunk(chunk, [0.1, 0.2, 0.3], dtype="float16")
+        
+        assert isinstance(record.dense_vector, np.ndarray)
+        assert record.dense_vector.dtype == np.float16
+        assert np.allclose(record.dense_vector, [0.1, 0.2, 0.3], atol=1e-3)
+    
+    def test_chunk_record_packed_sparse_vector_roundtrip(self):
+        """Test packed (indices, values) sparse vectors survive serialization."""
+        vocabulary = {}
+        packed = pack_sparse_vector({"beta": 0.25, "alpha": 0.5}, vocabulary)
+        
+        assert vocabulary == {"beta": 0, "alpha": 1}
+        assert list(packed[0]) == [0, 1]
+        assert list(packed[1]) == [0.25, 0.5]
+        
+        record = ChunkRecord(
+            id="chunk_123_001",
+            text="Content",
+            metadata={"source_path": "data/test.pdf"},
+            sparse_vector=packed
+        )
+        
+        data = record.to_dict()
+        assert data["sparse_vector"] == {"indices": [0, 1], "values": [0.25, 0.5]}
+        
+        restored = ChunkRecord.from_dict(data)
+        assert list(restored.sparse_vector[0]) == [0, 1]
+        assert list(restored.sparse_vector[1]) == [0.25, 0.5]
+    
+    def test_chunk_record_from_chunks_batch(self):
+        """Test batch creation of ChunkRecords from Chunks."""
+        chunks = [
+            Chunk(id=f"chunk_{i}", text=f"Text {i}", metadata={"source_path": "data/test.pdf"})
+            for i in range(3)
+        ]
+        dense = [[0.1 * i, 0.2 * i] for i in range(3)]
+        sparse = [{"word": float(i)} for i in range(3)]
+        
+        records = ChunkRecord.from_chunks(chunks, dense, sparse)
+        
+        assert [r.id for r in records] == ["chunk_0", "chunk_1", "chunk_2"]
+        assert records[2].dense_vector == dense[2]
+        assert records[1].sparse_vector == {"word": 1.0}
+        assert records[0].metadata == chunks[0].metadata
+        assert records[0].metadata is not chunks[0].metadata
+        
+        owned = ChunkRecord.from_chunks(chunks, dense, own_metadata=True)
+        assert owned[0].metadata is chunks[0].metadata
+        assert owned[0].sparse_vector is None
+    
+    def test_chunk_record_from_chunks_fortran_matrix(self):
+        """Test from_chunks yields contiguous row views for a Fortran-ordered matrix."""
+        np = pytest.importorskip("numpy")
+        chunks = [
+            Chunk(id=f"c{i}", text="t", metadata={"source_path": "a.pdf"})
+            for i in range(3)
+        ]
+        matrix = np.asfortranarray(np.arange(12, dtype="float32").reshape(3, 4))
+        
+        records = ChunkRecord.from_chunks(chunks, matrix)
+        
+        assert records[1].dense_vector.flags.c_contiguous
+        assert records[1].dense_vector.tolist() == [4.0, 5.0, 6.0, 7.0]
+    
+    def test_chunk_record_from_chunks_length_mismatch(self):
+        """Test that from_chunks rejects mismatched vector counts."""
+        chunks = [Chunk(id="c1", text="t", metadata={"source_path": "a.pdf"})]
+        
+        with pytest.raises(ValueError, match="Expected 1 dense vectors"):
+            ChunkRecord.from_chunks(chunks, [[0.1], [0.2]])
+    
+    @pytest.mark.parametrize("encoder", ["orjson", "msgspec", "stdlib"])
+    def test_to_json_bytes_matches_to_dict(self, encoder, monkeypatch):
+        """Test to_json_bytes produces the JSON form of to_dict with each encoder."""
+        import json
+        import sys
+        from src.core.types import _json_encoder
+        
+        if encoder == "orjson":
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setitem(sys.modules, "orjson", None)
+            if encoder == "msgspec":
+                pytest.importorskip("msgspec")
+            else:
+                monkeypatch.setitem(sys.modules, "msgspec", None)
+        # The encoder is resolved once per process; re-resolve around this test
+        _json_encoder.cache_clear()
+        
+        metadata = {"source_path": "data/test.pdf", "title": "Café"}
+        chunk = Chunk(id="c1", text="Content", metadata=metadata, start_offset=0)
+        packed = ChunkRecord.from_chunk(
+            chunk, dense_vector=[0.5, 0.25],
+            sparse_vector=pack_sparse_vector({"a": 0.5}, {})
+        )
+        plain = ChunkRecord.from_chunk(chunk, sparse_vector={"a": 0.5})
+        
+        try:
+            for obj in (Document(id="d1", text="t", metadata=metadata), chunk, packed, plain):
+                assert json.loads(obj.to_json_bytes()) == obj.to_dict()
+        finally:
+            _json_encoder.cache_clear()
+    
+    @pytest.mark.parametrize("decoder", ["orjson", "msgspec", "stdlib"])
+    def test_from_json_bytes_round_trip(self, decoder, monkeypatch):
+        """Test from_json_bytes restores to_json_bytes output with each decoder."""
+        import sys
+        from src.core.types import _json_decoder
+        
+        if decoder == "orjson":
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setitem(sys.modules, "orjson", None)
+            if decoder == "msgspec":
+                pytest.importorskip("msgspec")
+            else:
+                monkeypatch.setitem(sys.modules, "msgspec", None)
+        _json_decoder.cache_clear()
+        
+        metadata = {"source_path": "data/test.pdf", "tags": ["a", {"b": [1, 2]}]}
+        doc = Document(id="d1", text="t", metadata=metadata)
+        chunk = Chunk(id="c1", text="Content", metadata=metadata, start_offset=0)
+        record = ChunkRecord.from_chunk(
+            chunk, dense_vector=[0.5, 0.25],
+            sparse_vector=pack_sparse_vector({"a": 0.5}, {})
+        )
+        
+        try:
+            assert Document.from_json_bytes(doc.to_json_bytes()) == doc
+            assert Chunk.from_json_bytes(chunk.to_json_bytes()) == chunk
+            restored = ChunkRecord.from_json_bytes(record.to_json_bytes())
+            assert restored == record
+            assert restored.dense_vector == [0.5, 0.25]
+            assert list(restored.sparse_vector[0]) == [0]
+        finally:
+            _json_decoder.cache_clear()
     
     def test_chunk_record_metadata_isolation(self):
         """Test that metadata is copied not shared between Chunk and ChunkRecord."""
@@ -240,6 +453,137 @@ class TestChunkRecord:
         assert record.metadata["key"] == "modified"
 
 
+class TestQuantizedVectors:
+    """Test int8 dense vector quantization."""
+    
+    def test_quantize_round_trip_within_half_scale(self):
+        """Test dequantized values are within scale / 2 of the original."""
+        np = pytest.importorskip("numpy")
+        vector = np.random.default_rng(0).normal(size=1024).astype(np.float32)
+        
+        quantized = quantize_dense_vector(vector)
+        
+        assert quantized.values.dtype == np.int8
+        assert quantized.values.nbytes == 1024
+        assert np.abs(quantized.values).max() == 127
+        restored = dequantize_dense_vector(quantized)
+        assert restored.dtype == np.float32
+        assert np.allclose(restored, vector, atol=quantized.scale / 2 + 1e-7)
+    
+    def test_quantize_zero_vector(self):
+        """Test an all-zero vector quantizes without dividing by zero."""
+        pytest.importorskip("numpy")
+        quantized = quantize_dense_vector([0.0, 0.0])
+        
+        assert quantized.values.tolist() == [0, 0]
+        assert dequantize_dense_vector(quantized).tolist() == [0.0, 0.0]
+    
+    def test_dequantize_plain_vector(self):
+        """Test unquantized vectors are returned as float32 arrays."""
+        np = pytest.importorskip("numpy")
+        assert dequantize_dense_vector([0.5, 0.25]).dtype == np.float32
+    
+    def test_from_chunk_int8(self):
+        """Test from_chunk(dtype='int8') stores a QuantizedVector."""
+        np = pytest.importorskip("numpy")
+        chunk = Chunk(id="c1", text="t", metadata={"source_path": "a.pdf"})
+        
+        record = ChunkRecord.from_chunk(chunk, dense_vector=[0.1, -0.5, 0.25], dtype="int8")
+        
+        assert isinstance(record.dense_vector, QuantizedVector)
+        assert np.allclose(
+            dequantize_dense_vector(record.dense_vector), [0.1, -0.5, 0.25],
+            atol=record.dense_vector.scale
+        )
+    
+    def test_quantized_serialization_round_trip(self):
+        """Test quantized vectors survive to_dict/from_dict and JSON."""
+        import json
+        np = pytest.importorskip("numpy")
+        chunk = Chunk(id="c1", text="t", metadata={"source_path": "a.pdf"})
+        record = ChunkRecord.from_chunk(chunk, dense_vector=[0.1, -0.5, 0.25], dtype="int8")
+        
+        data = record.to_dict()
+        assert set(data["dense_vector"]) == {"int8", "scale"}
+        assert json.loads(record.to_json_bytes()) == data
+        
+        restored = ChunkRecord.from_dict(json.loads(json.dumps(data)))
+        assert isinstance(restored.dense_vector, QuantizedVector)
+        assert restored.dense_vector.values.tolist() == record.dense_vector.values.tolist()
+        assert restored.dense_vector.scale == record.dense_vector.scale
+        assert np.allclose(
+            dequantize_dense_vector(restored.dense_vector),
+            dequantize_dense_vector(record.dense_vector)
+        )
+
+
+class TestChunkBatch:
+    """Test ChunkBatch column-oriented container."""
+    
+    @pytest.fixture
+    def chunks(self):
+        return [
+            Chunk(id=f"c{i}", text=f"text {i}", metadata={"source_path": "a.pdf", "i": i},
+                  start_offset=i * 10, end_offset=i * 10 + 6, source_ref="doc")
+            for i in range(3)
+        ]
+    
+    def test_from_chunks_columns(self, chunks):
+        """Test that each Chunk field becomes a column in chunk order."""
+        batch = ChunkBatch.from_chunks(chunks)
+        
+        assert len(batch) == 3
+        assert batch.ids == ["c0", "c1", "c2"]
+        assert batch.texts == ["text 0", "text 1", "text 2"]
+        assert batch.start_offsets == [0, 10, 20]
+        assert batch.source_refs == ["doc"] * 3
+        assert batch.metadatas[1] is chunks[1].metadata
+        assert batch.dense is None
+    
+    def test_to_chunks_round_trip(self, chunks):
+        """Test that to_chunks rebuilds equal Chunks."""
+        assert ChunkBatch.from_chunks(chunks).to_chunks() == chunks
+    
+    def test_dense_vectors_stacked(self, chunks):
+        """Test that dense vectors become one contiguous matrix."""
+        np = pytest.importorskip("numpy")
+        batch = ChunkBatch.from_chunks(chunks, dense_vectors=[[0.1, 0.2]] * 3)
+        
+        assert batch.dense.shape == (3, 2)
+        assert batch.dense.dtype == np.float32
+        assert batch.dense.flags.c_contiguous
+    
+    def test_to_records_uses_row_views(self, chunks):
+        """Test that records reference rows of the dense matrix."""
+        np = pytest.importorskip("numpy")
+        batch = ChunkBatch.from_chunks(
+            chunks, dense_vectors=np.ones((3, 4), dtype=np.float32),
+            sparse_vectors=[{"a": 1.0}] * 3
+        )
+        
+        records = batch.to_records()
+        
+        assert [r.id for r in records] == batch.ids
+        assert records[2].dense_vector.base is batch.dense
+        assert records[0].sparse_vector == {"a": 1.0}
+        assert records[0].metadata == chunks[0].metadata
+        assert records[0].metadata is not chunks[0].metadata
+    
+    def test_to_records_requires_dense(self, chunks):
+        """Test that to_records needs embeddings."""
+        with pytest.raises(ValueError, match="no dense vectors"):
+            ChunkBatch.from_chunks(chunks).to_records()
+    
+    def test_mismatched_columns_raise(self, chunks):
+        """Test that column and vector lengths are validated."""
+        pytest.importorskip("numpy")
+        with pytest.raises(ValueError, match="Expected 3 dense vectors"):
+            ChunkBatch.from_chunks(chunks, dense_vectors=[[0.1]] * 2)
+        with pytest.raises(ValueError, match="same length"):
+            ChunkBatch(ids=["a"], texts=[], metadatas=[], start_offsets=[],
+                       end_offsets=[], source_refs=[])
+
+
 class TestMultimodalSupport:
     """Test multimodal image support according to C1 specification."""
     
@@ -395,6 +739,21 @@ class TestMultimodalSupport:
             metadata={"source_path": "data/test.txt", "images": []}
         )
         assert doc2.metadata["images"] == []
+    
+    def test_image_offset_index_range_lookup(self):
+        """Test ImageOffsetIndex returns images whose placeholder starts in a range."""
+        images = [
+            {"id": "img_c", "text_offset": 300, "text_length": 20},
+            {"id": "img_a", "text_offset": 10, "text_length": 20},
+            {"id": "img_b", "text_offset": 150, "text_length": 20},
+            {"id": "img_x", "path": "no_offset.png"},
+        ]
+        index = ImageOffsetIndex(images)
+        
+        assert len(index) == 3
+        assert [img["id"] for img in index.in_range(0, 200)] == ["img_a", "img_b"]
+        assert [img["id"] for img in index.in_range(150, 300)] == ["img_b"]
+        assert index.in_range(301, 1000) == []
 
 
 class TestMetadataConventions:
@@ -481,3 +840,126 @@ class TestMetadataConventions:
         assert record.metadata["title"] == doc.metadata["title"]
         assert record.metadata["chunk_index"] == 0
         assert record.metadata["summary"] == "Introduction section"
+    
+    def test_to_dict_metadata_isolation(self):
+        """Test that mutating to_dict output does not affect the source object."""
+        record = ChunkRecord(
+            id="chunk_123",
+            text="Content",
+            metadata={"source_path": "data/test.pdf", "key": "original"},
+            dense_vector=[0.1, 0.2, 0.3]
+        )
+        
+        data = record.to_dict()
+        data["metadata"]["key"] = "modified"
+        
+        assert record.metadata["key"] == "original"
+        assert data["dense_vector"] == [0.1, 0.2, 0.3]
+    
+    def test_to_dict_without_metadata_copy(self):
+        """Test that copy_metadata=False shares the metadata dict."""
+        metadata = {"source_path": "data/test.pdf"}
+        for obj in (
+            Document(id="d1", text="t", metadata=metadata),
+            Chunk(id="c1", text="t", metadata=metadata),
+            ChunkRecord(id="r1", text="t", metadata=metadata),
+        ):
+            assert obj.to_dict(copy_metadata=False)["metadata"] is obj.metadata
+            assert obj.to_dict()["metadata"] is not obj.metadata
+    
+    def test_types_use_slots(self):
+        """Test that core types are slotted (no per-instance __dict__)."""
+        doc = Document(id="d1", text="t", metadata={"source_path": "a.pdf"})
+        chunk = Chunk(id="c1", text="t", metadata={"source_path": "a.pdf"})
+        record = ChunkRecord(id="r1", text="t", metadata={"source_path": "a.pdf"})
+        
+        for obj in (doc, chunk, record):
+            assert not hasattr(obj, "__dict__")
+    
+    def test_from_dict_defaults_missing_fields(self):
+        """Test that from_dict fills omitted optional fields with defaults."""
+        chunk = Chunk.from_dict({
+            "id": "chunk_123",
+            "text": "Content",
+            "metadata": {"source_path": "data/test.pdf"}
+        })
+        
+        assert chunk.start_offset is None
+        assert chunk.end_offset is None
+        assert chunk.source_ref is None
+        
+        record = ChunkRecord.from_dict({"id": "r1", "text": "t"})
+        assert record.metadata == {}
+        assert record.dense_vector is None
+    
+    def test_from_dict_interns_metadata_keys(self):
+        """Test that deserialized metadata keys are interned strings."""
+        import sys
+        
+        key = "".join(["source", "_path"])  # runtime-built, not interned
+        data = {"id": "d1", "text": "t", "metadata": {key: "data/test.pdf"}}
+        
+        doc = Document.from_dict(data)
+        
+        restored_key = next(iter(doc.metadata))
+        assert restored_key is sys.intern("source_path")
+        assert doc.metadata["source_path"] == "data/test.pdf"
+    
+    def test_source_path_none_rejected(self):
+        """Test that a None source_path fails validation like a missing one."""
+        for cls in (Document, Chunk, ChunkRecord):
+            with pytest.raises(ValueError, match="source_path"):
+                cls(id="x", text="t", metadata={"source_path": None})
+    
+    def test_types_are_frozen_and_picklable(self):
+        """Test that core types are immutable and survive a pickle roundtrip."""
+        import dataclasses
+        import pickle
+        
+        chunk = Chunk(id="c1", text="Content", metadata={"source_path": "a.pdf"}, start_offset=0)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            chunk.text = "changed"
+        
+        updated = dataclasses.replace(chunk, text="changed")
+        assert updated.text == "changed"
+        assert chunk.text == "Content"
+        
+        record = ChunkRecord.from_chunk(chunk, dense_vector=[0.1, 0.2])
+        for obj in (Document(id="d1", text="t", metadata={"source_path": "a.pdf"}), chunk, record):
+            assert pickle.loads(pickle.dumps(obj)) == obj
+    
+    def test_types_hash_by_id(self):
+        """Test that core types are hashable by id for dedup sets and dict keys."""
+        metadata = {"source_path": "a.pdf"}
+        chunk = Chunk(id="c1", text="t", metadata=metadata)
+        duplicate = Chunk(id="c1", text="t", metadata=dict(metadata))
+        record = ChunkRecord.from_chunk(chunk, dense_vector=[0.1])
+        
+        assert hash(chunk) == hash("c1")
+        assert len({chunk, duplicate}) == 1
+        assert {record: 1}[record] == 1
+        assert hash(Document(id="d1", text="t", metadata=metadata)) == hash("d1")
+    
+    def test_records_with_array_vectors_dedup_in_sets(self):
+        """Test that records with NumPy vectors compare array-aware."""
+        np = pytest.importorskip("numpy")
+        chunk = Chunk(id="c1", text="t", metadata={"source_path": "a.pdf"})
+        first = ChunkRecord.from_chunk(chunk, dense_vector=np.array([0.1, 0.2]))
+        same = ChunkRecord.from_chunk(chunk, dense_vector=np.array([0.1, 0.2]))
+        reembedded = ChunkRecord.from_chunk(chunk, dense_vector=np.array([0.3, 0.4]))
+        
+        assert first == same
+        assert first == ChunkRecord.from_chunk(chunk, dense_vector=[0.1, 0.2])
+        assert first != reembedded
+        assert len({first, same, reembedded}) == 2
+    
+    def test_records_compare_packed_and_quantized_vectors(self):
+        """Test that tuple-shaped vectors holding arrays compare by value."""
+        pytest.importorskip("numpy")
+        chunk = Chunk(id="c1", text="t", metadata={"source_path": "a.pdf"})
+        sparse = pack_sparse_vector({"a": 0.5}, {})
+        first = ChunkRecord.from_chunk(chunk, [0.5, -0.25], sparse, dtype="int8")
+        second = ChunkRecord.from_chunk(chunk, [0.5, -0.25], sparse, dtype="int8")
+        
+        assert first == second
+        assert first != ChunkRecord.from_chunk(chunk, [0.5, 0.25], sparse, dtype="int8")
@@ -12,6 +12,7 @@ Tests cover:
 import hashlib
 import sqlite3
 import tempfile
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import pytest
@@ -19,6 +20,7 @@ import pytest
 from src.libs.loader.file_integrity import (
     FileIntegrityChecker,
     SQLiteIntegrityChecker,
+    timestamp_to_datetime,
 )
 
 
@@ -84,6 +86,102 @@ class TestSQLiteIntegrityChecker:
         finally:
             conn.close()
     
+    def test_connection_reused_with_pragmas(self, checker, temp_file):
+        """Test that calls share one connection configured once."""
+        file_hash = checker.compute_sha256(temp_file)
+        conn = checker._conn
+        
+        checker.mark_success(file_hash, temp_file)
+        checker.should_skip(file_hash)
+        
+        assert checker._conn is conn
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 60000
+    
+    def test_wal_switch_only_on_new_database(self, temp_db, monkeypatch):
+        """Test that WAL and page size are set on creation, not on every open."""
+        statements = []
+        real_connect = sqlite3.connect
+        
+        def traced_connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            conn.set_trace_callback(statements.append)
+            return conn
+        
+        monkeypatch.setattr(sqlite3, "connect", traced_connect)
+        
+        checker = SQLiteIntegrityChecker(db_path=temp_db)
+        assert "PRAGMA journal_mode=WAL" in statements
+        assert checker._conn.execute("PRAGMA page_size").fetchone()[0] == 4096
+        checker.close()
+        
+        statements.clear()
+        SQLiteIntegrityChecker(db_path=temp_db)
+        assert "PRAGMA journal_mode=WAL" not in statements
+        assert "PRAGMA synchronous=NORMAL" in statements
+    
+    def test_close_then_reuse_reconnects(self, checker, temp_file):
+        """Test that a closed checker reconnects on the next call."""
+        file_hash = checker.compute_sha256(temp_file)
+        checker.mark_success(file_hash, temp_file)
+        
+        checker.close()
+        assert checker._conn is None
+        
+        assert checker.should_skip(file_hash) is True
+        assert checker._conn is not None
+    
+    def test_hash_stored_as_blob(self, checker, temp_file):
+        """Test that SHA256 keys are stored as 32 raw bytes."""
+        file_hash = checker.compute_sha256(temp_file)
+        checker.mark_success(file_hash, temp_file)
+        
+        stored = checker._conn.execute("SELECT file_hash FROM ingestion_history").fetchone()[0]
+        assert stored == bytes.fromhex(file_hash)
+    
+    def test_text_hash_table_migrated(self, temp_db):
+        """Test that a table with hex TEXT keys is rebuilt with BLOB keys."""
+        conn = sqlite3.connect(temp_db)
+        try:
+            conn.execute("""
+                CREATE TABLE ingestion_history (
+                    file_hash TEXT PRIMARY KEY,
+                    file_path TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    collection TEXT,
+                    error_msg TEXT,
+                    processed_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX idx_status ON ingestion_history(status)")
+            conn.execute(
+                "INSERT INTO ingestion_history VALUES (?, '/a.pdf', 'success', 'docs', NULL, ?, ?)",
+                ("ab" * 32, "2024-01-02T03:04:05.000006+00:00", "2024-01-02T03:04:05.000006+00:00")
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        
+        checker = SQLiteIntegrityChecker(db_path=temp_db)
+        
+        assert checker.should_skip("ab" * 32) is True
+        columns = checker._conn.execute("PRAGMA table_info(ingestion_history)").fetchall()
+        assert columns[0][2] == "BLOB"
+        processed_at = checker._conn.execute(
+            "SELECT processed_at FROM ingestion_history"
+        ).fetchone()[0]
+        assert timestamp_to_datetime(processed_at) == datetime(
+            2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc
+        )
+        indexes = {
+            row[0] for row in checker._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+            )
+        }
+        assert indexes == {"idx_status_hash", "idx_path", "idx_collection"}
+        assert [col[1] for col in columns][-2:] == ["mtime_ns", "size"]
+    
     def test_compute_sha256_consistency(self, checker, temp_file):
         """Test that computing hash twice gives same result."""
         hash1 = checker.compute_sha256(temp_file)
@@ -110,6 +208,11 @@ class TestSQLiteIntegrityChecker:
         with pytest.raises(FileNotFoundError, match="File not found"):
             checker.compute_sha256("/nonexistent/file.txt")
     
+    def test_compute_sha256_path_under_file_not_found(self, checker, temp_file):
+        """Test that a path below a regular file is reported as not found."""
+        with pytest.raises(FileNotFoundError, match="File not found"):
+            checker.compute_sha256(str(Path(temp_file) / "child.txt"))
+    
     def test_compute_sha256_directory_raises_error(self, checker, temp_db):
         """Test that computing hash of directory raises error."""
         dir_path = Path(temp_db).parent
@@ -147,7 +250,7 @@ class TestSQLiteIntegrityChecker:
         try:
             cursor = conn.execute(
                 "SELECT collection FROM ingestion_history WHERE file_hash = ?",
-                (file_hash,)
+                (bytes.fromhex(file_hash),)
             )
             result = cursor.fetchone()
             assert result is not None
@@ -172,13 +275,67 @@ class TestSQLiteIntegrityChecker:
         try:
             cursor = conn.execute(
                 "SELECT COUNT(*) FROM ingestion_history WHERE file_hash = ?",
-                (file_hash,)
+                (bytes.fromhex(file_hash),)
             )
             count = cursor.fetchone()[0]
             assert count == 1
         finally:
             conn.close()
     
+    def test_should_skip_cached_until_marked(self, checker, temp_file, monkeypatch):
+        """Test that repeated checks are cached and marks invalidate them."""
+        file_hash = checker.compute_sha256(temp_file)
+        assert checker.should_skip(file_hash) is False
+        
+        # Cached: the row changing behind the checker's back is not seen
+        conn = sqlite3.connect(checker.db_path)
+        try:
+            conn.execute(
+                "INSERT INTO ingestion_history (file_hash, file_path, status, processed_at, updated_at) "
+                "VALUES (?, ?, 'success', 0, 0)",
+                (bytes.fromhex(file_hash), temp_file)
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        assert checker.should_skip(file_hash) is False
+        
+        checker.mark_success(file_hash, temp_file)
+        assert checker.should_skip(file_hash) is True
+        checker.mark_failed(file_hash, temp_file, "Retry")
+        assert checker.should_skip(file_hash) is False
+        
+        monkeypatch.setattr(SQLiteIntegrityChecker, "SKIP_CACHE_SIZE", 2)
+        for i in range(3):
+            checker.should_skip(f"{i:064x}")
+        assert list(checker._skip_cache) == [f"{1:064x}", f"{2:064x}"]
+    
+    def test_quick_skip_unchanged_file(self, checker, temp_file):
+        """Test that quick_skip matches on path, mtime and size after a success."""
+        import os
+        
+        assert checker.quick_skip(temp_file) is False
+        
+        file_hash = checker.compute_sha256(temp_file)
+        checker.mark_success(file_hash, temp_file)
+        assert checker.quick_skip(temp_file) is True
+        
+        # Same size, different mtime: must be re-hashed
+        st = os.stat(temp_file)
+        os.utime(temp_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert checker.quick_skip(temp_file) is False
+        
+        assert checker.quick_skip("/nonexistent/file.txt") is False
+    
+    def test_quick_skip_requires_hash_from_this_content(self, checker, temp_file):
+        """Test that marks without a matching hash record no stat."""
+        checker.mark_success("a" * 64, temp_file)
+        assert checker.quick_skip(temp_file) is False
+        
+        file_hash = checker.compute_sha256(temp_file)
+        checker.mark_failed(file_hash, temp_file, "Test error")
+        assert checker.quick_skip(temp_file) is False
+    
     def test_mark_failed_does_not_skip(self, checker, temp_file):
         """Test that marking as failed does not cause skip."""
         file_hash = checker.compute_sha256(temp_file)
@@ -200,7 +357,7 @@ class TestSQLiteIntegrityChecker:
         try:
             cursor = conn.execute(
                 "SELECT error_msg, status FROM ingestion_history WHERE file_hash = ?",
-                (file_hash,)
+                (bytes.fromhex(file_hash),)
             )
             result = cursor.fetchone()
             assert result is not None
@@ -226,7 +383,7 @@ class TestSQLiteIntegrityChecker:
         try:
             cursor = conn.execute(
                 "SELECT error_msg, status FROM ingestion_history WHERE file_hash = ?",
-                (file_hash,)
+                (bytes.fromhex(file_hash),)
             )
             result = cursor.fetchone()
             assert result is not None
@@ -245,7 +402,7 @@ class TestSQLiteIntegrityChecker:
         try:
             cursor = conn.execute(
                 "SELECT processed_at, updated_at FROM ingestion_history WHERE file_hash = ?",
-                (file_hash,)
+                (bytes.fromhex(file_hash),)
             )
             result = cursor.fetchone()
             assert result is not None
@@ -254,6 +411,94 @@ class TestSQLiteIntegrityChecker:
         finally:
             conn.close()
     
+    def test_remark_preserves_processed_at(self, checker, temp_file):
+        """Test that later marks keep processed_at and update updated_at."""
+        file_hash = checker.compute_sha256(temp_file)
+        
+        checker.mark_failed(file_hash, temp_file, "Initial error")
+        
+        conn = sqlite3.connect(checker.db_path)
+        try:
+            conn.execute(
+                "UPDATE ingestion_history SET processed_at = 1, updated_at = 1"
+            )
+            conn.commit()
+            
+            checker.mark_success(file_hash, temp_file)
+            
+            result = conn.execute(
+                "SELECT processed_at, updated_at FROM ingestion_history WHERE file_hash = ?",
+                (bytes.fromhex(file_hash),)
+            ).fetchone()
+            assert result[0] == 1
+            assert result[1] > 1
+        finally:
+            conn.close()
+    
+    def test_mark_failed_keeps_collection(self, checker, temp_file):
+        """Test that a failure after a success keeps the stored collection."""
+        file_hash = checker.compute_sha256(temp_file)
+        
+        checker.mark_success(file_hash, temp_file, collection="docs")
+        checker.mark_failed(file_hash, temp_file, "Re-ingest failed")
+        
+        conn = sqlite3.connect(checker.db_path)
+        try:
+            result = conn.execute(
+                "SELECT status, collection FROM ingestion_history WHERE file_hash = ?",
+                (bytes.fromhex(file_hash),)
+            ).fetchone()
+            assert result == ("failed", "docs")
+        finally:
+            conn.close()
+    
+    def test_mark_batches(self, checker, monkeypatch):
+        """Test that batch marks write every record across several commits."""
+        monkeypatch.setattr("src.libs.loader.file_integrity._MARK_BATCH_SIZE", 2)
+        
+        checker.mark_success_batch(
+            [(f"{i:064x}", f"/docs/{i}.pdf", "docs") for i in range(5)]
+        )
+        checker.mark_failed_batch([(f"{3:064x}", "/docs/3.pdf", "parse error")])
+        
+        assert [checker.should_skip(f"{i:064x}") for i in range(5)] == [
+            True, True, True, False, True
+        ]
+        assert checker._conn.in_transaction is False
+        # A full batch was written, so planner statistics exist
+        assert checker._conn.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+    
+    def test_status_scan_uses_covering_index(self, checker):
+        """Test that status filters are served by the composite index."""
+        plan = checker._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT file_hash FROM ingestion_history WHERE status = 'success'"
+        ).fetchall()
+        
+        assert any("COVERING INDEX idx_status_hash" in row[-1] for row in plan)
+    
+    def test_mark_batch_failure_rolls_back(self, checker):
+        """Test that a failed batch raises RuntimeError and leaves no open transaction."""
+        with pytest.raises(RuntimeError, match="Failed to mark success for 2 files"):
+            checker.mark_success_batch([("a" * 64, "/a.pdf", None), ("b" * 64, None, None)])
+        
+        assert checker._conn.in_transaction is False
+        assert checker.should_skip("a" * 64) is False
+    
+    def test_timestamps_are_integer_nanoseconds(self, checker, temp_file):
+        """Test that timestamps are stored as integers and convert back to UTC."""
+        before = datetime.now(timezone.utc)
+        file_hash = checker.compute_sha256(temp_file)
+        checker.mark_success(file_hash, temp_file)
+        
+        processed_at, updated_at = checker._conn.execute(
+            "SELECT processed_at, updated_at FROM ingestion_history"
+        ).fetchone()
+        
+        assert isinstance(processed_at, int)
+        assert processed_at == updated_at
+        moment = timestamp_to_datetime(processed_at)
+        assert before - timedelta(seconds=1) <= moment <= datetime.now(timezone.utc)
+    
     def test_multiple_files_independent(self, checker):
         """Test that multiple files can be tracked independently."""
         # Create multiple temp files
@@ -349,6 +594,97 @@ class TestHashConsistency:
         finally:
             Path(empty_file).unlink(missing_ok=True)
     
+    def test_chunked_fallback_matches_file_digest(self, checker, monkeypatch):
+        """Test that the pre-3.11 chunked path yields the same hash."""
+        # Spans several read chunks and ends on a partial one
+        data = bytes(range(256)) * 10000 + b"tail"
+        
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+            f.write(data)
+            data_file = f.name
+        
+        try:
+            monkeypatch.setattr(
+                "src.libs.loader.file_integrity._file_digest", None
+            )
+            monkeypatch.setattr(
+                "src.libs.loader.file_integrity._MMAP_HASH_THRESHOLD", len(data) + 1
+            )
+            assert checker.compute_sha256(data_file) == hashlib.sha256(data).hexdigest()
+        finally:
+            Path(data_file).unlink(missing_ok=True)
+    
+    @pytest.mark.parametrize("threshold", [1, 1 << 40])
+    def test_mapped_and_streamed_hash_agree(self, checker, monkeypatch, threshold):
+        """Test that memory-mapped and streamed hashing give the same result."""
+        monkeypatch.setattr("src.libs.loader.file_integrity._MMAP_HASH_THRESHOLD", threshold)
+        data = bytes(range(256)) * 4096 + b"tail"
+        
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+            f.write(data)
+            data_file = f.name
+        
+        try:
+            assert checker.compute_sha256(data_file) == hashlib.sha256(data).hexdigest()
+        finally:
+            Path(data_file).unlink(missing_ok=True)
+    
+    @pytest.mark.parametrize("count", [3, 40])
+    def test_compute_sha256_many(self, checker, tmp_path, count):
+        """Test that batch hashing matches per-file hashing, sequential or pooled."""
+        paths = []
+        for i in range(count):
+            path = tmp_path / f"file_{i}.txt"
+            path.write_bytes(f"content {i}".encode())
+            paths.append(str(path))
+        
+        result = checker.compute_sha256_many(paths + paths[:1])
+        
+        assert list(result) == paths
+        assert result == {path: checker.compute_sha256(path) for path in paths}
+    
+    def test_compute_sha256_many_missing_file(self, checker, tmp_path):
+        """Test that a missing file in the batch raises."""
+        with pytest.raises(FileNotFoundError):
+            checker.compute_sha256_many([str(tmp_path / "missing.txt")])
+    
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_parallel_hash_matches_chained_definition(self, checker, workers):
+        """Test that the parallel hash folds chunk digests in file order."""
+        chunk_size = 4096
+        data = bytes(range(256)) * 100  # 25600 bytes, last chunk partial
+        
+        with tempfile.NamedTemporaryFile(mode="wb", delete=False) as f:
+            f.write(data)
+            data_file = f.name
+        
+        try:
+            chained = b""
+            for start in range(0, len(data), chunk_size):
+                chunk_digest = hashlib.sha256(data[start:start + chunk_size]).digest()
+                chained = hashlib.sha256(chained + chunk_digest).digest()
+            
+            result = checker.compute_sha256_parallel(
+                data_file, chunk_size=chunk_size, workers=workers
+            )
+            
+            assert result == f"sha256-chain:{chunk_size}:{chained.hex()}"
+            assert result != checker.compute_sha256(data_file)
+        finally:
+            Path(data_file).unlink(missing_ok=True)
+    
+    def test_parallel_hash_empty_file(self, checker):
+        """Test that the parallel hash handles an empty file."""
+        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+            empty_file = f.name
+        
+        try:
+            expected = hashlib.sha256(hashlib.sha256(b"").digest()).hexdigest()
+            result = checker.compute_sha256_parallel(empty_file, chunk_size=1024)
+            assert result == f"sha256-chain:1024:{expected}"
+        finally:
+            Path(empty_file).unlink(missing_ok=True)
+    
     def test_same_content_different_files(self, checker):
         """Test that files with same content produce same hash."""
         content = "Identical content"
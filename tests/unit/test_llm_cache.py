@@ -0,0 +1,241 @@
+"""Unit tests for LLMResponseCache and its use in ChunkRefiner."""
+
+import asyncio
+import sqlite3
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from src.core.types import Chunk
+from src.ingestion.transform.chunk_refiner import ChunkRefiner
+from src.ingestion.transform.llm_cache import LLMResponseCache
+from src.libs.llm.base_llm import BaseLLM, ChatResponse, Message
+
+
+class CountingLLM(BaseLLM):
+    """LLM stub that counts calls and answers with a fixed prefix."""
+
+    def __init__(self, temperature=0.0, model="test-model"):
+        self.model = model
+        self.default_temperature = temperature
+        self.default_max_tokens = 100
+        self.calls = 0
+
+    def chat(self, messages, trace=None, **kwargs):
+        self.calls += 1
+        return ChatResponse(content=f"refined {self.calls}", model=self.model)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "cache" / "llm.db"))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def llm_settings():
+    return SimpleNamespace(ingestion=SimpleNamespace(chunk_refiner={'use_llm': True}))
+
+
+def make_chunk(text="Some  noisy   text"):
+    return Chunk(id="c1", text=text, metadata={"source_path": "t.pdf"})
+
+
+MESSAGES = [Message(role="user", content="Refine: text")]
+
+
+class TestCacheKey:
+    """Test cache key construction."""
+
+    def test_same_request_same_key(self):
+        key1 = LLMResponseCache.cache_key("m", MESSAGES, 0.0)
+        key2 = LLMResponseCache.cache_key("m", list(MESSAGES), 0.0)
+        assert key1 == key2
+        assert len(key1) == 32
+
+    @pytest.mark.parametrize("kwargs", [
+        {"model": "other"},
+        {"temperature": 0.05},
+        {"max_tokens": 50},
+        {"provider": "OtherLLM"},
+        {"messages": [Message(role="user", content="Refine: other")]},
+    ])
+    def test_request_parameters_change_key(self, kwargs):
+        base = {"model": "m", "messages": MESSAGES, "temperature": 0.0}
+        assert LLMResponseCache.cache_key(**{**base, **kwargs}) != LLMResponseCache.cache_key(**base)
+
+    def test_high_temperature_not_cacheable(self):
+        assert LLMResponseCache.cache_key("m", MESSAGES, 0.7) is None
+
+    def test_unknown_parameters_not_cacheable(self):
+        assert LLMResponseCache.cache_key(None, MESSAGES, 0.0) is None
+        assert LLMResponseCache.cache_key("m", MESSAGES, Mock()) is None
+
+
+class TestLLMResponseCache:
+    """Test cache storage, expiry and eviction."""
+
+    def test_miss_then_hit(self, cache):
+        key = LLMResponseCache.cache_key("m", MESSAGES, 0.0)
+        assert cache.get(key) is None
+        cache.set(key, "answer")
+        assert cache.get(key) == "answer"
+
+    def test_none_key_ignored(self, cache):
+        cache.set(None, "answer")
+        assert cache.get(None) is None
+
+    def test_persists_across_instances(self, tmp_path):
+        db_path = str(tmp_path / "llm.db")
+        key = LLMResponseCache.cache_key("m", MESSAGES, 0.0)
+        first = LLMResponseCache(db_path)
+        first.set(key, "answer")
+        first.close()
+
+        second = LLMResponseCache(db_path)
+        assert second.get(key) == "answer"
+        second.close()
+
+    def test_expired_entry_not_returned(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm.db"), ttl=10)
+        key = LLMResponseCache.cache_key("m", MESSAGES, 0.0)
+        with patch("src.ingestion.transform.llm_cache.time.time", return_value=1000.0):
+            cache.set(key, "answer")
+        with patch("src.ingestion.transform.llm_cache.time.time", return_value=1011.0):
+            assert cache.get(key) is None
+        cache.close()
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm.db"), max_entries=2)
+        keys = [
+            LLMResponseCache.cache_key("m", [Message(role="user", content=str(i))], 0.0)
+            for i in range(3)
+        ]
+        clock = iter(range(1000, 1100))
+        with patch("src.ingestion.transform.llm_cache.time.time", side_effect=lambda: next(clock)):
+            cache.set(keys[0], "a")
+            cache.set(keys[1], "b")
+            assert cache.get(keys[0]) == "a"  # keys[1] is now least recently used
+            cache.set(keys[2], "c")
+
+            assert cache.get(keys[0]) == "a"
+            assert cache.get(keys[1]) is None
+            assert cache.get(keys[2]) == "c"
+        cache.close()
+
+    def test_memory_hit_skips_database(self, cache):
+        key = LLMResponseCache.cache_key("m", MESSAGES, 0.0)
+        cache.set(key, "answer")
+
+        with patch.object(cache, "_connection", side_effect=AssertionError("database used")):
+            assert cache.get(key) == "answer"
+
+    def test_database_hit_loaded_into_memory(self, tmp_path):
+        db_path = str(tmp_path / "llm.db")
+        key = LLMResponseCache.cache_key("m", MESSAGES, 0.0)
+        first = LLMResponseCache(db_path)
+        first.set(key, "answer")
+        first.close()
+
+        second = LLMResponseCache(db_path, memory_entries=0)
+        assert second.get(key) == "answer"
+        assert not second._memory
+        third = LLMResponseCache(db_path)
+        assert third.get(key) == "answer"
+        assert key in third._memory
+        second.close()
+        third.close()
+
+    def test_memory_hits_count_for_eviction(self, tmp_path):
+        cache = LLMResponseCache(str(tmp_path / "llm.db"), max_entries=2)
+        keys = [
+            LLMResponseCache.cache_key("m", [Message(role="user", content=str(i))], 0.0)
+            for i in range(3)
+        ]
+        clock = iter(range(1000, 1100))
+        with patch("src.ingestion.transform.llm_cache.time.time", side_effect=lambda: next(clock)):
+            cache.set(keys[0], "a")
+            cache.set(keys[1], "b")
+            assert cache.get(keys[0]) == "a"  # served from memory
+            cache.set(keys[2], "c")
+        cache.close()
+
+        # The database evicted keys[1], not the recently read keys[0]
+        reopened = LLMResponseCache(cache.db_path, memory_entries=0)
+        with patch("src.ingestion.transform.llm_cache.time.time", return_value=1100.0):
+            assert reopened.get(keys[0]) == "a"
+            assert reopened.get(keys[1]) is None
+        reopened.close()
+
+    def test_storage_error_is_a_miss(self, cache):
+        key = LLMResponseCache.cache_key("m", MESSAGES, 0.0)
+
+        with patch.object(cache, "_connection", side_effect=sqlite3.OperationalError("locked")):
+            cache.set(key, "answer")
+            assert cache.get(key) is None
+
+
+class TestChunkRefinerCache:
+    """Test ChunkRefiner skips the LLM on cache hits."""
+
+    def test_repeat_refinement_served_from_cache(self, llm_settings, cache):
+        llm = CountingLLM()
+        refiner = ChunkRefiner(llm_settings, llm=llm, cache=cache)
+        refiner._prompt_template = "Refine: {text}"
+
+        first = refiner.transform([make_chunk()])
+        second = ChunkRefiner(llm_settings, llm=llm, cache=cache)
+        second._prompt_template = "Refine: {text}"
+        result = second.transform([make_chunk()])
+
+        assert llm.calls == 1
+        assert result[0].text == first[0].text == "refined 1"
+        assert result[0].metadata['refined_by'] == 'llm'
+
+    def test_atransform_uses_cache(self, llm_settings, cache):
+        llm = CountingLLM()
+        refiner = ChunkRefiner(llm_settings, llm=llm, cache=cache)
+        refiner._prompt_template = "Refine: {text}"
+
+        refiner.transform([make_chunk()])
+        result = asyncio.run(refiner.atransform([make_chunk()]))
+
+        assert llm.calls == 1
+        assert result[0].text == "refined 1"
+
+    def test_high_temperature_bypasses_cache(self, llm_settings, cache):
+        llm = CountingLLM(temperature=0.7)
+        refiner = ChunkRefiner(llm_settings, llm=llm, cache=cache)
+        refiner._prompt_template = "Refine: {text}"
+
+        refiner.transform([make_chunk()])
+        refiner.transform([make_chunk()])
+
+        assert llm.calls == 2
+
+    def test_failures_not_cached(self, llm_settings, cache):
+        llm = CountingLLM()
+        refiner = ChunkRefiner(llm_settings, llm=llm, cache=cache)
+        refiner._prompt_template = "Refine: {text}"
+
+        with patch.object(llm, "chat", side_effect=RuntimeError("API error")):
+            failed = refiner.transform([make_chunk()])
+        result = refiner.transform([make_chunk()])
+
+        assert failed[0].metadata['refined_by'] == 'rule'
+        assert result[0].metadata['refined_by'] == 'llm'
+        assert llm.calls == 1
+
+    def test_cache_created_from_settings(self, llm_settings, tmp_path):
+        db_path = str(tmp_path / "refiner.db")
+        llm_settings.ingestion.chunk_refiner = {'use_llm': True, 'cache_path': db_path}
+
+        refiner = ChunkRefiner(llm_settings, llm=CountingLLM())
+
+        assert isinstance(refiner._cache, LLMResponseCache)
+        assert refiner._cache.db_path == db_path
+
+    def test_no_cache_by_default(self, llm_settings):
+        refiner = ChunkRefiner(llm_settings, llm=CountingLLM())
+        assert refiner._cache is None
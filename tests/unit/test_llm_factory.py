@@ -96,8 +96,9 @@ class TestLLMFactory:
     """Test suite for LLMFactory."""
     
     def setup_method(self):
-        """Clear provider registry before each test."""
+        """Clear provider registry and instance cache before each test."""
         LLMFactory._PROVIDERS.clear()
+        LLMFactory.clear_instance_cache()
     
     def test_register_provider_success(self):
         """Test successful provider registration."""
@@ -146,6 +147,34 @@ class TestLLMFactory:
         
         assert isinstance(llm, FakeLLM)
     
+    def test_loaded_provider_name_is_normalized(self, tmp_path):
+        """Test settings store the provider lowercased and interned."""
+        import sys
+        
+        config_file = tmp_path / "settings.yaml"
+        config_file.write_text(create_test_config(provider="FAKE"))
+        
+        settings = load_settings(str(config_file))
+        
+        assert settings.llm.provider == "fake"
+        assert settings.llm.provider is sys.intern("fake")
+    
+    def test_create_reuses_instance_for_same_settings(self, tmp_path):
+        """Test factory returns the cached instance for identical calls."""
+        LLMFactory.register_provider("fake", FakeLLM)
+        
+        config_file = tmp_path / "settings.yaml"
+        config_file.write_text(create_test_config(provider="fake"))
+        
+        settings = load_settings(str(config_file))
+        llm = LLMFactory.create(settings)
+        
+        assert LLMFactory.create(settings) is llm
+        assert LLMFactory.create(settings, temperature=0.5) is not llm
+        
+        LLMFactory.register_provider("other", FakeLLM)
+        assert LLMFactory.create(settings) is not llm
+    
     def test_create_unknown_provider(self, tmp_path):
         """Test factory raises clear error for unknown provider."""
         config_file = tmp_path / "settings.yaml"
@@ -237,6 +266,38 @@ class TestBaseLLM:
         
         with pytest.raises(ValueError, match="not a Message instance"):
             llm.validate_messages(messages)
+    
+    def test_to_api_messages_validates_and_converts(self):
+        """Test to_api_messages validates and converts in one call."""
+        llm = FakeLLM(settings=None)
+        
+        assert llm.to_api_messages([Message(role="user", content="Hi")]) == [
+            {"role": "user", "content": "Hi"}
+        ]
+        with pytest.raises(ValueError, match="Must be one of: assistant, system, user"):
+            llm.to_api_messages([Message(role="bot", content="Hi")])
+    
+    def test_message_api_dict_memoized_and_hashable(self):
+        """Test Message is frozen, hashable and caches its API dict form."""
+        import dataclasses
+        
+        message = Message(role="user", content="Hello")
+        
+        assert message.as_api_dict() == {"role": "user", "content": "Hello"}
+        assert message.as_api_dict() is message.as_api_dict()
+        assert message == Message(role="user", content="Hello")
+        assert len({message, Message(role="user", content="Hello")}) == 1
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            message.content = "changed"
+    
+    def test_message_and_chat_response_are_slotted(self):
+        """Test Message and ChatResponse carry no per-instance __dict__."""
+        response = ChatResponse(content="hi", model="fake-model")
+        
+        assert not hasattr(Message(role="user", content="Hello"), "__dict__")
+        assert not hasattr(response, "__dict__")
+        with pytest.raises(AttributeError):
+            response.extra = 1
 
 
 class TestFakeLLMIntegration:
@@ -6,6 +6,8 @@ using mocked HTTP responses to avoid real API calls.
 
 from __future__ import annotations
 
+import json
+import threading
 from dataclasses import dataclass
 from typing import Any, Dict
 from unittest.mock import MagicMock, patch
@@ -23,6 +25,7 @@ from src.libs.llm import (
     OpenAILLM,
     OpenAILLMError,
 )
+from src.libs.llm.http_client import close_http_client, get_http_client, prewarm
 
 
 # -----------------------------------------------------------------------------
@@ -47,6 +50,14 @@ def ensure_providers_registered():
     yield
 
 
+@pytest.fixture(autouse=True)
+def fresh_http_client():
+    """Drop the shared HTTP client so each test builds it from a patched httpx.Client."""
+    close_http_client()
+    yield
+    close_http_client()
+
+
 # -----------------------------------------------------------------------------
 # Test Fixtures
 # -----------------------------------------------------------------------------
@@ -216,7 +227,7 @@ class TestOpenAILLM:
         llm = OpenAILLM(settings, api_key="test-key")
         
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.post.return_value = (
+            mock_client.return_value.post.return_value = (
                 make_mock_response("Test response", "gpt-4o-mini")
             )
             
@@ -248,7 +259,7 @@ class TestOpenAILLM:
         llm = OpenAILLM(settings, api_key="test-key")
         
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.post.return_value = (
+            mock_client.return_value.post.return_value = (
                 make_error_response(400, "Bad request")
             )
             
@@ -256,6 +267,114 @@ class TestOpenAILLM:
                 llm.chat([Message(role="user", content="Hello")])
 
 
+    def test_stream_chat_yields_deltas(self):
+        """Should yield content deltas from server-sent events."""
+        import httpx
+        
+        events = [
+            {"choices": [{"delta": {"role": "assistant"}}]},
+            {"choices": [{"delta": {"content": "Hello"}}]},
+            {"choices": [{"delta": {"content": " world"}}]},
+            {"choices": []},
+        ]
+        body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+        requests = []
+        
+        def handler(request):
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, text=body)
+        
+        llm = OpenAILLM(MockSettings(), api_key="test-key")
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch("src.libs.llm.openai_llm.get_http_client", return_value=client):
+            deltas = list(llm.stream_chat([Message(role="user", content="Hi")]))
+        
+        assert deltas == ["Hello", " world"]
+        assert requests[0]["stream"] is True
+    
+    def test_stream_chat_api_error(self):
+        """Should raise OpenAILLMError on a non-200 streaming response."""
+        import httpx
+        
+        def handler(request):
+            return httpx.Response(401, json={"error": {"message": "Invalid key"}})
+        
+        llm = OpenAILLM(MockSettings(), api_key="test-key")
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch("src.libs.llm.openai_llm.get_http_client", return_value=client):
+            with pytest.raises(OpenAILLMError, match="Invalid key"):
+                list(llm.stream_chat([Message(role="user", content="Hi")]))
+    
+    def test_default_stream_chat_yields_full_response(self):
+        """Should fall back to a single delta for providers without streaming."""
+        llm = DeepSeekLLM(MockSettings(), api_key="test-key")
+        
+        with patch("httpx.Client") as mock_client:
+            mock_client.return_value.post.return_value = make_mock_response("Full text")
+            
+            assert list(llm.stream_chat([Message(role="user", content="Hi")])) == ["Full text"]
+    
+    def test_batch_chat_submits_and_collects(self):
+        """Should upload JSONL, poll the batch and map output by custom_id."""
+        import httpx
+        
+        statuses = iter(["validating", "in_progress", "completed"])
+        uploads = []
+        
+        def handler(request):
+            path = request.url.path
+            if path == "/v1/files":
+                uploads.append(request.content)
+                return httpx.Response(200, json={"id": "file-in"})
+            if path == "/v1/batches":
+                assert json.loads(request.content)["input_file_id"] == "file-in"
+                return httpx.Response(200, json={"id": "batch-1", "status": next(statuses)})
+            if path == "/v1/batches/batch-1":
+                return httpx.Response(200, json={
+                    "id": "batch-1", "status": next(statuses), "output_file_id": "file-out"
+                })
+            if path == "/v1/files/file-out/content":
+                lines = [
+                    {"custom_id": "a", "response": {"status_code": 200, "body": {
+                        "model": "gpt-4o-mini",
+                        "choices": [{"message": {"content": "Answer A"}}],
+                    }}},
+                    {"custom_id": "b", "response": {"status_code": 500, "body": {}}},
+                ]
+                return httpx.Response(200, text="\n".join(json.dumps(l) for l in lines))
+            return httpx.Response(404)
+        
+        llm = OpenAILLM(MockSettings(), api_key="test-key")
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch("src.libs.llm.openai_llm.get_http_client", return_value=client), \
+                patch("src.libs.llm.openai_llm.time.sleep") as mock_sleep:
+            responses = llm.batch_chat({
+                "a": [Message(role="user", content="Question A")],
+                "b": [Message(role="user", content="Question B")],
+            })
+        
+        assert set(responses) == {"a"}
+        assert responses["a"].content == "Answer A"
+        assert b'"custom_id": "b"' in uploads[0]
+        # Polls back off exponentially
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [10.0, 20.0]
+    
+    def test_batch_chat_failed_batch(self):
+        """Should raise OpenAILLMError when the batch does not complete."""
+        import httpx
+        
+        def handler(request):
+            if request.url.path == "/v1/files":
+                return httpx.Response(200, json={"id": "file-in"})
+            return httpx.Response(200, json={"id": "batch-1", "status": "failed"})
+        
+        llm = OpenAILLM(MockSettings(), api_key="test-key")
+        client = httpx.Client(transport=httpx.MockTransport(handler))
+        with patch("src.libs.llm.openai_llm.get_http_client", return_value=client):
+            with pytest.raises(OpenAILLMError, match="failed"):
+                llm.batch_chat({"a": [Message(role="user", content="Hi")]})
+
+
 # -----------------------------------------------------------------------------
 # Azure LLM Tests
 # -----------------------------------------------------------------------------
@@ -311,7 +430,7 @@ class TestAzureLLM:
         )
         
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.post.return_value = (
+            mock_client.return_value.post.return_value = (
                 make_mock_response("Azure response", "gpt-4o-mini")
             )
             
@@ -330,7 +449,7 @@ class TestAzureLLM:
         )
         
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.post.return_value = (
+            mock_client.return_value.post.return_value = (
                 make_error_response(401, "Unauthorized")
             )
             
@@ -382,7 +501,7 @@ class TestDeepSeekLLM:
         llm = DeepSeekLLM(settings, api_key="test-key")
         
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.post.return_value = (
+            mock_client.return_value.post.return_value = (
                 make_mock_response("DeepSeek response", "deepseek-chat")
             )
             
@@ -397,7 +516,7 @@ class TestDeepSeekLLM:
         llm = DeepSeekLLM(settings, api_key="test-key")
         
         with patch("httpx.Client") as mock_client:
-            mock_client.return_value.__enter__.return_value.post.return_value = (
+            mock_client.return_value.post.return_value = (
                 make_error_response(500, "Internal server error")
             )
             
@@ -443,13 +562,82 @@ class TestMessageValidation:
             ]
             
             with patch("httpx.Client") as mock_client:
-                mock_client.return_value.__enter__.return_value.post.return_value = (
+                mock_client.return_value.post.return_value = (
                     make_mock_response()
                 )
                 # Should not raise
                 llm.chat(messages)
 
 
+# -----------------------------------------------------------------------------
+# Shared HTTP Client Tests
+# -----------------------------------------------------------------------------
+
+
+class TestSharedHTTPClient:
+    """Tests for the pooled HTTP client shared by the providers."""
+    
+    def test_client_reused_across_calls_and_providers(self):
+        """Should create one client for all requests and provider instances."""
+        settings = MockSettings()
+        openai_llm = OpenAILLM(settings, api_key="test-key")
+        deepseek_llm = DeepSeekLLM(settings, api_key="test-key")
+        
+        with patch("httpx.Client") as mock_client:
+            mock_client.return_value.is_closed = False
+            mock_client.return_value.post.return_value = make_mock_response()
+            
+            openai_llm.chat([Message(role="user", content="one")])
+            openai_llm.chat([Message(role="user", content="two")])
+            deepseek_llm.chat([Message(role="user", content="three")])
+            
+            assert mock_client.call_count == 1
+            assert mock_client.return_value.post.call_count == 3
+    
+    def test_client_pool_limits(self):
+        """Should configure keep-alive pooling on the shared client."""
+        with patch("httpx.Client") as mock_client:
+            get_http_client()
+        
+        limits = mock_client.call_args.kwargs["limits"]
+        assert limits.max_connections == 50
+        assert limits.max_keepalive_connections == 20
+        assert limits.keepalive_expiry == 30.0
+    
+    def test_closed_client_is_recreated(self):
+        """Should build a new client after close_http_client."""
+        client = get_http_client()
+        close_http_client()
+        
+        assert client.is_closed
+        assert get_http_client() is not client
+    
+    def test_warm_up_heads_provider_once(self):
+        """Should send one background HEAD per endpoint through the shared client."""
+        llm = OpenAILLM(MockSettings(), api_key="test-key", base_url="https://api.example.com/v1/")
+        
+        with patch("httpx.Client") as mock_client:
+            mock_client.return_value.is_closed = False
+            llm.warm_up()
+            thread = prewarm("https://api.example.com/v1/models")
+            
+            assert thread is None  # already warmed by warm_up
+            for running in threading.enumerate():
+                if running.name == "http-prewarm":
+                    running.join()
+            mock_client.return_value.head.assert_called_once_with(
+                "https://api.example.com/v1/models"
+            )
+    
+    def test_prewarm_swallows_errors(self):
+        """Should not raise when the warm-up request fails."""
+        with patch("httpx.Client") as mock_client:
+            mock_client.return_value.is_closed = False
+            mock_client.return_value.head.side_effect = RuntimeError("unreachable")
+            
+            prewarm("https://unreachable.example.com").join()
+
+
 # -----------------------------------------------------------------------------
 # Integration-Style Tests (Still Mocked)
 # -----------------------------------------------------------------------------
@@ -466,7 +654,7 @@ class TestLLMIntegration:
             llm = LLMFactory.create(settings)
             
             with patch("httpx.Client") as mock_client:
-                mock_client.return_value.__enter__.return_value.post.return_value = (
+                mock_client.return_value.post.return_value = (
                     make_mock_response("Integration test response")
                 )
                 
@@ -481,7 +669,7 @@ class TestLLMIntegration:
             llm = LLMFactory.create(settings)
             
             with patch("httpx.Client") as mock_client:
-                mock_client.return_value.__enter__.return_value.post.return_value = (
+                mock_client.return_value.post.return_value = (
                     make_mock_response("DeepSeek integration response")
                 )
                 
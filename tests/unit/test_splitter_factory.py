@@ -75,6 +75,14 @@ class TestBaseSplitter:
         splitter = FakeSplitter()
         with pytest.raises(ValueError, match="empty or whitespace-only"):
             splitter.validate_chunks(["ok", "   "])
+    
+    def test_validate_chunks_empty_and_unicode_whitespace(self):
+        splitter = FakeSplitter()
+        with pytest.raises(ValueError, match="index 1 is empty"):
+            splitter.validate_chunks(["ok", ""])
+        with pytest.raises(ValueError, match="index 0 is empty"):
+            splitter.validate_chunks(["\u3000\n\t"])
+        splitter.validate_chunks([" padded "])
 
 
 class TestFakeSplitter:
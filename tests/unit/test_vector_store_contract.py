@@ -416,6 +416,34 @@ class TestVectorStoreFactory:
         with pytest.raises(RuntimeError, match="Failed to instantiate VectorStore provider 'failing'"):
             VectorStoreFactory.create(settings)
     
+    def test_register_provider_by_path_imports_on_create(self):
+        """A provider registered by path should be imported and cached on first create()."""
+        VectorStoreFactory.register_provider('lazy', f'{__name__}:FakeVectorStore')
+        assert VectorStoreFactory._PROVIDERS['lazy'] == f'{__name__}:FakeVectorStore'
+        
+        settings = MagicMock()
+        settings.vector_store.provider = 'lazy'
+        
+        store = VectorStoreFactory.create(settings)
+        
+        assert isinstance(store, FakeVectorStore)
+        assert VectorStoreFactory._PROVIDERS['lazy'] is FakeVectorStore
+    
+    def test_register_provider_invalid_path(self):
+        """Provider paths without a ':' separator should be rejected."""
+        with pytest.raises(ValueError, match="module:ClassName"):
+            VectorStoreFactory.register_provider('broken', 'some.module.Store')
+    
+    def test_create_with_unimportable_path(self):
+        """An unimportable provider path should raise on create()."""
+        VectorStoreFactory.register_provider('missing', 'nonexistent_module_xyz:Store')
+        
+        settings = MagicMock()
+        settings.vector_store.provider = 'missing'
+        
+        with pytest.raises(RuntimeError, match="Failed to import VectorStore provider 'missing'"):
+            VectorStoreFactory.create(settings)
+    
     def test_list_providers_empty(self):
         """list_providers() should return empty list when no providers registered."""
         assert VectorStoreFactory.list_providers() == []
@@ -4,6 +4,9 @@ This module tests the Vision LLM factory pattern, provider registration,
 and the BaseVisionLLM abstract interface using a fake implementation.
 """
 
+import gc
+import weakref
+
 import pytest
 from pathlib import Path
 from typing import Any, Optional
@@ -292,8 +295,9 @@ class TestVisionLLMFactory:
     """Test the Vision LLM factory pattern."""
     
     def setup_method(self):
-        """Clean up registry before each test."""
+        """Clean up registry and instance cache before each test."""
         LLMFactory._VISION_PROVIDERS.clear()
+        LLMFactory.clear_instance_cache()
     
     def test_register_vision_provider_success(self):
         """register_vision_provider registers valid provider."""
@@ -389,6 +393,20 @@ class TestVisionLLMFactory:
         with pytest.raises(ValueError, match="Unsupported Vision LLM provider: 'unknown'"):
             LLMFactory.create_vision_llm(settings)
     
+    def test_create_vision_llm_memoizes_provider_name(self):
+        """The resolved provider name is stored on the settings object."""
+        LLMFactory.register_vision_provider("fake", FakeVisionLLM)
+        
+        class FakeSettings:
+            class LLM:
+                provider = "FAKE"
+            llm = LLM()
+        
+        settings = FakeSettings()
+        LLMFactory.create_vision_llm(settings)
+        
+        assert settings._resolved_vision_provider == "fake"
+    
     def test_create_vision_llm_missing_config(self):
         """create_vision_llm raises error if config is missing."""
         class FakeSettings:
@@ -449,6 +467,69 @@ class TestVisionLLMFactory:
         
         with pytest.raises(RuntimeError, match="Failed to instantiate Vision LLM provider 'broken'"):
             LLMFactory.create_vision_llm(settings)
+    
+    def test_create_vision_llm_reuses_instance_for_same_settings(self):
+        """create_vision_llm returns the cached instance for identical calls."""
+        LLMFactory.register_vision_provider("fake", FakeVisionLLM)
+        
+        class FakeSettings:
+            class VisionLLM:
+                provider = "fake"
+            vision_llm = VisionLLM()
+        
+        settings = FakeSettings()
+        first = LLMFactory.create_vision_llm(settings)
+        
+        assert LLMFactory.create_vision_llm(settings) is first
+        assert LLMFactory.create_vision_llm(settings, response_template="{text}") is not first
+        assert LLMFactory.create_vision_llm(FakeSettings()) is not first
+    
+    def test_register_vision_provider_invalidates_instance_cache(self):
+        """Re-registering a provider drops previously cached instances."""
+        LLMFactory.register_vision_provider("fake", FakeVisionLLM)
+        
+        class FakeSettings:
+            class VisionLLM:
+                provider = "fake"
+            vision_llm = VisionLLM()
+        
+        settings = FakeSettings()
+        first = LLMFactory.create_vision_llm(settings)
+        LLMFactory.register_vision_provider("other", FakeVisionLLM)
+        
+        assert LLMFactory.create_vision_llm(settings) is not first
+    
+    def test_create_vision_llm_unhashable_overrides_not_cached(self):
+        """Unhashable override values bypass the instance cache."""
+        LLMFactory.register_vision_provider("fake", FakeVisionLLM)
+        
+        class FakeSettings:
+            class VisionLLM:
+                provider = "fake"
+            vision_llm = VisionLLM()
+        
+        settings = FakeSettings()
+        first = LLMFactory.create_vision_llm(settings, extra=[1])
+        
+        assert LLMFactory.create_vision_llm(settings, extra=[1]) is not first
+    
+    def test_instance_cache_does_not_keep_instances_alive(self):
+        """Dropped instances (and the settings they hold) are evicted from the cache."""
+        LLMFactory.register_vision_provider("fake", FakeVisionLLM)
+        
+        class FakeSettings:
+            class VisionLLM:
+                provider = "fake"
+            vision_llm = VisionLLM()
+        
+        settings = FakeSettings()
+        settings_ref = weakref.ref(settings)
+        LLMFactory.create_vision_llm(settings)
+        del settings
+        gc.collect()
+        
+        assert settings_ref() is None
+        assert LLMFactory._INSTANCE_CACHE == {}
 
 
 # ================================